@@ -0,0 +1,18 @@
+"""Async benchmarks: iterations run concurrently on the engine's event loop"""
+import asyncio
+import random
+
+import semtest
+
+
+@semtest.benchmark(
+    semantic_expectation="The capital of France is Paris",
+    iterations=5,
+    max_concurrency=5
+)
+async def mock_async_prompt() -> str:
+    """Mocks an I/O-bound async LLM call"""
+
+    await asyncio.sleep(random.uniform(0.1, 0.3))  # simulated network latency
+
+    return "Paris is the capital of France"
@@ -0,0 +1,132 @@
+"""
+Startup budget of the semtest CLI: wall time of `import semtest`, `semtest --help`
+and `semtest --collect-only` over a bare interpreter start, and the heavy
+dependencies each of them imports. Exits non-zero when a budget is exceeded.
+
+Usage: python perf/import_budget.py [--repeat 10] [--output results.json]
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+RESULTS_FORMAT_VERSION = 1
+
+# Dependencies that only a benchmark run (or report) may import
+HEAVY_MODULES = (
+    "numpy", "pandas", "sklearn", "scipy", "openai", "tabulate", "pyarrow",
+    "sentence_transformers",
+)
+# Model and settings layer, loaded once settings defaults are resolved
+SETTINGS_MODULES = ("pydantic", "pydantic_settings")
+
+SUITE_SOURCE = """import semtest
+
+@semtest.benchmark(semantic_expectation="expectation", iterations=1)
+def benchmark_{index}():
+    return "response"
+"""
+
+
+def startup_commands(suite_directory: Path) -> dict[str, tuple[list[str], tuple[str, ...], float]]:
+    """Command, modules it must not import and default overhead budget (ms), by name"""
+    return {
+        "import": (["-c", "import semtest"], HEAVY_MODULES + SETTINGS_MODULES, 50.0),
+        "help": (["-m", "semtest", "--help"], HEAVY_MODULES + SETTINGS_MODULES, 100.0),
+        "collect_only": (
+            ["-m", "semtest", str(suite_directory), "--collect-only"],
+            HEAVY_MODULES + SETTINGS_MODULES,
+            100.0
+        ),
+    }
+
+
+def wall_time(arguments: list[str], repeat: int) -> float:
+    """Median wall time, in milliseconds, of running the interpreter with `arguments`"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *arguments], check=True, capture_output=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def imported_modules(arguments: list[str]) -> set[str]:
+    """Top-level packages imported by running the interpreter with `arguments`"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *arguments],
+        check=True, capture_output=True, text=True
+    )
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            module = line.rsplit("|", 1)[1].strip()
+            modules.add(module.split(".")[0])
+    return modules
+
+
+def main() -> None:
+    """Measure startup commands against their budgets and emit JSON results"""
+    parser = argparse.ArgumentParser(description="semtest startup budget")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--import-budget-ms", type=float)
+    parser.add_argument("--help-budget-ms", type=float)
+    parser.add_argument("--collect-only-budget-ms", type=float)
+    parser.add_argument("--output", type=Path, help="Write results here instead of stdout.")
+    args = parser.parse_args()
+
+    results: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="semtest-startup-") as suite_directory:
+        for index in range(10):
+            (Path(suite_directory) / f"startup_{index}.py").write_text(
+                SUITE_SOURCE.format(index=index), encoding="utf-8"
+            )
+
+        baseline = wall_time(["-c", "pass"], args.repeat)
+        for name, (arguments, forbidden, budget) in startup_commands(
+            Path(suite_directory)
+        ).items():
+            budget = getattr(args, f"{name}_budget_ms") or budget
+            overhead = wall_time(arguments, args.repeat) - baseline
+            heavy_imports = sorted(imported_modules(arguments).intersection(forbidden))
+            result = {
+                "command": name,
+                "overhead_ms": overhead,
+                "budget_ms": budget,
+                "forbidden_imports": heavy_imports,
+                "passed": overhead <= budget and not heavy_imports,
+            }
+            results.append(result)
+            print(
+                f"{name:>12} +{overhead:.1f}ms (budget {budget:.0f}ms) "
+                f"{'ok' if result['passed'] else 'FAILED'}"
+                + (f" imports {', '.join(heavy_imports)}" if heavy_imports else ""),
+                file=sys.stderr
+            )
+
+    document = {
+        "format_version": RESULTS_FORMAT_VERSION,
+        "baseline_ms": baseline,
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    serialized = json.dumps(document, indent=2) + "\n"
+    if args.output:
+        args.output.write_text(serialized, encoding="utf-8")
+    else:
+        sys.stdout.write(serialized)
+
+    if not all(result["passed"] for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
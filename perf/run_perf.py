@@ -0,0 +1,255 @@
+"""
+Self-benchmarks of semtest's own overhead: throughput and peak memory of the
+loader, runner, comparators, metrics and report stages across suite sizes,
+against a local stand-in embeddings server. Results are written as JSON.
+
+Usage: python perf/run_perf.py [--sizes 10 100 1000 10000] [--output results.json]
+"""
+import argparse
+import contextlib
+import gc
+import io
+import itertools
+import json
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Iterator
+
+import numpy as np
+from stub_server import StubEmbeddingServer
+
+from semtest.benchmarking import BenchmarkMetadata, BenchmarkRunner
+from semtest.benchmarking.metrics import SemanticMetrics
+from semtest.llm_client import EmbeddingCache, EmbeddingClient
+from semtest.loader import Loader
+from semtest.parser import SemtestContext
+from semtest.parser.input_type import Verbosity
+from semtest.reporting import BenchmarkReport
+from semtest.semantic_comparator import (
+    COMPARATORS,
+    CosineSimilarity,
+    calculate_multi_distances,
+)
+
+RESULTS_FORMAT_VERSION = 1
+BENCHMARKS_PER_MODULE = 100
+
+Workload = Callable[[], Any]
+
+
+class PerfEnvironment:
+    """Shared fixtures: the stub server, an embedding client bound to it and scratch space"""
+
+    def __init__(self, server: StubEmbeddingServer, scratch_directory: Path) -> None:
+        self.server = server
+        self.scratch_directory = scratch_directory
+        self.embedding_client = EmbeddingClient(
+            api_key="stub", base_url=server.base_url, max_batch_inputs=2048
+        )
+        self.rng = np.random.default_rng(0)
+
+
+# A stage prepares a workload of the given size and cleans up after it; only the workload is timed
+Stage = Callable[[int, PerfEnvironment], ContextManager[Workload]]
+
+
+@contextlib.contextmanager
+def stage_loader_load(size: int, environment: PerfEnvironment) -> Iterator[Workload]:
+    """`Loader.load` of `size` benchmark functions spread over modules"""
+    suite_directory = environment.scratch_directory / f"suite_{uuid.uuid4().hex}"
+    suite_directory.mkdir()
+    module_prefix = f"perf_{uuid.uuid4().hex[:8]}"
+
+    for module_index in range(0, size, BENCHMARKS_PER_MODULE):
+        functions = "\n".join(
+            f"@semtest.benchmark(semantic_expectation='expectation {i}', iterations=1)\n"
+            f"def benchmark_{i}():\n    return 'response {i}'\n"
+            for i in range(module_index, min(size, module_index + BENCHMARKS_PER_MODULE))
+        )
+        module_path = suite_directory / f"{module_prefix}_{module_index}.py"
+        module_path.write_text(f"import semtest\n\n{functions}", encoding="utf-8")
+
+    loader = Loader(SemtestContext(directory=suite_directory, verbosity=Verbosity.WARN))
+    try:
+        yield loader.load
+    finally:
+        for module_name in [name for name in sys.modules if name.startswith(module_prefix)]:
+            del sys.modules[module_name]
+        shutil.rmtree(suite_directory)
+
+
+@contextlib.contextmanager
+def stage_runner_run(size: int, environment: PerfEnvironment) -> Iterator[Workload]:
+    """`BenchmarkRunner.run` of `size` iterations, embedding through the stub server"""
+    counter = itertools.count()
+    runner = BenchmarkRunner(
+        func=lambda: f"response {next(counter)}",
+        semantic_expectation="A dog is in the background of the photograph",
+        iterations=size,
+        comparator=CosineSimilarity(),
+        embedding_client=environment.embedding_client
+    )
+    yield runner.run
+
+
+@contextlib.contextmanager
+def stage_comparators(size: int, environment: PerfEnvironment) -> Iterator[Workload]:
+    """Every registered comparator in one pass over a `size` x d embedding matrix"""
+    dimensions = environment.server.dimensions
+    embeddings = environment.rng.standard_normal((size, dimensions), dtype=np.float32)
+    expectation = environment.rng.standard_normal(dimensions, dtype=np.float32)
+    comparators = [comparator_class() for comparator_class in COMPARATORS.values()]
+
+    yield lambda: calculate_multi_distances(comparators, expectation, embeddings)
+
+
+@contextlib.contextmanager
+def stage_metrics(size: int, environment: PerfEnvironment) -> Iterator[Workload]:
+    """Building and serializing `BenchmarkMetadata` for `size` responses"""
+    dimensions = environment.server.dimensions
+    responses = [f"response {i}" for i in range(size)]
+    embeddings = environment.rng.standard_normal((size, dimensions), dtype=np.float32)
+    distances = list(environment.rng.random(size))
+
+    def build_metrics() -> str:
+        return BenchmarkMetadata(
+            func="perf",
+            iterations=size,
+            comparator="cosine_similarity",
+            expectation_input="expectation",
+            benchmarks=SemanticMetrics(
+                responses=responses,
+                exceptions=[],
+                result_embeddings=embeddings,
+                semantic_distances=distances
+            )
+        ).model_dump_json()
+
+    yield build_metrics
+
+
+@contextlib.contextmanager
+def stage_report(size: int, environment: PerfEnvironment) -> Iterator[Workload]:
+    """`BenchmarkReport.report` of `size` benchmarks"""
+    dimensions = environment.server.dimensions
+    benchmarks = [
+        BenchmarkMetadata(
+            func=f"benchmark_{i}",
+            iterations=3,
+            comparator="cosine_similarity",
+            expectation_input="expectation",
+            benchmarks=SemanticMetrics(
+                responses=["a", "b", "c"],
+                exceptions=[],
+                result_embeddings=np.zeros((3, dimensions), dtype=np.float32),
+                semantic_distances=list(environment.rng.random(3))
+            )
+        )
+        for i in range(size)
+    ]
+
+    def build_report() -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            BenchmarkReport(benchmarks).report()
+
+    yield build_report
+
+
+STAGES: dict[str, tuple[Stage, str]] = {
+    "loader_load": (stage_loader_load, "benchmarks"),
+    "runner_run": (stage_runner_run, "iterations"),
+    "comparators": (stage_comparators, "embeddings"),
+    "metrics": (stage_metrics, "responses"),
+    "report": (stage_report, "benchmarks"),
+}
+
+
+def measure(
+    stage: Stage, size: int, environment: PerfEnvironment, repeat: int
+) -> dict[str, float]:
+    """Best wall time over `repeat` runs, then peak traced memory in a separate run"""
+    timings = []
+    for _ in range(repeat):
+        with stage(size, environment) as workload:
+            gc.collect()
+            start = time.perf_counter()
+            workload()
+            timings.append(time.perf_counter() - start)
+
+    with stage(size, environment) as workload:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            workload()
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    best = min(timings)
+    return {
+        "seconds": best,
+        "median_seconds": float(np.median(timings)),
+        "throughput_per_second": size / best if best else float("inf"),
+        "peak_memory_bytes": peak_memory,
+    }
+
+
+def main() -> None:
+    """Run the selected stages and emit JSON results"""
+    parser = argparse.ArgumentParser(description="semtest self-benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=5.0,
+                        help="Simulated latency of each embeddings request.")
+    parser.add_argument("--dimensions", type=int, default=256,
+                        help="Width of the stub server's embeddings.")
+    parser.add_argument("--output", type=Path, help="Write results here instead of stdout.")
+    args = parser.parse_args()
+
+    EmbeddingCache.configure_default(None)
+
+    results = []
+    server = StubEmbeddingServer(latency=args.latency_ms / 1000, dimensions=args.dimensions)
+    with server, tempfile.TemporaryDirectory(prefix="semtest-perf-") as scratch_directory:
+        environment = PerfEnvironment(server, Path(scratch_directory))
+        for stage_name in args.stages:
+            stage, unit = STAGES[stage_name]
+            for size in args.sizes:
+                result = {"stage": stage_name, "size": size, "unit": unit}
+                result.update(measure(stage, size, environment, args.repeat))
+                results.append(result)
+                print(
+                    f"{stage_name:>12} size={size:<6} {result['seconds']:.4f}s "
+                    f"{result['throughput_per_second']:.0f} {unit}/s "
+                    f"peak={result['peak_memory_bytes'] / 2**20:.1f}MiB",
+                    file=sys.stderr
+                )
+
+    document = {
+        "format_version": RESULTS_FORMAT_VERSION,
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "repeat": args.repeat,
+            "latency_ms": args.latency_ms,
+            "dimensions": args.dimensions,
+        },
+        "results": results,
+    }
+    serialized = json.dumps(document, indent=2)
+    if args.output:
+        args.output.write_text(serialized + "\n", encoding="utf-8")
+    else:
+        print(serialized)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Local stand-in for an OpenAI-compatible embeddings endpoint, used by the self-benchmarks"""
+import base64
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import numpy as np
+
+
+class StubEmbeddingServer:
+    """
+    Serves `POST <base_url>/embeddings` from a background thread. Each request
+    sleeps for `latency` seconds, then returns deterministic `dimensions`-wide
+    vectors seeded from each input's hash, base64-encoded when requested.
+    """
+
+    def __init__(self, latency: float = 0.0, dimensions: int = 256) -> None:
+        self.latency = latency
+        self.dimensions = dimensions
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        """OpenAI client base URL of the running server"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}/v1"
+
+    def __enter__(self) -> "StubEmbeddingServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def embed(self, input_text: str) -> np.ndarray[Any, np.dtype[np.float32]]:
+        """Deterministic pseudo-embedding of a text"""
+        seed = int.from_bytes(hashlib.blake2b(input_text.encode("utf-8"), digest_size=8).digest())
+        return np.random.default_rng(seed).standard_normal(self.dimensions, dtype=np.float32)
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        """Request handler class bound to this server"""
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Embeddings endpoint handler"""
+
+            def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=redefined-builtin
+                """Silence per-request logging"""
+
+            def do_POST(self) -> None:  # pylint: disable=invalid-name
+                """Answer an embeddings request"""
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                inputs = body["input"] if isinstance(body["input"], list) else [body["input"]]
+                with stub._lock:  # pylint: disable=protected-access
+                    stub.requests += 1
+
+                if stub.latency:
+                    time.sleep(stub.latency)
+
+                as_base64 = body.get("encoding_format") == "base64"
+                data = []
+                for index, input_text in enumerate(inputs):
+                    embedding = stub.embed(input_text)
+                    data.append({
+                        "object": "embedding",
+                        "index": index,
+                        "embedding": (
+                            base64.b64encode(embedding.tobytes()).decode("ascii")
+                            if as_base64 else embedding.tolist()
+                        ),
+                    })
+
+                payload = json.dumps({
+                    "object": "list",
+                    "data": data,
+                    "model": body["model"],
+                    "usage": {"prompt_tokens": len(inputs), "total_tokens": len(inputs)},
+                }).encode("utf-8")
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
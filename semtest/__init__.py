@@ -1,14 +1,58 @@
 """Core imports for semtest library functionality"""
-from .benchmarking import BenchmarkMetadata, BenchmarkRunner, benchmark
-from .llm_client import EmbeddingClient
-from .semantic_comparator import CosineSimilarity
-from .semtest import semantic_test_runner
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .benchmarking import (
+        BenchmarkMetadata,
+        BenchmarkRunner,
+        RateLimiter,
+        benchmark,
+        dataset_benchmark,
+    )
+    from .llm_client import EmbeddingClient, EmbeddingProvider, HashingEmbeddingClient
+    from .semantic_comparator import CosineSimilarity
+    from .semtest import semantic_test_runner
+
+# Exports are imported on first access, so `import semtest` (and the CLI's
+# `--help`) does not pay for numpy, pydantic-settings or the embedding backends
+_EXPORTS = {
+    "BenchmarkMetadata": ".benchmarking",
+    "BenchmarkRunner": ".benchmarking",
+    "EmbeddingClient": ".llm_client",
+    "EmbeddingProvider": ".llm_client",
+    "HashingEmbeddingClient": ".llm_client",
+    "CosineSimilarity": ".semantic_comparator",
+    "RateLimiter": ".benchmarking",
+    "benchmark": ".benchmarking",
+    "dataset_benchmark": ".benchmarking",
+    "semantic_test_runner": ".semtest",
+}
 
 __all__ = [
     "BenchmarkMetadata",
     "BenchmarkRunner",
     "EmbeddingClient",
+    "EmbeddingProvider",
+    "HashingEmbeddingClient",
     "CosineSimilarity",
+    "RateLimiter",
     "benchmark",
+    "dataset_benchmark",
     "semantic_test_runner"
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import an exported name from its submodule on first access"""
+    if name not in _EXPORTS:
+        exc = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(exc)
+
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
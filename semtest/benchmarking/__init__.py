@@ -1,5 +1,37 @@
 """Semantic testing benchmarking module"""
-from .benchmark import BenchmarkRunner, benchmark
-from .metrics import BenchmarkMetadata
+from .benchmark import (
+    BenchmarkFunction,
+    BenchmarkRunner,
+    benchmark,
+    get_benchmark_runner,
+    resolve_expectation_embeddings
+)
+from .dataset import Dataset, DatasetBenchmarkRunner, DatasetCase, dataset_benchmark
+from .metrics import (
+    BenchmarkMetadata,
+    ConvergenceMetrics,
+    DistributionSummary,
+    ReferenceMetrics,
+    SliceMetrics,
+    TimingMetrics
+)
+from .rate_limit import RateLimiter
 
-__all__ = ["BenchmarkMetadata", "BenchmarkRunner", "benchmark"]
+__all__ = [
+    "BenchmarkFunction",
+    "BenchmarkMetadata",
+    "BenchmarkRunner",
+    "ConvergenceMetrics",
+    "Dataset",
+    "DatasetBenchmarkRunner",
+    "DatasetCase",
+    "DistributionSummary",
+    "RateLimiter",
+    "ReferenceMetrics",
+    "SliceMetrics",
+    "TimingMetrics",
+    "benchmark",
+    "dataset_benchmark",
+    "get_benchmark_runner",
+    "resolve_expectation_embeddings"
+]
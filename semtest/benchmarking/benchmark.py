@@ -1,73 +1,334 @@
 """Core benchmarking functionality"""
 # pylint: disable=broad-exception-caught
+import asyncio
+import hashlib
+import inspect
+import json
 import logging
-from functools import cached_property, wraps
-from typing import Any, Callable
+import marshal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, partial, wraps
+from pathlib import Path
+from typing import Any, Awaitable, Callable, ClassVar, Optional, Sequence
 
 import numpy as np
+import numpy.typing as npt
 
 from semtest.semantic_comparator import (
+    REFERENCE_SCORINGS,
     ComparatorBase,
     CosineSimilarity,
 )
-from semtest.llm_client import EmbeddingClient
+from semtest.config import settings
+from semtest.llm_client import EmbeddingMatrix, EmbeddingProvider
 
-from .metrics import BenchmarkMetadata, SemanticMetrics
+from .metrics import (
+    BenchmarkMetadata,
+    ConvergenceMetrics,
+    DistributionSummary,
+    ReferenceMetrics,
+    SemanticMetrics,
+    SliceMetrics,
+    TimingMetrics,
+)
+from .pipeline import AsyncEmbeddingPipeline, EmbeddingPipeline
+from .rate_limit import RateLimiter
+from .statistics import StreamingDistribution
 
 logger = logging.getLogger("semtest")
 
+BenchmarkFunction = Callable[..., BenchmarkMetadata | Awaitable[BenchmarkMetadata]]
+
+FINGERPRINT_VERSION = 1
+
 
 class BenchmarkRunner:
     """
-    Core class to execute a benchmarking run and track results.
+    Core class to execute a benchmarking run and track results. Responses
+    are embedded and scored by a streaming pipeline while iterations run.
+    Coroutine functions are executed with up to `max_concurrency`
+    iterations in flight at once; synchronous functions run on a pool
+    of `workers` threads (defaulting to `default_workers`). Every iteration
+    passes through the process-wide `RateLimiter`, if any. When several
+    comparators are given, the first is the primary `semantic_distances`
+    metric and the rest are reported in `comparator_distances`.
+    `depends_on` lists files or directories (relative to the benchmark's
+    source file) whose contents are part of the benchmark's fingerprint.
+
+    Setting `target_ci_width` samples adaptively: iterations run in waves (one
+    per worker, or `max_concurrency` for coroutines) until the confidence
+    interval of the mean primary distance is at most that wide, after at
+    least `iterations` and at most `max_iterations` iterations.
+
+    A list of `semantic_expectation`s holds several valid reference answers.
+    Each batch of responses is scored against all of them in one matrix
+    operation, and a response's distances are aggregated with
+    `reference_scoring`: `max` (its closest reference), `mean`, or `softmin`
+    at `reference_temperature`. The closest reference of every response is
+    reported in `ReferenceMetrics`.
+
+    With streaming statistics (`streaming_stats`, defaulting to
+    `default_streaming`), memory stays bounded for very long runs: distances
+    and iteration latencies are summarized on the fly (exact mean and
+    variance, approximate percentiles) and only a random sample of
+    `reservoir_size` responses is kept, without embeddings.
     """
 
-    def __init__(
+    default_workers: ClassVar[int] = settings.WORKERS
+    default_streaming: ClassVar[bool] = settings.STREAMING_STATISTICS
+    # Whether responses are scored against one `semantic_expectation`, embedded ahead of runs
+    shared_expectation: ClassVar[bool] = True
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-locals
         self,
-        func: Callable[..., str],
-        semantic_expectation: str,
+        func: Callable[..., str] | Callable[..., Awaitable[str]],
+        semantic_expectation: str | Sequence[str],
         iterations: int,
-        comparator: ComparatorBase,
-        embedding_client: EmbeddingClient = EmbeddingClient(),
+        comparator: ComparatorBase | Sequence[ComparatorBase],
+        embedding_client: Optional[EmbeddingProvider] = None,
+        *,
+        max_concurrency: int = settings.MAX_CONCURRENCY,
+        workers: Optional[int] = None,
+        tokens_per_call: int = 0,
+        depends_on: Sequence[str | Path] = (),
+        target_ci_width: Optional[float] = None,
+        max_iterations: int = settings.ADAPTIVE_MAX_ITERATIONS,
+        confidence: float = settings.ADAPTIVE_CONFIDENCE,
+        reference_scoring: str = "max",
+        reference_temperature: float = settings.REFERENCE_SOFTMIN_TEMPERATURE,
+        streaming_stats: Optional[bool] = None,
+        reservoir_size: int = settings.STREAMING_RESERVOIR_SIZE
     ):
         self.func = func
-        self.semantic_expectation = semantic_expectation
+        self.semantic_expectation = (
+            semantic_expectation if isinstance(semantic_expectation, str)
+            else list(semantic_expectation)
+        )
+        if not semantic_expectation or (
+            reference_scoring not in REFERENCE_SCORINGS or reference_temperature <= 0
+        ):
+            exc = (
+                f"Invalid expectation: expected one or more references, a reference_scoring in "
+                f"{list(REFERENCE_SCORINGS)} and a positive reference_temperature, got "
+                f"{len(self.references)} references, {reference_scoring!r} and "
+                f"{reference_temperature}"
+            )
+            raise ValueError(exc)
+        self.reference_scoring = reference_scoring
+        self.reference_temperature = reference_temperature
+        self.reference_metrics: Optional[ReferenceMetrics] = None
+        self.streaming_stats = streaming_stats
+        self.reservoir_size = reservoir_size
+        self.distance_summaries: dict[str, DistributionSummary] = {}
+        self._iteration_distribution = StreamingDistribution()
         self.iterations = iterations
-        self.comparator = comparator
-        self.embedding_client = embedding_client
+        self.comparators = (
+            [comparator] if isinstance(comparator, ComparatorBase) else list(comparator)
+        )
+        comparator_names = [str(comparator) for comparator in self.comparators]
+        if not comparator_names or len(set(comparator_names)) != len(comparator_names):
+            exc = f"Expected one or more distinct comparators, got {comparator_names}"
+            raise ValueError(exc)
+        self.comparator = self.comparators[0]
+        self._embedding_client = embedding_client
+        self.max_concurrency = max_concurrency
+        self.workers = workers
+        self.tokens_per_call = tokens_per_call
+        self.depends_on = [Path(dependency) for dependency in depends_on]
 
-        self.embedding_expectation = (
-            self.embedding_client.generate_embedding_vector(
-                semantic_expectation
+        if target_ci_width is not None and (
+            target_ci_width <= 0 or not 0 < confidence < 1 or max_iterations < iterations
+        ):
+            exc = (
+                f"Invalid adaptive sampling: target_ci_width={target_ci_width} must be positive, "
+                f"confidence={confidence} within (0, 1) and max_iterations={max_iterations} "
+                f"at least iterations={iterations}"
             )
-        )
+            raise ValueError(exc)
+        self.target_ci_width = target_ci_width
+        self.max_iterations = max_iterations
+        self.confidence = confidence
+        self.convergence: Optional[ConvergenceMetrics] = None
+
+        # Resolved lazily on first run, or in bulk by `resolve_expectation_embeddings`
+        self.embedding_expectation: Optional[npt.NDArray[np.floating[Any]]] = None
 
         self.result_set: list[str] = []
-        self.result_embeddings: list[list[float]] = []
+        self.result_embeddings: EmbeddingMatrix = np.empty((0, 0), dtype=np.float32)
+        self.semantic_distances: list[np.float64] = []
+        self.comparator_distances: dict[str, list[np.float64]] = {}
         self.exceptions: list[Exception] = []
+        self.iteration_seconds: list[float] = []
+        self.slices: list[SliceMetrics] = []
+        self.timings = TimingMetrics()
+
+    @property
+    def embedding_client(self) -> EmbeddingProvider:
+        """Runner-specific embedding provider, falling back to the process-wide default"""
+        if self._embedding_client is not None:
+            return self._embedding_client
+        return EmbeddingProvider.get_default()
+
+    @property
+    def benchmark_id(self) -> str:
+        """Stable `module::function` identifier of the benchmarked function"""
+        return f"{self.func.__module__}::{self.func.__qualname__}"
+
+    def fingerprint(self) -> str:
+        """
+        Hash of everything that determines the benchmark's results: the function
+        source (bytecode when the source is unavailable), expectation, iterations,
+        adaptive sampling settings, comparators, embedding provider and model, and
+        the `depends_on` contents
+        """
+        digest = hashlib.sha256()
+        for part in self._fingerprint_parts():
+            digest.update(hashlib.sha256(part).digest())
+
+        return digest.hexdigest()
+
+    @property
+    def references(self) -> list[str]:
+        """Reference answers responses are scored against"""
+        if isinstance(self.semantic_expectation, str):
+            return [self.semantic_expectation]
+        return self.semantic_expectation
+
+    @property
+    def multiple_references(self) -> bool:
+        """Whether responses are scored against a list of reference answers"""
+        return not isinstance(self.semantic_expectation, str)
+
+    @property
+    def streaming(self) -> bool:
+        """Whether results are summarized on the fly instead of being retained"""
+        if self.streaming_stats is not None:
+            return self.streaming_stats
+        return self.default_streaming
+
+    @property
+    def adaptive(self) -> bool:
+        """Whether iterations are sampled until the mean distance converges"""
+        return self.target_ci_width is not None
+
+    @property
+    def is_async(self) -> bool:
+        """Whether the benchmarked function is a coroutine function"""
+        return inspect.iscoroutinefunction(self.func)
 
     def run(self, *args: Any, **kwargs: Any) -> BenchmarkMetadata:
         """Execute benchmark and generate response embeddings"""
-        fmt_token = '='
-        info = (
-            f"{fmt_token*35} "
-            f"{self.func.__name__} (n={self.iterations} iterations) "
-            f"{fmt_token*35}\n"
+        if self.is_async:
+            return asyncio.run(self.arun(*args, **kwargs))
+
+        self._log_header()
+        start = time.perf_counter()
+
+        workers = self.workers or self.default_workers
+        pipeline = EmbeddingPipeline(
+            self.func.__name__,
+            self.embedding_client,
+            self.comparators,
+            self._resolve_expectation_embedding(),
+            reference_scoring=self.reference_scoring,
+            reference_temperature=self.reference_temperature,
+            streaming=self.streaming,
+            reservoir_size=self.reservoir_size
         )
-        logger.info(info)
+        pipeline.start()
+
+        executor = (
+            ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix=f"semtest-{self.func.__name__}"
+            ) if workers > 1 else None
+        )
+        call = partial(self._call_iteration, *args, **kwargs)
+        try:
+            if not self.adaptive:
+                self._run_iterations(pipeline, executor, range(self.iterations), call)
+            else:
+                completed = 0
+                while not self._sampling_complete(pipeline, completed):
+                    wave = self._adaptive_wave(completed, workers, pipeline.batch_size)
+                    self._run_iterations(
+                        pipeline, executor, range(completed, completed + wave), call
+                    )
+                    completed += wave
+                    pipeline.flush()
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        self.result_set, self.result_embeddings, distances = pipeline.close()
+        self._assign_distances(distances)
+        self._record_aggregates(pipeline)
+        self._record_timings(pipeline, time.perf_counter() - start)
+
+        return self.metrics
+
+    async def arun(self, *args: Any, **kwargs: Any) -> BenchmarkMetadata:
+        """
+        Execute a coroutine benchmark with bounded concurrency. Responses and
+        exceptions are recorded in iteration order, as in `run`.
+        """
+        if not self.is_async:
+            return self.run(*args, **kwargs)
+
+        self._log_header()
+        start = time.perf_counter()
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        rate_limiter = RateLimiter.get_default()
+
+        pipeline = AsyncEmbeddingPipeline(
+            self.func.__name__,
+            self.embedding_client,
+            self.comparators,
+            await self._aresolve_expectation_embedding(),
+            reference_scoring=self.reference_scoring,
+            reference_temperature=self.reference_temperature,
+            streaming=self.streaming,
+            reservoir_size=self.reservoir_size
+        )
+        pipeline.start()
 
-        for _ in range(self.iterations):
-            try:
-                res = self.func(*args, **kwargs)
-                self.result_set.append(res)
-            except Exception as e:
-                logger.info("Exception captured\n")
-                exception_msg = f"{e!r}\n"
-                logger.exception(exception_msg)
-                logger.info("\n")
-                self.exceptions.append(e)
+        async def iteration(index: int) -> None:
+            async with semaphore:
+                if rate_limiter is not None:
+                    await rate_limiter.aacquire(self.tokens_per_call)
+                iteration_start = time.perf_counter()
+                try:
+                    response: str = await self.func(*args, **kwargs)  # type: ignore[misc]
+                finally:
+                    self._record_iteration(time.perf_counter() - iteration_start)
+            await pipeline.submit(index, response)
 
-        self._generate_result_embeddings()
+        async def run_iterations(start_index: int, count: int) -> None:
+            outcomes = await asyncio.gather(
+                *(iteration(index) for index in range(start_index, start_index + count)),
+                return_exceptions=True
+            )
+            for outcome in outcomes:
+                if isinstance(outcome, Exception):
+                    self._capture_exception(outcome)
+                elif isinstance(outcome, BaseException):
+                    raise outcome
+
+        if not self.adaptive:
+            await run_iterations(0, self.iterations)
+        else:
+            completed = 0
+            while not self._sampling_complete(pipeline, completed):
+                wave = self._adaptive_wave(completed, self.max_concurrency, pipeline.batch_size)
+                await run_iterations(completed, wave)
+                completed += wave
+                await pipeline.flush()
+
+        self.result_set, self.result_embeddings, distances = await pipeline.close()
+        self._assign_distances(distances)
+        self._record_aggregates(pipeline)
+        self._record_timings(pipeline, time.perf_counter() - start)
 
         return self.metrics
 
@@ -77,60 +338,396 @@ class BenchmarkRunner:
 
         return BenchmarkMetadata(
            func=self.func.__name__,
-           iterations=self.iterations,
+           benchmark_id=self.benchmark_id,
+           iterations=self._completed_iterations(),
            comparator=str(self.comparator),
            expectation_input=self.semantic_expectation,
            benchmarks=SemanticMetrics(
                responses=self.result_set,
                exceptions=self.exceptions,
                result_embeddings=self.result_embeddings,
-               semantic_distances=self._calculate_semantic_distances()
+               expectation_embedding=self.embedding_expectation,
+               semantic_distances=self.semantic_distances,
+               comparator_distances=self.comparator_distances,
+               convergence=self.convergence,
+               slices=self.slices,
+               references=self.reference_metrics,
+               distance_summary=self.distance_summaries.get(str(self.comparator)),
+               comparator_summaries={
+                   comparator: summary for comparator, summary in self.distance_summaries.items()
+                   if comparator != str(self.comparator)
+               }
+           ),
+           timings=self.timings
+        )
+
+    def reset(self) -> None:
+        """Release responses, embeddings and cached metrics once they have been reported"""
+        self.result_set = []
+        self.result_embeddings = np.empty((0, 0), dtype=np.float32)
+        self.semantic_distances = []
+        self.comparator_distances = {}
+        self.exceptions = []
+        self.iteration_seconds = []
+        self.timings = TimingMetrics()
+        self.convergence = None
+        self.slices = []
+        self.reference_metrics = None
+        self.distance_summaries = {}
+        self._iteration_distribution = StreamingDistribution()
+        self.__dict__.pop("metrics", None)
+
+    def failure_metrics(self, exc: Exception) -> BenchmarkMetadata:
+        """Metrics for a benchmark that could not be executed to completion"""
+        return BenchmarkMetadata(
+           func=self.func.__name__,
+           benchmark_id=self.benchmark_id,
+           iterations=self.iterations,
+           comparator=str(self.comparator),
+           expectation_input=self.semantic_expectation,
+           benchmarks=SemanticMetrics(
+               responses=[],
+               exceptions=[exc],
+               result_embeddings=np.empty((0, 0), dtype=np.float32),
+               semantic_distances=[]
            )
         )
 
-    def _generate_result_embeddings(self) -> list[list[float]]:
-        """From a set of LLM responses, generate result embeddings"""
-        self.result_embeddings = [
-            self.embedding_client.generate_embedding_vector(
-                result
+    def _completed_iterations(self) -> int:
+        """Iterations reported in the metrics: those actually run when sampling adaptively"""
+        return self.convergence.iterations if self.convergence is not None else self.iterations
+
+    def _assign_distances(self, distances: dict[str, list[np.float64]]) -> None:
+        """Split pipeline distances into the primary metric and additional comparators"""
+        self.semantic_distances = distances.pop(str(self.comparator))
+        self.comparator_distances = distances
+
+    def _record_aggregates(self, pipeline: AsyncEmbeddingPipeline | EmbeddingPipeline) -> None:
+        """
+        Record streaming distance summaries, if any, and which reference each
+        response matched, when scored against several
+        """
+        self.distance_summaries = pipeline.summaries()
+        if self.multiple_references:
+            self.reference_metrics = ReferenceMetrics(
+                references=len(self.references),
+                scoring=self.reference_scoring,
+                temperature=self.reference_temperature,
+                matched=pipeline.matched_references(),
+                counts=pipeline.match_counts()
             )
-            for result in self.result_set
-        ]
-        return self.result_embeddings
 
-    def _calculate_semantic_distances(self) -> list[np.float64]:
-        """For each result item, calculate distance"""
+    def _record_timings(
+        self, pipeline: AsyncEmbeddingPipeline | EmbeddingPipeline, total_seconds: float
+    ) -> None:
+        """Collect iteration, embedding and comparison timings of a completed run"""
+        self.timings = TimingMetrics(
+            iteration_seconds=self.iteration_seconds,
+            iteration_summary=(
+                self._iteration_distribution.summary() if self.streaming else None
+            ),
+            embedding_seconds=pipeline.embedding_seconds,
+            comparison_seconds=pipeline.comparison_seconds,
+            total_seconds=total_seconds
+        )
+
+    def _run_iterations(
+        self,
+        pipeline: EmbeddingPipeline,
+        executor: Optional[ThreadPoolExecutor],
+        indices: range,
+        call: Callable[[], str]
+    ) -> None:
+        """Run synchronous iterations, on the executor if any, and submit their responses"""
+        if executor is not None:
+            futures = [executor.submit(call) for _ in indices]
+            for index, future in zip(indices, futures):  # Collected in iteration order
+                try:
+                    pipeline.submit(index, future.result())
+                except Exception as e:
+                    self._capture_exception(e)
+        else:
+            for index in indices:
+                try:
+                    pipeline.submit(index, call())
+                except Exception as e:
+                    self._capture_exception(e)
+
+    def _sampling_complete(
+        self, pipeline: AsyncEmbeddingPipeline | EmbeddingPipeline, completed: int
+    ) -> bool:
+        """
+        Whether adaptive sampling can stop after `completed` iterations, whose
+        responses have all been scored. Records the convergence state.
+        """
+        assert self.target_ci_width is not None
+        ci_width = pipeline.statistics.ci_width(self.confidence)
+        converged = (
+            completed >= self.iterations
+            and ci_width is not None and ci_width <= self.target_ci_width
+        )
+        self.convergence = ConvergenceMetrics(
+            min_iterations=self.iterations,
+            max_iterations=self.max_iterations,
+            target_ci_width=self.target_ci_width,
+            confidence=self.confidence,
+            iterations=completed,
+            ci_width=ci_width,
+            converged=converged
+        )
+        return converged or completed >= self.max_iterations
+
+    def _adaptive_wave(self, completed: int, concurrency: int, batch_size: int) -> int:
+        """
+        Iterations of the next adaptive sampling wave: all of the minimum
+        `iterations` at once, then enough to fill an embedding micro-batch (or
+        every worker) before convergence is checked again
+        """
+        if completed < self.iterations:
+            wave = self.iterations - completed
+        else:
+            wave = max(concurrency, batch_size)
+        return min(wave, self.max_iterations - completed)
+
+    def _record_iteration(self, seconds: float) -> None:
+        """Record the wall time of one iteration"""
+        if self.streaming:
+            self._iteration_distribution.add(seconds)
+        else:
+            self.iteration_seconds.append(seconds)
+
+    def _call_iteration(self, *args: Any, **kwargs: Any) -> str:
+        """
+        Execute one synchronous iteration once the rate limiter allows it,
+        recording its wall time (excluding any rate limiter wait)
+        """
+        rate_limiter = RateLimiter.get_default()
+        if rate_limiter is not None:
+            rate_limiter.acquire(self.tokens_per_call)
+
+        start = time.perf_counter()
+        try:
+            return self.func(*args, **kwargs)  # type: ignore[return-value]
+        finally:
+            self._record_iteration(time.perf_counter() - start)
+
+    def _fingerprint_parts(self) -> list[bytes]:
+        """Encoded inputs of `fingerprint`"""
+        embedding_client = self.embedding_client
         return [
-            self.comparator.calculate_distance(
-                embedding_a=self.embedding_expectation,
-                embedding_b=result_embedding
-            )
-            for result_embedding in self.result_embeddings
+            f"fingerprint-v{FINGERPRINT_VERSION}".encode("utf-8"),
+            self._function_source(),
+            (
+                json.dumps({
+                    "references": self.references,
+                    "scoring": self.reference_scoring,
+                    "temperature": self.reference_temperature,
+                }) if self.multiple_references else self.references[0]
+            ).encode("utf-8"),
+            str(self.iterations).encode("utf-8"),
+            (
+                f"{self.target_ci_width}:{self.max_iterations}:{self.confidence}"
+                if self.adaptive else ""
+            ).encode("utf-8"),
+            ",".join(str(comparator) for comparator in self.comparators).encode("utf-8"),
+            embedding_client.cache_namespace.encode("utf-8"),
+            embedding_client.model.encode("utf-8"),
+            str(embedding_client.dimensions).encode("utf-8"),
+            *([f"streaming:{self.reservoir_size}".encode("utf-8")] if self.streaming else []),
+            *self._dependency_digests(),
         ]
 
+    def _function_source(self) -> bytes:
+        """Source of the benchmarked function, or its marshalled code object"""
+        try:
+            return inspect.getsource(self.func).encode("utf-8")
+        except (OSError, TypeError):
+            return marshal.dumps(self.func.__code__)
+
+    def _base_directory(self) -> Path:
+        """Directory of the benchmark's source file, which relative paths are resolved from"""
+        try:
+            source_file = inspect.getsourcefile(self.func)
+        except TypeError:
+            source_file = None
+        return Path(source_file).parent if source_file else Path.cwd()
+
+    def _dependency_digests(self) -> list[bytes]:
+        """Path and content digest of every file under the declared dependencies"""
+        base_directory = self._base_directory()
+
+        digests = []
+        for dependency in sorted(self.depends_on):
+            path = base_directory / dependency
+            files = (
+                [file for file in sorted(path.rglob("*")) if not file.is_dir()]
+                if path.is_dir() else [path]
+            )
+            for file in files:
+                content_digest = "missing"
+                if file.is_file():
+                    # Hashed in chunks: dependencies include whole datasets
+                    with file.open("rb") as dependency_file:
+                        content_digest = hashlib.file_digest(dependency_file, "sha256").hexdigest()
+                name = dependency / file.relative_to(path) if file != path else dependency
+                digests.append(f"{name.as_posix()}:{content_digest}".encode("utf-8"))
+
+        return digests
 
-def benchmark(
-    semantic_expectation: str,
+    def _log_header(self) -> None:
+        """Log the benchmark banner"""
+        fmt_token = '='
+        info = (
+            f"{fmt_token*35} "
+            f"{self.func.__name__} (n={self.iterations} iterations) "
+            f"{fmt_token*35}\n"
+        )
+        logger.info(info)
+
+    def _capture_exception(self, e: Exception) -> None:
+        """Log and record an exception raised by a single iteration"""
+        logger.info("Exception captured\n")
+        exception_msg = f"{e!r}\n"
+        logger.exception(exception_msg, exc_info=e)
+        logger.info("\n")
+        self.exceptions.append(e)
+
+    def _resolve_expectation_embedding(self) -> npt.NDArray[np.floating[Any]]:
+        """
+        Generate the expectation embedding (a k x d matrix for several
+        references) if it was not resolved ahead of time
+        """
+        if self.embedding_expectation is None:
+            self.embedding_expectation = self._expectation_embedding(
+                self.embedding_client.generate_embedding_vectors(self.references)
+            )
+        return self.embedding_expectation
+
+    async def _aresolve_expectation_embedding(self) -> npt.NDArray[np.floating[Any]]:
+        """Async variant of `_resolve_expectation_embedding`"""
+        if self.embedding_expectation is None:
+            self.embedding_expectation = self._expectation_embedding(
+                await self.embedding_client.agenerate_embedding_vectors(self.references)
+            )
+        return self.embedding_expectation
+
+    def _expectation_embedding(
+        self, reference_embeddings: npt.NDArray[np.floating[Any]]
+    ) -> npt.NDArray[np.floating[Any]]:
+        """The single reference's vector, or the matrix of several references"""
+        return reference_embeddings if self.multiple_references else reference_embeddings[0]
+
+
+def benchmark(  # pylint: disable=too-many-arguments,too-many-locals
+    semantic_expectation: str | Sequence[str],
     iterations: int = 1,
-    comparator: ComparatorBase = CosineSimilarity(),
-    embedding_client: EmbeddingClient = EmbeddingClient()
-) -> Callable[[Callable[..., Any]], Callable[..., BenchmarkMetadata]]:
-    """Generate and execute a benchmark client test"""
+    comparator: ComparatorBase | Sequence[ComparatorBase] = CosineSimilarity(),
+    embedding_client: Optional[EmbeddingProvider] = None,
+    *,
+    max_concurrency: int = settings.MAX_CONCURRENCY,
+    workers: Optional[int] = None,
+    tokens_per_call: int = 0,
+    depends_on: Sequence[str | Path] = (),
+    target_ci_width: Optional[float] = None,
+    max_iterations: int = settings.ADAPTIVE_MAX_ITERATIONS,
+    confidence: float = settings.ADAPTIVE_CONFIDENCE,
+    reference_scoring: str = "max",
+    reference_temperature: float = settings.REFERENCE_SOFTMIN_TEMPERATURE,
+    streaming_stats: Optional[bool] = None,
+    reservoir_size: int = settings.STREAMING_RESERVOIR_SIZE
+) -> Callable[[Callable[..., Any]], BenchmarkFunction]:
+    """
+    Generate and execute a benchmark client test. Decorating a coroutine
+    function produces a coroutine function returning the benchmark metadata.
+    `workers` runs synchronous iterations on a thread pool, and `tokens_per_call`
+    is the token estimate charged against the tokens-per-minute limit. Pass a
+    list of comparators to evaluate them all in a single pass. Without an
+    `embedding_client`, the default provider of the configured embedding backend is used.
+    `depends_on` declares files (e.g. prompt templates) that invalidate cached results.
+    With `target_ci_width`, `iterations` is the minimum and sampling continues until
+    the `confidence` interval of the mean distance is that narrow, or `max_iterations`.
+    A list of `semantic_expectation`s is scored by each response's best-matching reference,
+    or by the `mean` or `softmin` over references (see `reference_scoring`).
+    `streaming_stats` keeps memory bounded for long runs by summarizing results on
+    the fly and sampling `reservoir_size` responses (default: `--streaming-stats`).
+    """
 
-    def decorator(func: Callable[..., Any]) -> Callable[..., BenchmarkMetadata]:
-        benchmark_runner = BenchmarkRunner(
+    def decorator(func: Callable[..., Any]) -> BenchmarkFunction:
+        return wrap_benchmark_runner(func, BenchmarkRunner(
             func=func,
             semantic_expectation=semantic_expectation,
             iterations=iterations,
             comparator=comparator,
-            embedding_client=embedding_client
-        )
+            embedding_client=embedding_client,
+            max_concurrency=max_concurrency,
+            workers=workers,
+            tokens_per_call=tokens_per_call,
+            depends_on=depends_on,
+            target_ci_width=target_ci_width,
+            max_iterations=max_iterations,
+            confidence=confidence,
+            reference_scoring=reference_scoring,
+            reference_temperature=reference_temperature,
+            streaming_stats=streaming_stats,
+            reservoir_size=reservoir_size
+        ))
+    return decorator
 
+
+def wrap_benchmark_runner(
+    func: Callable[..., Any], benchmark_runner: BenchmarkRunner
+) -> BenchmarkFunction:
+    """Benchmark function running `benchmark_runner`, marked for discovery"""
+    inner: BenchmarkFunction
+    if benchmark_runner.is_async:
+        @wraps(func)
+        async def async_inner(*args: Any, **kwargs: Any) -> BenchmarkMetadata:
+            return await benchmark_runner.arun(*args, **kwargs)
+        inner = async_inner
+    else:
         @wraps(func)
-        def inner(*args: Any, **kwargs: Any) -> BenchmarkMetadata:
+        def sync_inner(*args: Any, **kwargs: Any) -> BenchmarkMetadata:
             return benchmark_runner.run(*args, **kwargs)
+        inner = sync_inner
 
-        setattr(inner, "_benchmark", True)  # Mark function as a benchmark
+    setattr(inner, "_benchmark", True)  # Mark function as a benchmark
+    setattr(inner, "_benchmark_runner", benchmark_runner)
 
-        return inner
-    return decorator
+    return inner
+
+
+def get_benchmark_runner(benchmark_func: BenchmarkFunction) -> BenchmarkRunner:
+    """Retrieve the runner backing a `benchmark`-decorated function"""
+    benchmark_runner = getattr(benchmark_func, "_benchmark_runner", None)
+    if not isinstance(benchmark_runner, BenchmarkRunner):
+        exc = f"{benchmark_func!r} is not a semtest benchmark"
+        raise TypeError(exc)
+
+    return benchmark_runner
+
+
+def resolve_expectation_embeddings(benchmark_runners: list[BenchmarkRunner]) -> None:
+    """
+    Embed the semantic expectations (every reference answer) of many runners up front.
+    Expectations are deduplicated per embedding client and generated in as few batched
+    calls as possible.
+    """
+    pending: dict[int, list[BenchmarkRunner]] = {}
+    for benchmark_runner in benchmark_runners:
+        if benchmark_runner.shared_expectation and benchmark_runner.embedding_expectation is None:
+            pending.setdefault(id(benchmark_runner.embedding_client), []).append(benchmark_runner)
+
+    for client_runners in pending.values():
+        embedding_client = client_runners[0].embedding_client
+        expectations = list(dict.fromkeys(
+            reference
+            for benchmark_runner in client_runners
+            for reference in benchmark_runner.references
+        ))
+        embeddings = embedding_client.generate_embedding_vectors(expectations)
+        positions = {expectation: position for position, expectation in enumerate(expectations)}
+        for benchmark_runner in client_runners:
+            rows = [positions[reference] for reference in benchmark_runner.references]
+            benchmark_runner.embedding_expectation = (
+                embeddings[rows] if benchmark_runner.multiple_references else embeddings[rows[0]]
+            )
@@ -0,0 +1,432 @@
+"""Dataset-driven benchmarks streaming (input, expectation) cases from JSONL or CSV files"""
+# pylint: disable=broad-exception-caught
+import asyncio
+import csv
+import json
+import logging
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterator, Optional, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from semtest.config import settings
+from semtest.llm_client import EmbeddingProvider
+from semtest.semantic_comparator import ComparatorBase, CosineSimilarity
+
+from .benchmark import BenchmarkFunction, BenchmarkRunner, wrap_benchmark_runner
+from .metrics import BenchmarkMetadata, SliceMetrics
+from .pipeline import AsyncEmbeddingPipeline, EmbeddingPipeline
+from .rate_limit import RateLimiter
+from .statistics import StreamingDistribution
+
+logger = logging.getLogger("semtest")
+
+DATASET_FORMATS = {".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv"}
+
+# (position of the `slice_by` field, slice value)
+SliceKey = tuple[int, str]
+
+
+@dataclass
+class DatasetCase:
+    """One dataset row: the benchmarked function's input, its expectation and slice values"""
+    index: int
+    input: Any
+    expectation: str
+    slices: tuple[str, ...] = ()
+
+
+class Dataset:
+    """
+    Benchmark cases read lazily, one row at a time, from a JSONL file (one JSON
+    object per line) or a CSV file with a header row. Each row holds the
+    function input under `input_field` and the expected response under
+    `expectation_field`; `slice_fields` name the columns whose values group
+    cases into reported slices.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        input_field: str = "input",
+        expectation_field: str = "expectation",
+        slice_fields: Sequence[str] = ()
+    ) -> None:
+        self.path = Path(path)
+        self.input_field = input_field
+        self.expectation_field = expectation_field
+        self.slice_fields = list(slice_fields)
+
+        dataset_format = DATASET_FORMATS.get(self.path.suffix.lower())
+        if dataset_format is None:
+            exc = f"Unsupported dataset file {path}, expected one of: {', '.join(DATASET_FORMATS)}"
+            raise ValueError(exc)
+        self.format = dataset_format
+
+    def __iter__(self) -> Iterator[DatasetCase]:
+        """Cases in file order"""
+        for index, (line_number, row) in enumerate(self._rows()):
+            missing = [
+                field for field in (self.input_field, self.expectation_field) if field not in row
+            ]
+            if missing:
+                fields = ", ".join(map(repr, missing))
+                exc = f"{self.path}:{line_number} is missing field(s) {fields}"
+                raise ValueError(exc)
+
+            case = DatasetCase(
+                index=index,
+                input=row[self.input_field],
+                expectation=str(row[self.expectation_field]),
+                slices=tuple(
+                    "" if row.get(field) is None else str(row[field])
+                    for field in self.slice_fields
+                )
+            )
+            yield case
+
+    def _rows(self) -> Iterator[tuple[int, dict[str, Any]]]:
+        """Line number and fields of every row"""
+        if self.format == "csv":
+            with self.path.open(encoding="utf-8", newline="") as dataset_file:
+                reader = csv.DictReader(dataset_file)
+                for row in reader:
+                    yield reader.line_num, row
+            return
+
+        with self.path.open(encoding="utf-8") as dataset_file:
+            for line_number, line in enumerate(dataset_file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    exc = f"{self.path}:{line_number} is not valid JSON: {e}"
+                    raise ValueError(exc) from e
+                if not isinstance(row, dict):
+                    exc = f"{self.path}:{line_number} is not a JSON object"
+                    raise ValueError(exc)
+                yield line_number, row
+
+
+class DatasetBenchmarkRunner(BenchmarkRunner):
+    """
+    Runs the benchmarked function once per dataset case, with the case input
+    followed by any arguments the benchmark is called with. Cases are streamed
+    from the file with bounded read-ahead, so the dataset is never held in
+    memory, and run on `workers` threads (or `max_concurrency` concurrent
+    coroutines). The pipeline embeds each micro-batch of responses together
+    with their expectations and scores every response against its own case.
+    Response embeddings are not retained. Distances over all cases are
+    reported as usual, plus a `SliceMetrics` summary per value of each
+    `slice_by` field, aggregated as distances arrive so only in-flight cases
+    keep their slice values. With streaming statistics, slice summaries are
+    streamed too (approximate medians) and memory does not grow with the
+    dataset. The dataset file is part of the benchmark's fingerprint.
+    """
+
+    shared_expectation = False
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-locals
+        self,
+        func: Callable[..., str] | Callable[..., Awaitable[str]],
+        dataset: str | Path,
+        comparator: ComparatorBase | Sequence[ComparatorBase],
+        embedding_client: Optional[EmbeddingProvider] = None,
+        *,
+        input_field: str = "input",
+        expectation_field: str = "expectation",
+        slice_by: Sequence[str] = (),
+        max_concurrency: int = settings.MAX_CONCURRENCY,
+        workers: Optional[int] = None,
+        tokens_per_call: int = 0,
+        depends_on: Sequence[str | Path] = (),
+        streaming_stats: Optional[bool] = None,
+        reservoir_size: int = settings.STREAMING_RESERVOIR_SIZE
+    ):
+        # The dataset is part of the fingerprint; iterations are counted as cases run
+        super().__init__(
+            func,
+            str(dataset),
+            0,
+            comparator,
+            embedding_client,
+            max_concurrency=max_concurrency,
+            workers=workers,
+            tokens_per_call=tokens_per_call,
+            depends_on=[*depends_on, dataset],
+            streaming_stats=streaming_stats,
+            reservoir_size=reservoir_size
+        )
+        self.dataset_path = Path(dataset)
+        self.input_field = input_field
+        self.expectation_field = expectation_field
+        self.slice_by = list(slice_by)
+
+        self.cases = 0
+        # Slice values of cases submitted but not yet scored, by case index
+        self._pending_slices: dict[int, tuple[str, ...]] = {}
+        self._slice_distances: dict[SliceKey, StreamingDistribution | list[np.float64]] = {}
+        self._slice_exceptions: dict[SliceKey, int] = {}
+
+    @property
+    def dataset(self) -> Dataset:
+        """Dataset file, relative paths being resolved from the benchmark's source file"""
+        return Dataset(
+            self._base_directory() / self.dataset_path,
+            input_field=self.input_field,
+            expectation_field=self.expectation_field,
+            slice_fields=self.slice_by
+        )
+
+    def run(self, *args: Any, **kwargs: Any) -> BenchmarkMetadata:
+        """Run every dataset case and score each response against its expectation"""
+        if self.is_async:
+            return asyncio.run(self.arun(*args, **kwargs))
+
+        self._log_header()
+        start = time.perf_counter()
+
+        pipeline = EmbeddingPipeline(
+            self.func.__name__, self.embedding_client, self.comparators, None,
+            keep_embeddings=False,
+            streaming=self.streaming,
+            reservoir_size=self.reservoir_size,
+            on_scored=self._record_slice_distances
+        )
+        pipeline.start()
+
+        workers = self.workers or self.default_workers
+        executor = (
+            ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix=f"semtest-{self.func.__name__}"
+            ) if workers > 1 else None
+        )
+        try:
+            # Cases are submitted in order with at most 2 * workers in flight
+            pending: deque[tuple[DatasetCase, Future[str]]] = deque()
+            for case in self._cases():
+                call = partial(self._call_iteration, case.input, *args, **kwargs)
+                if executor is None:
+                    self._submit_case(pipeline, case, call)
+                    continue
+
+                pending.append((case, executor.submit(call)))
+                if len(pending) >= 2 * workers:
+                    pending_case, future = pending.popleft()
+                    self._submit_case(pipeline, pending_case, future.result)
+
+            while pending:
+                pending_case, future = pending.popleft()
+                self._submit_case(pipeline, pending_case, future.result)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+            self.result_set, self.result_embeddings, distances = pipeline.close()
+
+        return self._complete_run(pipeline, distances, time.perf_counter() - start)
+
+    async def arun(self, *args: Any, **kwargs: Any) -> BenchmarkMetadata:
+        """Run every dataset case of a coroutine function with bounded concurrency"""
+        if not self.is_async:
+            return self.run(*args, **kwargs)
+
+        rate_limiter = RateLimiter.get_default()
+        self._log_header()
+        start = time.perf_counter()
+
+        pipeline = AsyncEmbeddingPipeline(
+            self.func.__name__, self.embedding_client, self.comparators, None,
+            keep_embeddings=False,
+            streaming=self.streaming,
+            reservoir_size=self.reservoir_size,
+            on_scored=self._record_slice_distances
+        )
+        pipeline.start()
+
+        # Concurrent workers draw cases from one shared iterator
+        cases = self._cases()
+
+        async def worker() -> None:
+            for case in cases:
+                if rate_limiter is not None:
+                    await rate_limiter.aacquire(self.tokens_per_call)
+                iteration_start = time.perf_counter()
+                try:
+                    try:
+                        response: str = await self.func(  # type: ignore[misc]
+                            case.input, *args, **kwargs
+                        )
+                    finally:
+                        self._record_iteration(time.perf_counter() - iteration_start)
+                    await pipeline.submit(case.index, response, case.expectation)
+                except Exception as e:
+                    self._record_failed_case(case)
+                    self._capture_exception(e)
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(self.max_concurrency)))
+        finally:
+            self.result_set, self.result_embeddings, distances = await pipeline.close()
+
+        return self._complete_run(pipeline, distances, time.perf_counter() - start)
+
+    def reset(self) -> None:
+        """Release results and per-case bookkeeping once they have been reported"""
+        super().reset()
+        self.cases = 0
+        self._pending_slices = {}
+        self._slice_distances = {}
+        self._slice_exceptions = {}
+
+    def _completed_iterations(self) -> int:
+        """One iteration per dataset case"""
+        return self.cases
+
+    def _fingerprint_parts(self) -> list[bytes]:
+        """Fingerprint inputs, including which dataset fields are read"""
+        fields = [self.input_field, self.expectation_field, *self.slice_by]
+        return [*super()._fingerprint_parts(), ",".join(fields).encode("utf-8")]
+
+    def _complete_run(
+        self,
+        pipeline: AsyncEmbeddingPipeline | EmbeddingPipeline,
+        distances: dict[str, list[np.float64]],
+        total_seconds: float
+    ) -> BenchmarkMetadata:
+        """Record the distances, timings and slice metrics of a completed run"""
+        self._assign_distances(distances)
+        self._record_aggregates(pipeline)
+        self._record_timings(pipeline, total_seconds)
+        self.slices = self._slice_metrics()
+        return self.metrics
+
+    def _cases(self) -> Iterator[DatasetCase]:
+        """Stream dataset cases, counting them and holding their slice values until scored"""
+        for case in self.dataset:
+            self.cases += 1
+            if self.slice_by:
+                self._pending_slices[case.index] = case.slices
+            yield case
+
+    def _submit_case(
+        self, pipeline: EmbeddingPipeline, case: DatasetCase, call: Callable[[], str]
+    ) -> None:
+        """Submit the response of a synchronous case for scoring, capturing its exception"""
+        try:
+            pipeline.submit(case.index, call(), case.expectation)
+        except Exception as e:
+            self._record_failed_case(case)
+            self._capture_exception(e)
+
+    def _record_failed_case(self, case: DatasetCase) -> None:
+        """Count a failed case against each of its slices"""
+        self._pending_slices.pop(case.index, None)
+        for key in enumerate(case.slices):
+            self._slice_exceptions[key] = self._slice_exceptions.get(key, 0) + 1
+
+    def _record_slice_distances(
+        self, indices: list[int], distances: npt.NDArray[np.float64]
+    ) -> None:
+        """Fold a scored micro-batch's primary distances into its cases' slices"""
+        if not self.slice_by:
+            return
+
+        batch_slices: dict[SliceKey, list[np.float64]] = {}
+        for index, distance in zip(indices, distances):
+            for key in enumerate(self._pending_slices.pop(index)):
+                batch_slices.setdefault(key, []).append(distance)
+
+        for key, slice_distances in batch_slices.items():
+            aggregate = self._slice_distances.get(key)
+            if aggregate is None:
+                aggregate = StreamingDistribution() if self.streaming else []
+                self._slice_distances[key] = aggregate
+            if isinstance(aggregate, StreamingDistribution):
+                aggregate.update(np.asarray(slice_distances, dtype=np.float64))
+            else:
+                aggregate.extend(slice_distances)
+
+    def _slice_metrics(self) -> list[SliceMetrics]:
+        """Case count, distance summary and exception count of every slice"""
+        slice_metrics = []
+        for key in sorted(self._slice_distances.keys() | self._slice_exceptions.keys()):
+            position, value = key
+            aggregate = self._slice_distances.get(key, [])
+            exception_ct = self._slice_exceptions.get(key, 0)
+            if isinstance(aggregate, StreamingDistribution):
+                summary = aggregate.summary()
+                scored, mean, median = summary.count, summary.mean, summary.p50
+            else:
+                scored = len(aggregate)
+                mean = float(np.mean(aggregate)) if aggregate else None
+                median = float(np.median(aggregate)) if aggregate else None
+
+            slice_metrics.append(SliceMetrics(
+                field=self.slice_by[position],
+                value=value,
+                cases=scored + exception_ct,
+                mean_semantic_distance=mean,
+                median_semantic_distance=median,
+                exception_ct=exception_ct
+            ))
+
+        return slice_metrics
+
+    def _log_header(self) -> None:
+        """Log the benchmark banner"""
+        fmt_token = '='
+        info = (
+            f"{fmt_token*35} "
+            f"{self.func.__name__} (dataset {self.dataset_path}) "
+            f"{fmt_token*35}\n"
+        )
+        logger.info(info)
+
+
+def dataset_benchmark(  # pylint: disable=too-many-arguments
+    dataset: str | Path,
+    comparator: ComparatorBase | Sequence[ComparatorBase] = CosineSimilarity(),
+    embedding_client: Optional[EmbeddingProvider] = None,
+    *,
+    input_field: str = "input",
+    expectation_field: str = "expectation",
+    slice_by: Sequence[str] = (),
+    max_concurrency: int = settings.MAX_CONCURRENCY,
+    workers: Optional[int] = None,
+    tokens_per_call: int = 0,
+    depends_on: Sequence[str | Path] = (),
+    streaming_stats: Optional[bool] = None,
+    reservoir_size: int = settings.STREAMING_RESERVOIR_SIZE
+) -> Callable[[Callable[..., Any]], BenchmarkFunction]:
+    """
+    Benchmark a function over every case of a JSONL or CSV dataset (relative
+    paths resolve from the benchmark's file). The function receives each case's
+    `input_field` value and its response is scored against the case's
+    `expectation_field`. `slice_by` fields are reported as per-slice metrics.
+    Other options behave as in `benchmark`.
+    """
+
+    def decorator(func: Callable[..., Any]) -> BenchmarkFunction:
+        return wrap_benchmark_runner(func, DatasetBenchmarkRunner(
+            func=func,
+            dataset=dataset,
+            comparator=comparator,
+            embedding_client=embedding_client,
+            input_field=input_field,
+            expectation_field=expectation_field,
+            slice_by=slice_by,
+            max_concurrency=max_concurrency,
+            workers=workers,
+            tokens_per_call=tokens_per_call,
+            depends_on=depends_on,
+            streaming_stats=streaming_stats,
+            reservoir_size=reservoir_size
+        ))
+    return decorator
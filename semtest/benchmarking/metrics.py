@@ -1,16 +1,104 @@
 """Benchmark metrics and metadata classes"""
+import builtins
+from functools import cached_property
+from typing import Any, Optional
+
 import numpy as np
+import numpy.typing as npt
 from pydantic import BaseModel, Field, computed_field
 
 
+class ConvergenceMetrics(BaseModel):
+    """
+    Outcome of adaptive sampling: iterations stop once the confidence interval
+    of the mean semantic distance is at most `target_ci_width` wide (after at
+    least `min_iterations`), or at `max_iterations`
+    """
+    min_iterations: int
+    max_iterations: int
+    target_ci_width: float
+    confidence: float
+    iterations: int
+    ci_width: Optional[float] = None
+    converged: bool = False
+
+
+class DistributionSummary(BaseModel):
+    """
+    Streaming summary of a benchmark's values (distances or iteration
+    latencies): exact count, mean and variance, approximate percentiles
+    """
+    count: int = 0
+    mean: Optional[float] = None
+    variance: Optional[float] = None
+    p50: Optional[float] = None
+    p90: Optional[float] = None
+    p99: Optional[float] = None
+
+
+class ReferenceMetrics(BaseModel):
+    """
+    Scoring against several reference answers: each distance aggregates the
+    response's distances to every reference with `scoring` (`max`, `mean` or
+    `softmin` at `temperature`), and `matched` holds the index of each scored
+    response's closest reference. With streaming statistics, `matched` only
+    covers the sampled responses and `counts` holds the counts of all of them.
+    """
+    references: int
+    scoring: str
+    temperature: float
+    matched: list[int] = []
+    counts: Optional[list[int]] = None
+
+    @computed_field
+    @property
+    def match_counts(self) -> list[int]:
+        """Number of responses whose closest reference is each reference"""
+        if self.counts is not None:
+            return self.counts
+        return [int(count) for count in np.bincount(
+            np.asarray(self.matched, dtype=np.intp), minlength=self.references
+        )]
+
+
+class SliceMetrics(BaseModel):
+    """Primary distance summary of the dataset cases sharing a value of one slice field"""
+    field: str
+    value: str
+    cases: int
+    mean_semantic_distance: Optional[float] = None
+    median_semantic_distance: Optional[float] = None
+    exception_ct: int = 0
+
+
 class SemanticMetrics(BaseModel):
-    """Semantic benchmark metric aggregator"""
+    """
+    Semantic benchmark metric aggregator. With streaming statistics,
+    `responses` and the distance lists only hold a bounded random sample of
+    the responses, and aggregates come from the `distance_summary` and
+    `comparator_summaries` of every response instead.
+    """
     responses: list[str]
     exceptions: list[Exception]
-    result_embeddings: list[list[float]] = Field(
+    # n x d float32/float16 matrix, held by reference rather than copied
+    result_embeddings: npt.NDArray[np.floating[Any]] = Field(
         ..., exclude=True
     )
+    expectation_embedding: Optional[npt.NDArray[np.floating[Any]]] = Field(
+        None, exclude=True
+    )
     semantic_distances: list[np.float64]
+    # Distances of any additional comparators, keyed by comparator name
+    comparator_distances: dict[str, list[np.float64]] = {}
+    # Set when iterations were sampled adaptively
+    convergence: Optional[ConvergenceMetrics] = None
+    # Per-slice summaries of dataset benchmarks
+    slices: list[SliceMetrics] = []
+    # Set when responses were scored against several reference answers
+    references: Optional[ReferenceMetrics] = None
+    # Set with streaming statistics
+    distance_summary: Optional[DistributionSummary] = None
+    comparator_summaries: dict[str, DistributionSummary] = {}
 
     class Config:
         """Semantic metrics configurations"""
@@ -20,22 +108,130 @@ class SemanticMetrics(BaseModel):
         }
 
     @computed_field
-    @property
+    @cached_property
     def mean_semantic_distance(self) -> np.float64:
         """Calculate mean semantic distance from result expectations"""
+        if self.distance_summary is not None:
+            return _summary_value(self.distance_summary.mean)
         return np.mean(self.semantic_distances)
 
     @computed_field
-    @property
+    @cached_property
     def median_semantic_distance(self) -> np.float64:
         """Calculate median semantic distance from result expectation"""
+        if self.distance_summary is not None:
+            return _summary_value(self.distance_summary.p50)
         return np.median(self.semantic_distances)
 
+    @computed_field
+    @cached_property
+    def mean_comparator_distances(self) -> dict[str, float]:
+        """Mean distance of each additional comparator"""
+        if self.comparator_summaries:
+            return {
+                comparator: float(_summary_value(summary.mean))
+                for comparator, summary in self.comparator_summaries.items()
+            }
+        return {
+            comparator: float(np.mean(distances))
+            for comparator, distances in self.comparator_distances.items()
+        }
+
+    @computed_field
+    @cached_property
+    def median_comparator_distances(self) -> dict[str, float]:
+        """Median distance of each additional comparator"""
+        if self.comparator_summaries:
+            return {
+                comparator: float(_summary_value(summary.p50))
+                for comparator, summary in self.comparator_summaries.items()
+            }
+        return {
+            comparator: float(np.median(distances))
+            for comparator, distances in self.comparator_distances.items()
+        }
+
+
+class TimingMetrics(BaseModel):
+    """
+    Wall-clock timings of a benchmark run: each iteration of the function under
+    test, plus the time spent embedding responses and comparing embeddings
+    """
+    iteration_seconds: list[float] = []
+    embedding_seconds: float = 0.0
+    comparison_seconds: float = 0.0
+    total_seconds: float = 0.0
+    # Set instead of `iteration_seconds` with streaming statistics
+    iteration_summary: Optional[DistributionSummary] = None
+
+    @property
+    def iteration_count(self) -> int:
+        """Number of iterations timed"""
+        if self.iteration_summary is not None:
+            return self.iteration_summary.count
+        return len(self.iteration_seconds)
+
+    @computed_field
+    @property
+    def p50_iteration_seconds(self) -> Optional[float]:
+        """Median iteration latency"""
+        return self._percentile(50)
+
+    @computed_field
+    @property
+    def p90_iteration_seconds(self) -> Optional[float]:
+        """90th percentile iteration latency"""
+        return self._percentile(90)
+
+    @computed_field
+    @property
+    def p99_iteration_seconds(self) -> Optional[float]:
+        """99th percentile iteration latency"""
+        return self._percentile(99)
+
+    @computed_field
+    @property
+    def throughput_per_second(self) -> Optional[float]:
+        """Iterations completed per second of benchmark wall time"""
+        if not self.total_seconds:
+            return None
+        return self.iteration_count / self.total_seconds
+
+    def _percentile(self, percentile: float) -> Optional[float]:
+        """Iteration latency percentile, if any iterations ran"""
+        if self.iteration_summary is not None:
+            summary_percentile: Optional[float] = getattr(
+                self.iteration_summary, f"p{percentile:g}"
+            )
+            return summary_percentile
+        if not self.iteration_seconds:
+            return None
+        return float(np.percentile(self.iteration_seconds, percentile))
+
 
 class BenchmarkMetadata(BaseModel):
     """Core benchmark metadata/metrics class"""
     func: str
+    # `module::function` id, unset for results re-scored from run artifacts
+    benchmark_id: Optional[str] = None
     iterations: int
     comparator: str
-    expectation_input: str
+    # A list when scored against several reference answers
+    expectation_input: str | list[str]
     benchmarks: SemanticMetrics
+    timings: TimingMetrics = TimingMetrics()
+    # Replayed from the result cache rather than executed in this run
+    cached: bool = False
+
+
+def _summary_value(value: Optional[float]) -> np.float64:
+    """A summary statistic as a float64, NaN when there were no values (as with `np.mean`)"""
+    return np.float64(value) if value is not None else np.float64(np.nan)
+
+
+def restore_exception(exception_type: str, message: str) -> Exception:
+    """Rebuild a stored exception; types other than builtins are restored as RuntimeError"""
+    exception_class = getattr(builtins, exception_type, None)
+    if isinstance(exception_class, type) and issubclass(exception_class, Exception):
+        return exception_class(message)
+    return RuntimeError(f"{exception_type}: {message}")
@@ -0,0 +1,409 @@
+"""Streaming embedding stage that overlaps response embedding with benchmark iterations"""
+# pylint: disable=broad-exception-caught
+import asyncio
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from semtest.config import settings
+from semtest.llm_client import EmbeddingMatrix, EmbeddingProvider
+from semtest.semantic_comparator import (
+    ComparatorBase,
+    calculate_multi_distances,
+    calculate_paired_distances,
+    calculate_reference_distances
+)
+
+from .metrics import DistributionSummary
+from .statistics import Reservoir, RunningStatistics, StreamingDistribution
+
+logger = logging.getLogger("semtest")
+
+# (iteration index, response, expectation of this response or None for the shared one)
+PipelineItem = tuple[int, str, Optional[str]]
+# Responses, embedding matrix and distances keyed by comparator name
+PipelineResults = tuple[list[str], EmbeddingMatrix, dict[str, list[np.float64]]]
+# (iteration index, response, distance of each comparator, closest reference or None)
+SampledResponse = tuple[int, str, tuple[np.float64, ...], Optional[int]]
+
+_CLOSE = None
+
+
+class _PipelineBase:
+    """
+    Shared micro-batch bookkeeping: responses are keyed by iteration index, embedded
+    in batches, scored against the expectation by every comparator as each batch
+    arrives, and returned in iteration order once the pipeline is closed. Running
+    statistics of the primary comparator's distances are kept up to date.
+
+    Without a shared `embedding_expectation`, every response is submitted with
+    its own expectation text, embedded in the same call as the responses and
+    scored pairwise. A k x d `embedding_expectation` holds several reference
+    answers: each batch is scored against all of them in one matrix operation
+    and aggregated with `reference_scoring`, and the closest reference of each
+    response is kept. With `keep_embeddings` unset, response embeddings are
+    dropped once scored and an empty matrix is returned.
+
+    With `streaming`, memory stays bounded however many responses are scored:
+    each comparator's distances only feed a `StreamingDistribution`, and a
+    `Reservoir` of `reservoir_size` responses (with their distances) is the
+    sample returned on close. Embeddings are not retained.
+
+    `on_scored`, if given, is called with the iteration indices and primary
+    distances of every scored micro-batch, e.g. to aggregate them by case.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        name: str,
+        embedding_client: EmbeddingProvider,
+        comparators: list[ComparatorBase],
+        embedding_expectation: Optional[npt.NDArray[np.floating[Any]]],
+        *,
+        batch_size: int = settings.PIPELINE_BATCH_SIZE,
+        flush_interval: float = settings.PIPELINE_FLUSH_SECONDS,
+        keep_embeddings: bool = True,
+        reference_scoring: str = "max",
+        reference_temperature: float = settings.REFERENCE_SOFTMIN_TEMPERATURE,
+        streaming: bool = False,
+        reservoir_size: int = settings.STREAMING_RESERVOIR_SIZE,
+        on_scored: Optional[Callable[[list[int], npt.NDArray[np.float64]], Any]] = None
+    ) -> None:
+        self.name = name
+        self.embedding_client = embedding_client
+        self.comparators = comparators
+        self.embedding_expectation = embedding_expectation
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.keep_embeddings = keep_embeddings and not streaming
+        self.streaming = streaming
+        self.reference_scoring = reference_scoring
+        self.reference_temperature = reference_temperature
+        self.on_scored = on_scored
+
+        self._indices: list[int] = []
+        self._responses: list[str] = []
+        self._embedding_chunks: list[EmbeddingMatrix] = []
+        self._matched_chunks: list[npt.NDArray[np.intp]] = []
+        self._distance_chunks: dict[str, list[npt.NDArray[np.float64]]] = {
+            str(comparator): [] for comparator in comparators
+        }
+        self._error: Optional[BaseException] = None
+        self.statistics = RunningStatistics()
+
+        self._distributions = {
+            str(comparator): StreamingDistribution() for comparator in comparators
+        }
+        self._sample: Reservoir[SampledResponse] = Reservoir(reservoir_size)
+        self._match_counts: Optional[npt.NDArray[np.intp]] = None
+
+        # Cumulative wall time of embedding calls and distance computations
+        self.embedding_seconds = 0.0
+        self.comparison_seconds = 0.0
+
+    def _batch_texts(self, batch: list[PipelineItem]) -> list[str]:
+        """Texts to embed for a micro-batch: its responses, then any per-response expectations"""
+        texts = [response for _, response, _ in batch]
+        if self.embedding_expectation is None:
+            texts.extend(expectation or "" for _, _, expectation in batch)
+        return texts
+
+    def _record_batch(self, batch: list[PipelineItem], embeddings: EmbeddingMatrix) -> None:
+        """Score a freshly embedded micro-batch and store it"""
+        start = time.perf_counter()
+        matched: Optional[npt.NDArray[np.intp]] = None
+        if self.embedding_expectation is None:
+            embeddings, expectation_embeddings = embeddings[:len(batch)], embeddings[len(batch):]
+            distances = calculate_paired_distances(
+                self.comparators, expectation_embeddings, embeddings
+            )
+        elif self.embedding_expectation.ndim > 1:
+            distances, matched = calculate_reference_distances(
+                self.comparators,
+                self.embedding_expectation,
+                embeddings,
+                self.reference_scoring,
+                self.reference_temperature
+            )
+        else:
+            distances = calculate_multi_distances(
+                self.comparators, self.embedding_expectation, embeddings
+            )
+        self.comparison_seconds += time.perf_counter() - start
+
+        self.statistics.update(distances[str(self.comparators[0])])
+        if self.on_scored is not None:
+            self.on_scored([index for index, _, _ in batch], distances[str(self.comparators[0])])
+        logger.debug(
+            "%s: %d responses embedded, running mean distance %.4f\n",
+            self.name, self.statistics.count, self.statistics.mean
+        )
+
+        if matched is not None:
+            self._record_matches(matched)
+        if self.streaming:
+            self._sample_batch(batch, distances, matched)
+            return
+
+        self._indices.extend(index for index, _, _ in batch)
+        self._responses.extend(response for _, response, _ in batch)
+        if self.keep_embeddings:
+            self._embedding_chunks.append(embeddings)
+        for comparator_name, comparator_distances in distances.items():
+            self._distance_chunks[comparator_name].append(comparator_distances)
+
+    def _record_matches(self, matched: npt.NDArray[np.intp]) -> None:
+        """Keep the closest references of a batch, or only their counts when streaming"""
+        if not self.streaming:
+            self._matched_chunks.append(matched)
+            return
+
+        assert self.embedding_expectation is not None
+        counts = np.bincount(matched, minlength=self.embedding_expectation.shape[0])
+        self._match_counts = counts if self._match_counts is None else self._match_counts + counts
+
+    def _sample_batch(
+        self,
+        batch: list[PipelineItem],
+        distances: dict[str, npt.NDArray[np.float64]],
+        matched: Optional[npt.NDArray[np.intp]]
+    ) -> None:
+        """Fold a scored batch into the streaming distributions and the response sample"""
+        for comparator_name, comparator_distances in distances.items():
+            self._distributions[comparator_name].update(comparator_distances)
+
+        columns = [distances[str(comparator)] for comparator in self.comparators]
+        for position, (index, response, _) in enumerate(batch):
+            self._sample.offer((
+                index,
+                response,
+                tuple(column[position] for column in columns),
+                int(matched[position]) if matched is not None else None
+            ))
+
+    def summaries(self) -> dict[str, DistributionSummary]:
+        """Summary of each comparator's distances over every response, when streaming"""
+        if not self.streaming:
+            return {}
+        return {
+            comparator_name: distribution.summary()
+            for comparator_name, distribution in self._distributions.items()
+        }
+
+    def match_counts(self) -> Optional[list[int]]:
+        """Responses per closest reference over every response, when streaming"""
+        if self._match_counts is None:
+            return None
+        return [int(count) for count in self._match_counts]
+
+    def matched_references(self) -> list[int]:
+        """
+        Closest reference of each scored response in iteration order, given
+        several (of each sampled response, when streaming)
+        """
+        if self.streaming:
+            return [
+                matched for _, _, _, matched in sorted(self._sample.items, key=lambda item: item[0])
+                if matched is not None
+            ]
+        if not self._matched_chunks:
+            return []
+        order = np.argsort(self._indices, kind="stable")
+        return [int(reference) for reference in np.concatenate(self._matched_chunks)[order]]
+
+    def _results(self) -> PipelineResults:
+        """Responses, embedding matrix and distances, all in iteration order"""
+        if self._error is not None:
+            raise self._error
+
+        if self.streaming:
+            sample = sorted(self._sample.items, key=lambda item: item[0])
+            return (
+                [response for _, response, _, _ in sample],
+                np.empty((0, 0), dtype=self.embedding_client.dtype),
+                {
+                    str(comparator): [distances[position] for _, _, distances, _ in sample]
+                    for position, comparator in enumerate(self.comparators)
+                }
+            )
+
+        if not self._indices:
+            return (
+                [],
+                np.empty((0, 0), dtype=self.embedding_client.dtype),
+                {comparator_name: [] for comparator_name in self._distance_chunks}
+            )
+
+        order = np.argsort(self._indices, kind="stable")
+        embeddings = (
+            np.concatenate(self._embedding_chunks)[order] if self._embedding_chunks
+            else np.empty((0, 0), dtype=self.embedding_client.dtype)
+        )
+        distances = {
+            comparator_name: list(np.concatenate(chunks)[order])
+            for comparator_name, chunks in self._distance_chunks.items()
+        }
+
+        return [self._responses[i] for i in order], embeddings, distances
+
+
+class EmbeddingPipeline(_PipelineBase):
+    """
+    Thread-backed pipeline for synchronous runners. Responses flow through a bounded
+    queue to a background embedder, which flushes a micro-batch once `batch_size`
+    responses are waiting or `flush_interval` seconds have passed.
+    """
+
+    def __init__(self, *args: Any, max_queue: int = settings.PIPELINE_MAX_QUEUE, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._queue: queue.Queue[Optional[PipelineItem | threading.Event]] = queue.Queue(
+            maxsize=max_queue
+        )
+        self._thread = threading.Thread(
+            target=self._consume, name=f"semtest-embed-{self.name}", daemon=True
+        )
+
+    def start(self) -> None:
+        """Start the background embedder"""
+        self._thread.start()
+
+    def submit(self, index: int, response: str, expectation: Optional[str] = None) -> None:
+        """Queue a response for embedding, blocking while the queue is full"""
+        self._queue.put((index, response, expectation))
+
+    def flush(self) -> None:
+        """Embed and score every response submitted so far, blocking until done"""
+        flushed = threading.Event()
+        self._queue.put(flushed)
+        flushed.wait()
+
+    def close(self) -> PipelineResults:
+        """Flush outstanding responses and return ordered results"""
+        self._queue.put(_CLOSE)
+        self._thread.join()
+        return self._results()
+
+    def _consume(self) -> None:
+        """Background loop: gather micro-batches and embed them"""
+        batch: list[PipelineItem] = []
+        deadline = 0.0
+        while True:
+            try:
+                timeout = max(0.0, deadline - time.monotonic()) if batch else None
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._flush(batch)
+                batch = []
+                continue
+
+            if item is _CLOSE:
+                self._flush(batch)
+                return
+
+            if isinstance(item, threading.Event):
+                self._flush(batch)
+                batch = []
+                item.set()
+                continue
+
+            if not batch:
+                deadline = time.monotonic() + self.flush_interval
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                self._flush(batch)
+                batch = []
+
+    def _flush(self, batch: list[PipelineItem]) -> None:
+        """Embed and score a micro-batch; errors are kept and re-raised on close"""
+        if not batch or self._error is not None:
+            return
+        try:
+            start = time.perf_counter()
+            embeddings = self.embedding_client.generate_embedding_vectors(
+                self._batch_texts(batch)
+            )
+            self.embedding_seconds += time.perf_counter() - start
+            self._record_batch(batch, embeddings)
+        except Exception as e:
+            self._error = e
+
+
+class AsyncEmbeddingPipeline(_PipelineBase):
+    """Event-loop counterpart of `EmbeddingPipeline` for coroutine runners"""
+
+    def __init__(self, *args: Any, max_queue: int = settings.PIPELINE_MAX_QUEUE, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._queue: asyncio.Queue[Optional[PipelineItem | asyncio.Event]] = asyncio.Queue(
+            maxsize=max_queue
+        )
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def start(self) -> None:
+        """Start the background embedder task on the running loop"""
+        self._task = asyncio.create_task(self._consume())
+
+    async def submit(self, index: int, response: str, expectation: Optional[str] = None) -> None:
+        """Queue a response for embedding, waiting while the queue is full"""
+        await self._queue.put((index, response, expectation))
+
+    async def flush(self) -> None:
+        """Embed and score every response submitted so far"""
+        flushed = asyncio.Event()
+        await self._queue.put(flushed)
+        await flushed.wait()
+
+    async def close(self) -> PipelineResults:
+        """Flush outstanding responses and return ordered results"""
+        await self._queue.put(_CLOSE)
+        if self._task is not None:
+            await self._task
+        return self._results()
+
+    async def _consume(self) -> None:
+        """Background loop: gather micro-batches and embed them"""
+        batch: list[PipelineItem] = []
+        deadline = 0.0
+        while True:
+            try:
+                timeout = max(0.0, deadline - time.monotonic()) if batch else None
+                item = await asyncio.wait_for(self._queue.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                await self._flush(batch)
+                batch = []
+                continue
+
+            if item is _CLOSE:
+                await self._flush(batch)
+                return
+
+            if isinstance(item, asyncio.Event):
+                await self._flush(batch)
+                batch = []
+                item.set()
+                continue
+
+            if not batch:
+                deadline = time.monotonic() + self.flush_interval
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                await self._flush(batch)
+                batch = []
+
+    async def _flush(self, batch: list[PipelineItem]) -> None:
+        """Embed and score a micro-batch; errors are kept and re-raised on close"""
+        if not batch or self._error is not None:
+            return
+        try:
+            start = time.perf_counter()
+            embeddings = await self.embedding_client.agenerate_embedding_vectors(
+                self._batch_texts(batch)
+            )
+            self.embedding_seconds += time.perf_counter() - start
+            self._record_batch(batch, embeddings)
+        except Exception as e:
+            self._error = e
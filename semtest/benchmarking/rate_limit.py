@@ -0,0 +1,101 @@
+"""Process-wide request/token rate limiting for benchmark iterations"""
+import asyncio
+import threading
+import time
+from typing import ClassVar, Optional
+
+from semtest.config import settings
+
+
+class _TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate"""
+
+    def __init__(self, per_minute: float) -> None:
+        self.rate = per_minute / 60
+        self.capacity = max(self.rate, 1.0)  # Allow at most ~1s of burst
+        self.available = self.capacity
+        self.updated = time.monotonic()
+
+    def reserve(self, amount: float, now: float) -> float:
+        """Take `amount` from the bucket, returning seconds to wait before it is covered"""
+        self.available = min(
+            self.capacity, self.available + (now - self.updated) * self.rate
+        )
+        self.updated = now
+        self.available -= amount
+
+        return max(0.0, -self.available / self.rate)
+
+
+class RateLimiter:
+    """
+    Shared requests-per-minute/tokens-per-minute limiter. Limits are scaled by
+    `headroom` so callers stay just under provider quotas rather than hitting 429s.
+    Safe to share between threads and event loops.
+    """
+
+    _default: ClassVar[Optional["RateLimiter"]] = None
+    _default_configured: ClassVar[bool] = False
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        headroom: float = settings.RATE_LIMIT_HEADROOM
+    ) -> None:
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._request_bucket = (
+            _TokenBucket(requests_per_minute * headroom) if requests_per_minute else None
+        )
+        self._token_bucket = (
+            _TokenBucket(tokens_per_minute * headroom) if tokens_per_minute else None
+        )
+        self._lock = threading.Lock()
+
+    @classmethod
+    def configure_default(
+        cls,
+        requests_per_minute: Optional[float],
+        tokens_per_minute: Optional[float]
+    ) -> Optional["RateLimiter"]:
+        """Set (or disable, with no limits) the process-wide limiter used by benchmark runners"""
+        cls._default = (
+            cls(requests_per_minute, tokens_per_minute)
+            if requests_per_minute or tokens_per_minute else None
+        )
+        cls._default_configured = True
+        return cls._default
+
+    @classmethod
+    def get_default(cls) -> Optional["RateLimiter"]:
+        """Process-wide limiter, configured from settings on first access"""
+        if not cls._default_configured:
+            cls.configure_default(
+                settings.RATE_LIMIT_REQUESTS_PER_MINUTE or None,
+                settings.RATE_LIMIT_TOKENS_PER_MINUTE or None
+            )
+        return cls._default
+
+    def reserve(self, tokens: int = 0) -> float:
+        """Reserve capacity for one request of `tokens` tokens, returning the required delay"""
+        now = time.monotonic()
+        delay = 0.0
+        with self._lock:
+            if self._request_bucket:
+                delay = max(delay, self._request_bucket.reserve(1, now))
+            if self._token_bucket and tokens:
+                delay = max(delay, self._token_bucket.reserve(tokens, now))
+        return delay
+
+    def acquire(self, tokens: int = 0) -> None:
+        """Block the calling thread until a request may be sent"""
+        delay = self.reserve(tokens)
+        if delay:
+            time.sleep(delay)
+
+    async def aacquire(self, tokens: int = 0) -> None:
+        """Suspend the calling coroutine until a request may be sent"""
+        delay = self.reserve(tokens)
+        if delay:
+            await asyncio.sleep(delay)
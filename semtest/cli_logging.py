@@ -0,0 +1,48 @@
+"""CLI logging configuration"""
+import logging
+import sys
+from termcolor import colored
+
+class TermcolorFormatter(logging.Formatter):
+    """Custom formatter for logging"""
+    COLORS = {
+        logging.DEBUG: 'white',
+        logging.INFO: 'white',
+        logging.WARNING: 'yellow',
+        logging.ERROR: 'red',
+        logging.CRITICAL: 'red',
+    }
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Format CLI logging colors"""
+
+        color = self.COLORS.get(record.levelno, 'white')
+        record.msg = colored(record.msg, color)  # type: ignore[arg-type]
+
+        # Color the exception traceback if present
+        if record.exc_info:
+            exc_text = self.formatException(record.exc_info)
+            record.exc_text = colored(exc_text, 'red')
+        else:
+            record.exc_text = ""
+
+        return super().format(record)
+
+VERBOSITY_LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warn": logging.WARNING,
+    "error": logging.ERROR,
+    "exception": logging.ERROR,
+}
+
+
+def configure_cli_logging(verbosity: str = "info") -> None:
+    """Configure CLI logging at a `--verbosity` level"""
+    logger = logging.getLogger("semtest")
+    logger.setLevel(VERBOSITY_LEVELS[verbosity])
+
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(TermcolorFormatter("%(message)s"))
+
+    logger.addHandler(console_handler)
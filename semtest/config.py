@@ -1,15 +1,49 @@
 """Core configuration ingestion"""
-import logging
-import sys
-from termcolor import colored
 from pydantic_settings import BaseSettings
 
+from .environment import DISCOVERY_CACHE_PATH, DURATIONS_PATH
+
 class Settings(BaseSettings):
     """Core required attributes. Values overridden by project .env file"""
 
     OPENAI_API_KEY: str = ""
     BASE_URL: str = "https://api.openai.com/v1"
     DEFAULT_EMBEDDING_MODEL: str = "text-embedding-3-large"
+    EMBEDDING_BACKEND: str = "openai"
+    LOCAL_EMBEDDING_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
+    LOCAL_EMBEDDING_DEVICE: str = "cpu"
+    LOCAL_EMBEDDING_BATCH_SIZE: int = 64
+    LOCAL_EMBEDDING_DIMENSIONS: int = 1024
+    EMBEDDING_MAX_BATCH_INPUTS: int = 2048
+    EMBEDDING_MAX_BATCH_TOKENS: int = 300_000
+    EMBEDDING_DTYPE: str = "float32"
+    EMBEDDING_MAX_CONNECTIONS: int = 16
+    EMBEDDING_MAX_KEEPALIVE_CONNECTIONS: int = 8
+    EMBEDDING_KEEPALIVE_SECONDS: float = 30.0
+    EMBEDDING_TIMEOUT_SECONDS: float = 60.0
+    EMBEDDING_MAX_RETRIES: int = 6
+    EMBEDDING_BACKOFF_BASE_SECONDS: float = 0.5
+    EMBEDDING_BACKOFF_MAX_SECONDS: float = 30.0
+    EMBEDDING_CACHE_PATH: str = ""
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 100_000
+    EMBEDDING_CACHE_MAX_AGE_DAYS: float = 30.0
+    PIPELINE_BATCH_SIZE: int = 64
+    PIPELINE_FLUSH_SECONDS: float = 0.5
+    PIPELINE_MAX_QUEUE: int = 1024
+    MAX_CONCURRENCY: int = 8
+    ADAPTIVE_MAX_ITERATIONS: int = 100
+    ADAPTIVE_CONFIDENCE: float = 0.95
+    REFERENCE_SOFTMIN_TEMPERATURE: float = 0.05
+    STREAMING_STATISTICS: bool = False
+    STREAMING_RESERVOIR_SIZE: int = 100
+    STREAMING_SKETCH_CAPACITY: int = 256
+    WORKERS: int = 1
+    RATE_LIMIT_REQUESTS_PER_MINUTE: int = 0
+    RATE_LIMIT_TOKENS_PER_MINUTE: int = 0
+    RATE_LIMIT_HEADROOM: float = 0.9
+    DURATIONS_PATH: str = DURATIONS_PATH
+    DISCOVERY_CACHE_PATH: str = DISCOVERY_CACHE_PATH
+    RESULT_CACHE_PATH: str = ".semtest_results"
 
     class Config:
         """Ingestion configurations"""
@@ -17,39 +51,4 @@ class Settings(BaseSettings):
         env_file_encoding = 'utf-8'
 
 
-class TermcolorFormatter(logging.Formatter):
-    """Custom formatter for logging"""
-    COLORS = {
-        logging.DEBUG: 'white',
-        logging.INFO: 'white',
-        logging.WARNING: 'yellow',
-        logging.ERROR: 'red',
-        logging.CRITICAL: 'red',
-    }
-
-    def format(self, record: logging.LogRecord) -> str:
-        """Format CLI logging colors"""
-
-        color = self.COLORS.get(record.levelno, 'white')
-        record.msg = colored(record.msg, color)  # type: ignore[arg-type]
-
-        # Color the exception traceback if present
-        if record.exc_info:
-            exc_text = self.formatException(record.exc_info)
-            record.exc_text = colored(exc_text, 'red')
-        else:
-            record.exc_text = ""
-
-        return super().format(record)
-
-def configure_cli_logging() -> None:
-    """Configure CLI logging"""
-    logger = logging.getLogger("semtest")
-    logger.setLevel(logging.DEBUG)
-
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(TermcolorFormatter("%(message)s"))
-
-    logger.addHandler(console_handler)
-
 settings = Settings()
@@ -1,4 +1,7 @@
 """Core engine module"""
 from .engine import Engine
+from .merge import ResultMerger
+from .rescore import Rescorer
+from .runtime import configure_runtime
 
-__all__ = ["Engine"]
+__all__ = ["Engine", "Rescorer", "ResultMerger", "configure_runtime"]
@@ -1,48 +1,232 @@
 """Engine specification - see Engine class"""
+# pylint: disable=broad-exception-caught
+import asyncio
 import logging
+import threading
+import time
+from pathlib import Path
 
-from semtest.benchmarking import BenchmarkMetadata
-from semtest.reporting import BenchmarkReport
-from semtest.loader import Loader
+from semtest.benchmarking import (
+    BenchmarkMetadata,
+    BenchmarkRunner,
+    get_benchmark_runner,
+    resolve_expectation_embeddings
+)
+from semtest.config import settings
+from semtest.llm_client import EmbeddingCache, EmbeddingTransport
+from semtest.reporting import ReporterBase
+from semtest.loader import DurationStore, Loader
 from semtest.parser import SemtestContext
 
+from .result_cache import ResultCache
+from .scheduler import ProcessScheduler
+
 logger = logging.getLogger("semtest")
 class Engine:
     """
     Core engine for semtest framework mode. Using a settings
     context object and loader, the engine orchestrates the 
-    process of loading tests, executing tests, and building 
-    the final output object for the user.
+    process of loading tests, executing tests, and streaming
+    each benchmark's results to the reporters as it completes.
+    With `--jobs N` benchmarks are distributed across N worker
+    processes, longest-expected first. Complete results are cached by
+    benchmark fingerprint; with `--changed-only`, unchanged benchmarks are
+    replayed from the cache instead of executed. Sharded runs leave the
+    recorded durations untouched.
     """
 
     def __init__(
         self,
         context: SemtestContext,
         loader: Loader,
-        reporter: BenchmarkReport
+        reporters: list[ReporterBase]
     ) -> None:
         self.context = context
         self.loader = loader
-        self.reporter = reporter
+        self.reporters = reporters
+        self.durations = DurationStore(Path(settings.DURATIONS_PATH))
+        self.result_cache = (
+            ResultCache(Path(settings.RESULT_CACHE_PATH)) if settings.RESULT_CACHE_PATH else None
+        )
+        self._fingerprints: dict[str, str] = {}
+        self._report_lock = threading.Lock()
 
-    def execute(self) -> list[BenchmarkMetadata]:
-        """Load all tests, execute them and provide results"""
+    def execute(self) -> None:
+        """Load all tests, execute them and stream results to the reporters"""
         begin_load_log = "\nLoading semtest benchmarks...\n"
         logger.info(begin_load_log)
 
         benchmark_fns = self.loader.load()
 
+        begin_expectation_log = "Generating semantic expectation embeddings...\n"
+        logger.info(begin_expectation_log)
+
+        benchmark_runners = [
+            get_benchmark_runner(benchmark_func) for benchmark_func in benchmark_fns
+        ]
+        cached_results = self._load_cached_results(benchmark_runners)
+        benchmark_runners = [
+            runner for runner in benchmark_runners if runner.benchmark_id not in cached_results
+        ]
+        resolve_expectation_embeddings(benchmark_runners)
+
         begin_benchmark_log = "Initializing semtest benchmarks...\n"
         logger.info(begin_benchmark_log)
 
-        results: list[BenchmarkMetadata] = []
-        for benchmark_func in benchmark_fns:
-            benchmark_metadata = benchmark_func()
-            results.append(benchmark_metadata)
+        for reporter in self.reporters:
+            reporter.open()
+        try:
+            for benchmark_metadata in cached_results.values():
+                with self._report_lock:
+                    for reporter in self.reporters:
+                        reporter.add(benchmark_metadata)
+
+            if self.context.jobs > 1:
+                self._run_benchmarks_multiprocess(benchmark_runners)
+            else:
+                asyncio.run(self._run_benchmarks(benchmark_runners))
+        finally:
+            # Every shard must partition with the same durations; `semtest merge
+            # --record-durations` records those of sharded runs instead
+            if self.context.shard is None:
+                self.durations.save()
+            for reporter in self.reporters:
+                reporter.close()
+
+        embedding_cache = EmbeddingCache.get_default()
+        if embedding_cache is not None:
+            cache_log = f"Embedding cache ({embedding_cache.path}): {embedding_cache.stats()}\n"
+            logger.info(cache_log)
+
+        transport = EmbeddingTransport.get_default()
+        if transport.retries:
+            transport_log = f"Embedding requests retried: {transport.stats()}\n"
+            logger.info(transport_log)
+
+    def _load_cached_results(
+        self, benchmark_runners: list[BenchmarkRunner]
+    ) -> dict[str, BenchmarkMetadata]:
+        """
+        Fingerprint every benchmark and, with `--changed-only`, load the cached
+        results of those whose fingerprint is unchanged, keyed by benchmark id
+        """
+        if self.result_cache is None:
+            return {}
+
+        self._fingerprints = {
+            runner.benchmark_id: runner.fingerprint() for runner in benchmark_runners
+        }
+        if not self.context.changed_only:
+            return {}
+
+        cached_results = {}
+        for benchmark_id, fingerprint in self._fingerprints.items():
+            benchmark_metadata = self.result_cache.load(benchmark_id, fingerprint)
+            if benchmark_metadata is not None:
+                cached_results[benchmark_id] = benchmark_metadata
+
+        replay_log = (
+            f"Replaying {len(cached_results)} unchanged benchmarks from "
+            f"{self.result_cache.directory}, "
+            f"running {len(benchmark_runners) - len(cached_results)}\n"
+        )
+        logger.info(replay_log)
+        return cached_results
+
+    def _report_benchmark(
+        self, runner: BenchmarkRunner, benchmark_metadata: BenchmarkMetadata
+    ) -> None:
+        """
+        Hand a completed benchmark to every reporter and cache it if every
+        iteration ran without an exception, then release its results
+        """
+        with self._report_lock:
+            self._log_benchmark(benchmark_metadata)
+            for reporter in self.reporters:
+                reporter.add(benchmark_metadata)
+
+            fingerprint = self._fingerprints.get(runner.benchmark_id)
+            if (
+                self.result_cache is not None and fingerprint is not None
+                and benchmark_metadata.timings.iteration_count == benchmark_metadata.iterations
+                and not benchmark_metadata.benchmarks.exceptions
+            ):
+                self.result_cache.store(runner.benchmark_id, fingerprint, benchmark_metadata)
+        runner.reset()
+
+    @staticmethod
+    def _log_benchmark(benchmark_metadata: BenchmarkMetadata) -> None:
+        """Log a one-line summary of a single benchmark, and its full dump at debug level"""
+        metrics = benchmark_metadata.benchmarks
+        benchmark_log = (
+            f"{benchmark_metadata.benchmark_id or benchmark_metadata.func}: "
+            f"{benchmark_metadata.iterations} iterations, "
+            f"mean distance {metrics.mean_semantic_distance:.4f}, "
+            f"{len(metrics.exceptions)} exceptions"
+        )
+        logger.info(benchmark_log)
+        if logger.isEnabledFor(logging.DEBUG):
             benchmark_dump = f"benchmark results: {benchmark_metadata.model_dump_json(indent=2)}\n"
-            logger.info(benchmark_dump)
+            logger.debug(benchmark_dump)
+
+    def _run_benchmarks_multiprocess(self, benchmark_runners: list[BenchmarkRunner]) -> None:
+        """
+        Run benchmarks on a process pool, longest expected duration first.
+        Results are reported as they stream in.
+        """
+        runners_by_id = {runner.benchmark_id: runner for runner in benchmark_runners}
+        scheduled_runners = [
+            runners_by_id[benchmark_id]
+            for benchmark_id in self.durations.longest_first(list(runners_by_id))
+        ]
+
+        scheduler = ProcessScheduler(
+            context=self.context,
+            processes=self.context.jobs,
+            timeout=self.context.timeout
+        )
+
+        for runner, benchmark_metadata in scheduler.run(
+            scheduled_runners, on_duration=self.durations.record
+        ):
+            self._report_benchmark(runner, benchmark_metadata)
+
+    @staticmethod
+    def _failure_metrics(runner: BenchmarkRunner, exc: Exception) -> BenchmarkMetadata:
+        """Log a benchmark that raised and return its failure metadata"""
+        logger.error("Benchmark %s failed: %r\n", runner.benchmark_id, exc)
+        return runner.failure_metrics(exc)
+
+    async def _run_benchmarks(self, benchmark_runners: list[BenchmarkRunner]) -> None:
+        """
+        Drive all coroutine benchmarks concurrently on one event loop, while
+        synchronous benchmarks run one after another on a worker thread.
+        Each benchmark is reported as soon as it completes; one that raises
+        is reported as failed, as with `--jobs`, without stopping the others.
+        """
+        async_runners = [runner for runner in benchmark_runners if runner.is_async]
+        sync_runners = [runner for runner in benchmark_runners if not runner.is_async]
+
+        def run_sync_benchmarks() -> None:
+            for runner in sync_runners:
+                start = time.perf_counter()
+                try:
+                    benchmark_metadata = runner.run()
+                except Exception as e:
+                    benchmark_metadata = self._failure_metrics(runner, e)
+                self.durations.record(runner.benchmark_id, time.perf_counter() - start)
+                self._report_benchmark(runner, benchmark_metadata)
 
-        self.reporter.populate(results)
-        self.reporter.report()
+        async def run_async_benchmark(runner: BenchmarkRunner) -> None:
+            start = time.perf_counter()
+            try:
+                benchmark_metadata = await runner.arun()
+            except Exception as e:
+                benchmark_metadata = self._failure_metrics(runner, e)
+            self.durations.record(runner.benchmark_id, time.perf_counter() - start)
+            self._report_benchmark(runner, benchmark_metadata)
 
-        return results
+        await asyncio.gather(
+            asyncio.to_thread(run_sync_benchmarks),
+            *(run_async_benchmark(runner) for runner in async_runners)
+        )
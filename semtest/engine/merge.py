@@ -0,0 +1,83 @@
+"""Merging of per-shard benchmark results - see ResultMerger class"""
+import json
+import logging
+from pathlib import Path
+from typing import Iterator, Optional
+
+from semtest.benchmarking import BenchmarkMetadata
+from semtest.loader import DurationStore
+from semtest.reporting import ReporterBase, read_jsonl_results
+
+logger = logging.getLogger("semtest")
+
+
+class ResultMerger:
+    """
+    Combines JSONL result files, e.g. written by the shards of a sharded run,
+    and streams every benchmark to the reporters in file order. A benchmark
+    found in more than one file means the shards were partitioned
+    inconsistently, and fails the merge before anything is reported. Given a
+    `durations` store, the merged benchmark durations are recorded for
+    balancing later sharded runs.
+    """
+
+    def __init__(
+        self,
+        result_files: list[Path],
+        reporters: list[ReporterBase],
+        durations: Optional[DurationStore] = None
+    ) -> None:
+        self.result_files = result_files
+        self.reporters = reporters
+        self.durations = durations
+
+    def execute(self) -> None:
+        """Merge every result file and stream the benchmarks to the reporters"""
+        begin_merge_log = f"\nMerging results of {len(self.result_files)} files...\n"
+        logger.info(begin_merge_log)
+        self.check_disjoint()
+
+        merged = 0
+        for reporter in self.reporters:
+            reporter.open()
+        try:
+            for benchmark_metadata in self.merge():
+                for reporter in self.reporters:
+                    reporter.add(benchmark_metadata)
+                if self.durations is not None and benchmark_metadata.benchmark_id:
+                    self.durations.record(
+                        benchmark_metadata.benchmark_id, benchmark_metadata.timings.total_seconds
+                    )
+                merged += 1
+        finally:
+            for reporter in self.reporters:
+                reporter.close()
+
+        if self.durations is not None:
+            self.durations.save()
+
+        merged_log = f"Merged {merged} benchmarks\n"
+        logger.info(merged_log)
+
+    def merge(self) -> Iterator[BenchmarkMetadata]:
+        """Yield the benchmarks of every result file, in file order"""
+        for result_file in self.result_files:
+            yield from read_jsonl_results(result_file)
+
+    def check_disjoint(self) -> None:
+        """Raise if a benchmark id appears in more than one result file, or twice in one"""
+        sources: dict[str, Path] = {}
+        for result_file in self.result_files:
+            with result_file.open(encoding="utf-8") as results:
+                for line in results:
+                    benchmark_id = json.loads(line).get("benchmark_id") if line.strip() else None
+                    if benchmark_id is None:
+                        continue
+
+                    if benchmark_id in sources:
+                        exc = (
+                            f"Benchmark {benchmark_id} appears in both {sources[benchmark_id]} "
+                            f"and {result_file}; were all shards run with the same durations file?"
+                        )
+                        raise ValueError(exc)
+                    sources[benchmark_id] = result_file
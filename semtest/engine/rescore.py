@@ -0,0 +1,117 @@
+"""Offline re-scoring of stored run artifacts - see Rescorer class"""
+import json
+import logging
+from typing import Iterator
+
+import numpy as np
+
+from semtest.benchmarking import BenchmarkMetadata
+from semtest.benchmarking.metrics import ReferenceMetrics, SemanticMetrics, restore_exception
+from semtest.reporting import ReporterBase, RunArtifact
+from semtest.semantic_comparator import (
+    ComparatorBase,
+    calculate_multi_distances,
+    calculate_reference_distances
+)
+
+logger = logging.getLogger("semtest")
+
+
+class Rescorer:
+    """
+    Recomputes benchmark metrics from a stored run artifact with any comparators.
+    Distances are computed in one vectorized pass over each memory-mapped
+    embedding matrix, so no benchmark is re-run and no embeddings are requested.
+    The first comparator is the primary metric, as in `BenchmarkRunner`, and
+    benchmarks with several reference answers keep their reference scoring.
+    """
+
+    def __init__(
+        self,
+        run_artifact: RunArtifact,
+        comparators: list[ComparatorBase],
+        reporters: list[ReporterBase]
+    ) -> None:
+        self.run_artifact = run_artifact
+        self.comparators = comparators
+        self.reporters = reporters
+
+    def execute(self) -> None:
+        """Re-score every stored benchmark and stream the results to the reporters"""
+        begin_rescore_log = (
+            f"\nRe-scoring {len(self.run_artifact)} benchmarks from "
+            f"{self.run_artifact.run_directory} with {', '.join(map(str, self.comparators))}...\n"
+        )
+        logger.info(begin_rescore_log)
+
+        for reporter in self.reporters:
+            reporter.open()
+        try:
+            for benchmark_metadata in self.rescore():
+                for reporter in self.reporters:
+                    reporter.add(benchmark_metadata)
+        finally:
+            for reporter in self.reporters:
+                reporter.close()
+
+    def rescore(self) -> Iterator[BenchmarkMetadata]:
+        """Yield re-scored metadata for each stored benchmark, in stored order"""
+        for benchmark in self.run_artifact.benchmarks().to_pylist():
+            index = benchmark["benchmark_index"]
+
+            result_embeddings = self.run_artifact.embeddings(index)
+            expectation_embedding = self.run_artifact.expectation_embedding(index)
+            reference_scoring = self.run_artifact.reference_scoring(index)
+            references = None
+            if expectation_embedding is not None and reference_scoring is not None:
+                distances, matched = calculate_reference_distances(
+                    self.comparators,
+                    expectation_embedding,
+                    result_embeddings,
+                    reference_scoring["scoring"],
+                    reference_scoring["temperature"]
+                )
+                references = ReferenceMetrics(
+                    references=expectation_embedding.shape[0],
+                    matched=[int(reference) for reference in matched],
+                    **reference_scoring
+                )
+            elif expectation_embedding is not None and result_embeddings.shape[0]:
+                distances = calculate_multi_distances(
+                    self.comparators, expectation_embedding, result_embeddings
+                )
+            else:
+                distances = {
+                    str(comparator): np.empty(0, dtype=np.float64)
+                    for comparator in self.comparators
+                }
+            semantic_distances = distances.pop(str(self.comparators[0]))
+
+            exceptions = self.run_artifact.exceptions(index)
+            yield BenchmarkMetadata(
+                func=benchmark["func"],
+                iterations=benchmark["iterations"],
+                comparator=str(self.comparators[0]),
+                expectation_input=(
+                    json.loads(benchmark["expectation_input"]) if references is not None
+                    else benchmark["expectation_input"]
+                ),
+                benchmarks=SemanticMetrics(
+                    responses=self.run_artifact.responses(index).column("response").to_pylist(),
+                    exceptions=[
+                        restore_exception(exception_type, message)
+                        for exception_type, message in zip(
+                            exceptions.column("exception_type").to_pylist(),
+                            exceptions.column("message").to_pylist()
+                        )
+                    ],
+                    result_embeddings=result_embeddings,
+                    expectation_embedding=expectation_embedding,
+                    semantic_distances=list(semantic_distances),
+                    comparator_distances={
+                        comparator: list(comparator_distances)
+                        for comparator, comparator_distances in distances.items()
+                    },
+                    references=references
+                )
+            )
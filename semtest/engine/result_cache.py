@@ -0,0 +1,198 @@
+"""Persisted benchmark results replayed by incremental runs"""
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from semtest.benchmarking import BenchmarkMetadata, TimingMetrics
+from semtest.benchmarking.metrics import (
+    ConvergenceMetrics,
+    DistributionSummary,
+    ReferenceMetrics,
+    SemanticMetrics,
+    SliceMetrics,
+    restore_exception
+)
+
+logger = logging.getLogger("semtest")
+
+RESULT_CACHE_FORMAT_VERSION = 5
+
+
+class ResultCache:
+    """
+    Latest complete result of each benchmark, keyed by benchmark id and stored with
+    the benchmark's fingerprint. An entry is a JSON record plus `.npy` embedding
+    matrices named after the fingerprint; the record is replaced last, so an
+    interrupted write leaves the previous entry intact.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+
+    def load(self, benchmark_id: str, fingerprint: str) -> Optional[BenchmarkMetadata]:
+        """
+        Cached metadata of a benchmark, if stored under the same fingerprint
+        and no iteration raised
+        """
+        record = self._read_record(benchmark_id)
+        if (
+            record is None or record.get("fingerprint") != fingerprint
+            or record.get("exceptions")
+        ):
+            return None
+
+        try:
+            return BenchmarkMetadata(
+                func=record["func"],
+                benchmark_id=benchmark_id,
+                iterations=record["iterations"],
+                comparator=record["comparator"],
+                expectation_input=record["expectation_input"],
+                benchmarks=SemanticMetrics(
+                    responses=record["responses"],
+                    exceptions=[
+                        restore_exception(exception_type, message)
+                        for exception_type, message in record["exceptions"]
+                    ],
+                    result_embeddings=self._load_matrix(record["embeddings"]),
+                    expectation_embedding=(
+                        self._load_matrix(record["expectation_embedding"])
+                        if record["expectation_embedding"] else None
+                    ),
+                    semantic_distances=[
+                        np.float64(distance) for distance in record["semantic_distances"]
+                    ],
+                    comparator_distances={
+                        comparator: [np.float64(distance) for distance in distances]
+                        for comparator, distances in record["comparator_distances"].items()
+                    },
+                    convergence=(
+                        ConvergenceMetrics.model_validate(record["convergence"])
+                        if record["convergence"] else None
+                    ),
+                    slices=[
+                        SliceMetrics.model_validate(slice_metrics)
+                        for slice_metrics in record["slices"]
+                    ],
+                    references=(
+                        ReferenceMetrics.model_validate(record["references"])
+                        if record["references"] else None
+                    ),
+                    distance_summary=(
+                        DistributionSummary.model_validate(record["distance_summary"])
+                        if record["distance_summary"] else None
+                    ),
+                    comparator_summaries={
+                        comparator: DistributionSummary.model_validate(summary)
+                        for comparator, summary in record["comparator_summaries"].items()
+                    }
+                ),
+                timings=TimingMetrics.model_validate(record["timings"]),
+                cached=True
+            )
+        except (OSError, KeyError, TypeError, ValueError):
+            logger.warning("Ignoring unreadable cached result of %s\n", benchmark_id)
+            return None
+
+    def store(self, benchmark_id: str, fingerprint: str, benchmark: BenchmarkMetadata) -> None:
+        """Replace the cached result of a benchmark"""
+        key = self._key(benchmark_id)
+        metrics = benchmark.benchmarks
+        previous = self._read_record(benchmark_id)
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            record = {
+                "format_version": RESULT_CACHE_FORMAT_VERSION,
+                "benchmark_id": benchmark_id,
+                "fingerprint": fingerprint,
+                "func": benchmark.func,
+                "iterations": benchmark.iterations,
+                "comparator": benchmark.comparator,
+                "expectation_input": benchmark.expectation_input,
+                "responses": metrics.responses,
+                "exceptions": [[type(exc).__name__, str(exc)] for exc in metrics.exceptions],
+                "semantic_distances": [float(distance) for distance in metrics.semantic_distances],
+                "comparator_distances": {
+                    comparator: [float(distance) for distance in distances]
+                    for comparator, distances in metrics.comparator_distances.items()
+                },
+                "convergence": (
+                    metrics.convergence.model_dump() if metrics.convergence is not None else None
+                ),
+                "slices": [slice_metrics.model_dump() for slice_metrics in metrics.slices],
+                "references": (
+                    metrics.references.model_dump() if metrics.references is not None else None
+                ),
+                "distance_summary": (
+                    metrics.distance_summary.model_dump()
+                    if metrics.distance_summary is not None else None
+                ),
+                "comparator_summaries": {
+                    comparator: summary.model_dump()
+                    for comparator, summary in metrics.comparator_summaries.items()
+                },
+                "timings": benchmark.timings.model_dump(),
+                "embeddings": self._save_matrix(
+                    f"{key}.{fingerprint[:16]}.npy", metrics.result_embeddings
+                ),
+                "expectation_embedding": (
+                    self._save_matrix(
+                        f"{key}.{fingerprint[:16]}.expectation.npy",
+                        metrics.expectation_embedding
+                    )
+                    if metrics.expectation_embedding is not None else None
+                ),
+            }
+
+            record_path = self.directory / f"{key}.json"
+            staging_path = record_path.with_suffix(".json.tmp")
+            staging_path.write_text(json.dumps(record), encoding="utf-8")
+            staging_path.replace(record_path)
+        except OSError:
+            logger.warning("Failed to cache the result of %s\n", benchmark_id)
+            return
+
+        # Drop the matrices of the replaced entry
+        if previous is not None and previous.get("fingerprint") != fingerprint:
+            for matrix_file in (previous.get("embeddings"), previous.get("expectation_embedding")):
+                if matrix_file:
+                    (self.directory / matrix_file).unlink(missing_ok=True)
+
+    def _read_record(self, benchmark_id: str) -> Optional[dict[str, Any]]:
+        """Stored JSON record of a benchmark, if any"""
+        record_path = self.directory / f"{self._key(benchmark_id)}.json"
+        if not record_path.is_file():
+            return None
+
+        try:
+            record: dict[str, Any] = json.loads(record_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            logger.warning("Ignoring unreadable cached result %s\n", record_path)
+            return None
+
+        if record.get("format_version") != RESULT_CACHE_FORMAT_VERSION:
+            return None
+        return record
+
+    def _save_matrix(self, file_name: str, matrix: npt.NDArray[Any]) -> str:
+        """Save a `.npy` matrix, returning its file name"""
+        np.save(self.directory / file_name, np.ascontiguousarray(matrix))
+        return file_name
+
+    def _load_matrix(self, file_name: str) -> npt.NDArray[np.floating[Any]]:
+        """Memory-map a stored `.npy` matrix"""
+        matrix: npt.NDArray[np.floating[Any]] = np.load(
+            self.directory / file_name, mmap_mode="r"
+        )
+        return matrix
+
+    @staticmethod
+    def _key(benchmark_id: str) -> str:
+        """File name stem of a benchmark's entry"""
+        return hashlib.sha256(benchmark_id.encode("utf-8")).hexdigest()[:32]
@@ -0,0 +1,25 @@
+"""Process-wide runtime configuration derived from the CLI context"""
+from semtest.benchmarking import BenchmarkRunner, RateLimiter
+from semtest.config import settings
+from semtest.llm_client import EmbeddingCache, EmbeddingProvider, EmbeddingTransport
+from semtest.parser import SemtestContext
+
+
+def configure_runtime(context: SemtestContext, processes: int = 1) -> None:
+    """
+    Apply embedding backend, cache, worker, streaming and rate limit options to the
+    current process.
+    Rate limits and embedding connections are split evenly when `processes` share
+    the same quota.
+    """
+    EmbeddingCache.configure_default(context.embedding_cache)
+    EmbeddingTransport.configure_default(
+        max(1, settings.EMBEDDING_MAX_CONNECTIONS // processes)
+    )
+    EmbeddingProvider.configure_default(context.embedding_backend)
+    BenchmarkRunner.default_workers = context.workers
+    BenchmarkRunner.default_streaming = context.streaming_stats or settings.STREAMING_STATISTICS
+    RateLimiter.configure_default(
+        context.requests_per_minute / processes if context.requests_per_minute else None,
+        context.tokens_per_minute / processes if context.tokens_per_minute else None
+    )
@@ -0,0 +1,285 @@
+"""Multi-process benchmark scheduling - see ProcessScheduler class"""
+# pylint: disable=broad-exception-caught
+import logging
+import multiprocessing
+import pickle
+import time
+from collections import deque
+from dataclasses import dataclass
+from multiprocessing.connection import Connection, wait
+from multiprocessing.process import BaseProcess
+from typing import Any, Callable, Iterator, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from semtest.benchmarking import BenchmarkMetadata, BenchmarkRunner, get_benchmark_runner
+from semtest.cli_logging import configure_cli_logging
+from semtest.loader import Loader
+from semtest.parser import SemtestContext
+
+from .runtime import configure_runtime
+
+logger = logging.getLogger("semtest")
+
+
+class BenchmarkWorkerError(RuntimeError):
+    """A benchmark worker process crashed while executing a benchmark"""
+
+
+class BenchmarkTimeoutError(BenchmarkWorkerError):
+    """A benchmark exceeded its time budget and its worker was terminated"""
+
+
+# Messages sent from worker to parent: (benchmark_id, metadata or exception)
+WorkerMessage = tuple[str, BenchmarkMetadata | Exception]
+
+# Sent once by a worker after start-up, so that timeouts exclude interpreter start time
+WORKER_READY = "ready"
+
+# Attempts to start each worker before its slot is given up
+MAX_WORKER_STARTS = 3
+
+
+def _send(connection: Connection, message: WorkerMessage) -> None:
+    """Send a result, degrading unpicklable captured exceptions to their repr"""
+    try:
+        connection.send(message)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        benchmark_id, outcome = message
+        if isinstance(outcome, BenchmarkMetadata):
+            outcome.benchmarks.exceptions = [
+                RuntimeError(repr(exc)) for exc in outcome.benchmarks.exceptions
+            ]
+        else:
+            outcome = RuntimeError(repr(outcome))
+        connection.send((benchmark_id, outcome))
+
+
+def _worker_main(context: SemtestContext, processes: int, connection: Connection) -> None:
+    """Worker loop: import assigned benchmarks through the Loader, run them and stream results"""
+    configure_cli_logging(context.verbosity)
+    configure_runtime(context, processes)
+    loader = Loader(context)
+    connection.send(WORKER_READY)
+
+    while True:
+        task: Optional[tuple[str, Optional[npt.NDArray[np.floating[Any]]]]] = connection.recv()
+        if task is None:
+            break
+
+        benchmark_id, embedding_expectation = task
+        outcome: BenchmarkMetadata | Exception
+        try:
+            benchmark_runner = get_benchmark_runner(loader.load_benchmark(benchmark_id))
+            if embedding_expectation is not None:
+                benchmark_runner.embedding_expectation = embedding_expectation
+            outcome = benchmark_runner.run()
+        except Exception as e:
+            outcome = e
+
+        _send(connection, (benchmark_id, outcome))
+
+
+@dataclass
+class _Worker:
+    """Parent-side handle to a worker process and its current assignment"""
+    process: BaseProcess
+    connection: Connection
+    benchmark_id: Optional[str] = None
+    started: float = 0.0
+    ready: bool = False
+    starts: int = 1
+
+
+class ProcessScheduler:
+    """
+    Executes benchmarks on a pool of worker processes. Each worker imports only
+    the modules of the benchmarks assigned to it. Benchmarks are dispatched in the
+    given order as workers free up; a worker that crashes or exceeds `timeout`
+    fails only its current benchmark and is replaced. A worker that dies during
+    start-up is restarted up to `MAX_WORKER_STARTS` times before its slot is
+    given up; benchmarks only fail for lack of workers once every slot is.
+    """
+
+    def __init__(
+        self,
+        context: SemtestContext,
+        processes: int,
+        timeout: Optional[float] = None
+    ) -> None:
+        self.context = context
+        self.processes = processes
+        self.timeout = timeout
+        self._mp_context = multiprocessing.get_context("spawn")
+
+    def run(
+        self,
+        benchmark_runners: list[BenchmarkRunner],
+        on_duration: Optional[Callable[[str, float], Any]] = None
+    ) -> Iterator[tuple[BenchmarkRunner, BenchmarkMetadata]]:
+        """Yield each benchmark runner with its metadata as the benchmark completes"""
+        runners_by_id = {runner.benchmark_id: runner for runner in benchmark_runners}
+        pending = deque(runners_by_id)
+        workers = [self._spawn() for _ in range(min(self.processes, len(pending)))]
+
+        try:
+            while pending or any(worker.benchmark_id for worker in workers):
+                workers = self._restart_failed_starts(workers)
+                if not workers:
+                    startup_error = BenchmarkWorkerError("No worker process could be started")
+                    while pending:
+                        benchmark_runner = runners_by_id[pending.popleft()]
+                        yield benchmark_runner, self._to_metadata(benchmark_runner, startup_error)
+                    break
+
+                for worker in workers:
+                    if self._is_ready(worker) and worker.benchmark_id is None and pending:
+                        self._assign(worker, runners_by_id[pending.popleft()])
+
+                active = [
+                    worker for worker in workers if worker.benchmark_id or not worker.ready
+                ]
+                wait(
+                    [worker.connection for worker in active]
+                    + [worker.process.sentinel for worker in active],
+                    timeout=self._next_deadline([w for w in active if w.benchmark_id])
+                )
+
+                for index, worker in enumerate(workers):
+                    if worker.benchmark_id is None:
+                        continue
+                    outcome = self._collect(worker)
+                    if outcome is None:
+                        continue
+
+                    benchmark_runner = runners_by_id[worker.benchmark_id]
+                    if on_duration is not None:
+                        on_duration(worker.benchmark_id, time.perf_counter() - worker.started)
+
+                    workers[index] = self._release(worker, outcome)
+                    yield benchmark_runner, self._to_metadata(benchmark_runner, outcome)
+        finally:
+            for worker in workers:
+                self._shutdown(worker)
+
+    def _spawn(self) -> _Worker:
+        """Start a fresh worker process"""
+        parent_connection, child_connection = self._mp_context.Pipe()
+        process = self._mp_context.Process(
+            target=_worker_main,
+            args=(self.context, self.processes, child_connection),
+            daemon=True
+        )
+        process.start()
+        child_connection.close()
+
+        return _Worker(process=process, connection=parent_connection)
+
+    @staticmethod
+    def _is_ready(worker: _Worker) -> bool:
+        """Check whether a worker finished start-up and can accept benchmarks"""
+        if not worker.ready and worker.connection.poll():
+            try:
+                worker.ready = worker.connection.recv() == WORKER_READY
+            except (EOFError, OSError):
+                pass
+
+        return worker.ready
+
+    def _restart_failed_starts(self, workers: list[_Worker]) -> list[_Worker]:
+        """Replace workers that died during start-up, dropping those out of attempts"""
+        running = []
+        for worker in workers:
+            if self._is_ready(worker) or worker.process.is_alive():
+                running.append(worker)
+                continue
+
+            self._shutdown(worker)
+            if worker.starts < MAX_WORKER_STARTS:
+                logger.warning(
+                    "Worker process failed to start (exit code %s), restarting it\n",
+                    worker.process.exitcode
+                )
+                replacement = self._spawn()
+                replacement.starts = worker.starts + 1
+                running.append(replacement)
+            else:
+                logger.error(
+                    "Worker process failed to start %d times (exit code %s), giving up its slot\n",
+                    worker.starts, worker.process.exitcode
+                )
+        return running
+
+    def _release(self, worker: _Worker, outcome: BenchmarkMetadata | Exception) -> _Worker:
+        """Free a worker for its next benchmark, replacing it if it crashed or timed out"""
+        if isinstance(outcome, BenchmarkWorkerError):
+            self._shutdown(worker)
+            return self._spawn()
+
+        worker.benchmark_id = None
+        return worker
+
+    @staticmethod
+    def _to_metadata(
+        benchmark_runner: BenchmarkRunner, outcome: BenchmarkMetadata | Exception
+    ) -> BenchmarkMetadata:
+        """Metadata of a completed benchmark, or failure metadata if it could not complete"""
+        if isinstance(outcome, BenchmarkMetadata):
+            return outcome
+
+        logger.error("Benchmark %s failed: %r\n", benchmark_runner.benchmark_id, outcome)
+        return benchmark_runner.failure_metrics(outcome)
+
+    @staticmethod
+    def _assign(worker: _Worker, benchmark_runner: BenchmarkRunner) -> None:
+        """Dispatch a benchmark (with its pre-resolved expectation embedding) to a worker"""
+        worker.benchmark_id = benchmark_runner.benchmark_id
+        worker.started = time.perf_counter()
+        worker.connection.send(
+            (benchmark_runner.benchmark_id, benchmark_runner.embedding_expectation)
+        )
+
+    def _collect(self, worker: _Worker) -> Optional[BenchmarkMetadata | Exception]:
+        """Return a busy worker's outcome if it finished, crashed or timed out"""
+        if worker.connection.poll():
+            try:
+                _, outcome = worker.connection.recv()
+                return outcome  # type: ignore[no-any-return]
+            except (EOFError, OSError):
+                pass
+
+        if not worker.process.is_alive():
+            exc = (
+                f"Worker process exited with code {worker.process.exitcode} "
+                f"while running {worker.benchmark_id}"
+            )
+            return BenchmarkWorkerError(exc)
+
+        if self.timeout and time.perf_counter() - worker.started > self.timeout:
+            worker.process.terminate()
+            exc = f"{worker.benchmark_id} exceeded the {self.timeout}s benchmark timeout"
+            return BenchmarkTimeoutError(exc)
+
+        return None
+
+    def _next_deadline(self, busy: list[_Worker]) -> Optional[float]:
+        """Seconds until the earliest running benchmark times out"""
+        if not self.timeout or not busy:
+            return None
+        now = time.perf_counter()
+        return max(0.0, min(worker.started + self.timeout - now for worker in busy))
+
+    @staticmethod
+    def _shutdown(worker: _Worker) -> None:
+        """Stop a worker, terminating it if it does not exit promptly"""
+        try:
+            if worker.benchmark_id is None:
+                worker.connection.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        worker.process.join(timeout=5)
+        if worker.process.is_alive():
+            worker.process.terminate()
+            worker.process.join()
+        worker.connection.close()
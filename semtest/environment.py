@@ -0,0 +1,55 @@
+"""
+Lightweight lookup of the project settings needed to collect benchmarks.
+Collection must stay fast, so these are read the way `config.Settings` reads
+them (environment variables, then the project `.env` file, then defaults)
+without loading pydantic-settings.
+"""
+import os
+from pathlib import Path
+from typing import Optional
+
+DURATIONS_PATH = ".semtest_durations.json"
+DISCOVERY_CACHE_PATH = ".semtest_discovery.json"
+
+ENV_FILE = ".env"
+
+
+def project_setting(name: str, default: str) -> str:
+    """Value of a setting from the environment or `.env`, matching names case-insensitively"""
+    value = _lookup(os.environ, name)
+    if value is None:
+        value = _lookup(_read_env_file(Path(ENV_FILE)), name)
+    return default if value is None else value
+
+
+def _lookup(variables: "os._Environ[str] | dict[str, str]", name: str) -> Optional[str]:
+    """Value of a variable, ignoring the case of its name"""
+    if name in variables:
+        return variables[name]
+    lowered = name.lower()
+    for key, value in variables.items():
+        if key.lower() == lowered:
+            return value
+    return None
+
+
+def _read_env_file(path: Path) -> dict[str, str]:
+    """`KEY=value` assignments of a dotenv file, if it exists"""
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return {}
+
+    variables = {}
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+        key, value = line.removeprefix("export ").split("=", 1)
+        value = value.strip()
+        if value[:1] in ("'", '"') and value.endswith(value[0]) and len(value) > 1:
+            value = value[1:-1]
+        else:
+            value = value.split(" #", 1)[0].rstrip()
+        variables[key.strip()] = value
+    return variables
@@ -1,5 +1,17 @@
 """LLM client module"""
 
+from .cache import EmbeddingCache
+from .core import EmbeddingMatrix, EmbeddingProvider
 from .embeddings import EmbeddingClient
+from .local import HashingEmbeddingClient, SentenceTransformerEmbeddingClient
+from .transport import EmbeddingTransport
 
-__all__ = ["EmbeddingClient"]
+__all__ = [
+    "EmbeddingCache",
+    "EmbeddingClient",
+    "EmbeddingMatrix",
+    "EmbeddingProvider",
+    "EmbeddingTransport",
+    "HashingEmbeddingClient",
+    "SentenceTransformerEmbeddingClient",
+]
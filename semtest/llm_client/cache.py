@@ -0,0 +1,200 @@
+"""Persistent, content-addressed embedding cache"""
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import ClassVar, Iterator, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from semtest.config import settings
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    model TEXT NOT NULL,
+    base_url TEXT NOT NULL,
+    dimensions INTEGER NOT NULL,
+    text_hash TEXT NOT NULL,
+    embedding BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    last_accessed REAL NOT NULL,
+    PRIMARY KEY (model, base_url, dimensions, text_hash)
+);
+CREATE INDEX IF NOT EXISTS embeddings_last_accessed ON embeddings (last_accessed);
+CREATE INDEX IF NOT EXISTS embeddings_created_at ON embeddings (created_at);
+"""
+
+_SQL_CHUNK_SIZE = 500  # Stay well below SQLite's bound parameter limit
+
+
+class EmbeddingCache:
+    """
+    SQLite-backed embedding cache keyed by (model, base_url, dimensions, text hash).
+    Vectors are stored as float32 blobs. Entries are evicted least-recently-used
+    beyond `max_entries` and unconditionally once older than `max_age_days`.
+    Capacity is only enforced once the entries counted by this process, plus
+    those it stored since, may exceed `max_entries`.
+    WAL journaling allows several worker processes to share one cache file.
+    """
+
+    _default: ClassVar[Optional["EmbeddingCache"]] = None
+    _default_configured: ClassVar[bool] = False
+
+    def __init__(
+        self,
+        path: Path,
+        max_entries: int = settings.EMBEDDING_CACHE_MAX_ENTRIES,
+        max_age_days: float = settings.EMBEDDING_CACHE_MAX_AGE_DAYS
+    ) -> None:
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_days * 24 * 60 * 60
+        self.hits = 0
+        self.misses = 0
+        self._entry_count: Optional[int] = None
+        self._stored_since_count = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            self.path, timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+
+    @classmethod
+    def configure_default(cls, path: Optional[Path]) -> Optional["EmbeddingCache"]:
+        """Set (or disable, with None) the process-wide cache used by embedding clients"""
+        cls._default = cls(path) if path else None
+        cls._default_configured = True
+        return cls._default
+
+    @classmethod
+    def get_default(cls) -> Optional["EmbeddingCache"]:
+        """Process-wide cache, configured from settings on first access"""
+        if not cls._default_configured:
+            cache_path = settings.EMBEDDING_CACHE_PATH
+            cls.configure_default(Path(cache_path) if cache_path else None)
+        return cls._default
+
+    def get_many(
+        self, input_texts: list[str], model: str, base_url: str, dimensions: Optional[int]
+    ) -> dict[str, npt.NDArray[np.float32]]:
+        """Return cached embeddings for any of the given texts, keyed by text"""
+
+        hashes = {self._hash(text): text for text in input_texts}
+        found: dict[str, npt.NDArray[np.float32]] = {}
+
+        with self._lock:
+            for chunk in self._chunks(list(hashes)):
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._connection.execute(
+                    "SELECT text_hash, embedding FROM embeddings "
+                    "WHERE model = ? AND base_url = ? AND dimensions = ? "
+                    f"AND text_hash IN ({placeholders})",
+                    (model, base_url, dimensions or 0, *chunk)
+                ).fetchall()
+                for text_hash, blob in rows:
+                    found[hashes[text_hash]] = np.frombuffer(blob, dtype=np.float32)
+
+            if found:
+                now = time.time()
+                self._connection.executemany(
+                    "UPDATE embeddings SET last_accessed = ? "
+                    "WHERE model = ? AND base_url = ? AND dimensions = ? AND text_hash = ?",
+                    [
+                        (now, model, base_url, dimensions or 0, self._hash(text))
+                        for text in found
+                    ]
+                )
+
+            self.hits += len(found)
+            self.misses += len(hashes) - len(found)
+
+        return found
+
+    def put_many(
+        self,
+        embeddings: dict[str, npt.NDArray[np.float32]],
+        model: str,
+        base_url: str,
+        dimensions: Optional[int]
+    ) -> None:
+        """Store embeddings keyed by their input text, then apply eviction"""
+
+        now = time.time()
+        rows = [
+            (
+                model, base_url, dimensions or 0, self._hash(text),
+                np.asarray(embedding, dtype=np.float32).tobytes(), now, now
+            )
+            for text, embedding in embeddings.items()
+        ]
+
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+                )
+                self._evict(now, len(rows))
+                self._connection.execute("COMMIT")
+            except sqlite3.Error:
+                self._connection.execute("ROLLBACK")
+                self._entry_count = None
+                raise
+
+    def clear(self) -> None:
+        """Remove every cached embedding"""
+        with self._lock:
+            self._connection.execute("DELETE FROM embeddings")
+            self._connection.execute("VACUUM")
+            self._entry_count = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        return int(count)
+
+    def stats(self) -> dict[str, int]:
+        """Hit/miss counters for this process alongside the current entry count"""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self)}
+
+    def _evict(self, now: float, stored: int) -> None:
+        """Drop expired entries, then least-recently-used entries beyond capacity"""
+        self._connection.execute(
+            "DELETE FROM embeddings WHERE created_at < ?", (now - self.max_age_seconds,)
+        )
+
+        # Ordering the whole table by access time is only worth it once the cache
+        # may be full; entries stored by other processes are seen at the next count
+        self._stored_since_count += stored
+        if (
+            self._entry_count is not None
+            and self._entry_count + self._stored_since_count <= self.max_entries
+        ):
+            return
+
+        (count,) = self._connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        if count > self.max_entries:
+            self._connection.execute(
+                "DELETE FROM embeddings WHERE rowid IN ("
+                "SELECT rowid FROM embeddings ORDER BY last_accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+        self._entry_count = min(int(count), self.max_entries)
+        self._stored_since_count = 0
+
+    @staticmethod
+    def _hash(input_text: str) -> str:
+        """Content hash for a text input"""
+        return hashlib.sha256(input_text.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _chunks(items: list[str]) -> Iterator[list[str]]:
+        """Split SQL parameter lists into bounded chunks"""
+        for i in range(0, len(items), _SQL_CHUNK_SIZE):
+            yield items[i:i + _SQL_CHUNK_SIZE]
@@ -1 +1,126 @@
-"""TODO: Define core LLM client for later flexibility"""
+"""Embedding provider interface shared by remote and local embedding backends"""
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Any, ClassVar, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from semtest.config import settings
+
+from .cache import EmbeddingCache
+
+
+EmbeddingMatrix = npt.NDArray[np.floating[Any]]
+
+
+class EmbeddingProvider(ABC):
+    """
+    Base embedding provider interface. Providers turn texts into an n x d
+    matrix of `dtype`, one row per input in input order. Subclasses register
+    themselves under their `backend` name, which selects the process-wide
+    default provider (`EMBEDDING_BACKEND` / `--embedding-backend`).
+    """
+
+    backend: ClassVar[str]
+    backends: ClassVar[dict[str, type["EmbeddingProvider"]]] = {}
+
+    _default: ClassVar[Optional["EmbeddingProvider"]] = None
+
+    model: str
+    dimensions: Optional[int]
+    dtype: np.dtype[Any]
+    _cache: Optional[EmbeddingCache] = None
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if "backend" in cls.__dict__:
+            EmbeddingProvider.backends[cls.backend] = cls
+
+    @classmethod
+    def configure_default(cls, backend: str) -> "EmbeddingProvider":
+        """Set the process-wide provider used by benchmarks without an explicit client"""
+        if backend not in cls.backends:
+            exc = f"Unknown embedding backend {backend}. Available backends: {list(cls.backends)}"
+            raise ValueError(exc)
+
+        EmbeddingProvider._default = cls.backends[backend]()
+        return EmbeddingProvider._default
+
+    @classmethod
+    def get_default(cls) -> "EmbeddingProvider":
+        """Process-wide provider, configured from settings on first access"""
+        if EmbeddingProvider._default is None:
+            return cls.configure_default(settings.EMBEDDING_BACKEND)
+        return EmbeddingProvider._default
+
+    def generate_embedding_vector(
+        self, input_text: str, model: Optional[str] = None
+    ) -> list[float]:
+        """Generate embedding vector for a text chunk"""
+        embedding: list[float] = (
+            self.generate_embedding_vectors([input_text], model=model)[0].tolist()
+        )
+        return embedding
+
+    @abstractmethod
+    def generate_embedding_vectors(
+        self, input_texts: list[str], model: Optional[str] = None
+    ) -> EmbeddingMatrix:
+        """Generate an embedding matrix for many text chunks, one row per input in input order"""
+        raise NotImplementedError
+
+    async def agenerate_embedding_vectors(
+        self, input_texts: list[str], model: Optional[str] = None
+    ) -> EmbeddingMatrix:
+        """Async counterpart of `generate_embedding_vectors`, run on a worker thread by default"""
+        return await asyncio.to_thread(self.generate_embedding_vectors, input_texts, model)
+
+    @property
+    def cache_namespace(self) -> str:
+        """Identifies the provider in embedding cache keys, alongside the model name"""
+        return f"local:{self.backend}"
+
+    @property
+    def cache(self) -> Optional[EmbeddingCache]:
+        """Client-specific cache, falling back to the process-wide default"""
+        if self._cache is not None:
+            return self._cache
+        return EmbeddingCache.get_default()
+
+    def _lookup_cached(
+        self, input_texts: list[str], model: str
+    ) -> tuple[dict[str, npt.NDArray[np.float32]], list[str]]:
+        """Split deduplicated inputs into cached embeddings and texts still to embed"""
+
+        unique_texts = list(dict.fromkeys(input_texts))
+        cache = self.cache
+
+        embeddings: dict[str, npt.NDArray[np.float32]] = {}
+        if cache is not None:
+            embeddings = cache.get_many(unique_texts, model, self.cache_namespace, self.dimensions)
+
+        missing_texts = [text for text in unique_texts if text not in embeddings]
+        return embeddings, missing_texts
+
+    def _merge_generated(
+        self,
+        input_texts: list[str],
+        embeddings: dict[str, npt.NDArray[np.float32]],
+        generated: dict[str, npt.NDArray[np.float32]],
+        model: str
+    ) -> EmbeddingMatrix:
+        """Store newly generated embeddings and assemble all rows into an input-ordered matrix"""
+
+        cache = self.cache
+        if cache is not None and generated:
+            cache.put_many(generated, model, self.cache_namespace, self.dimensions)
+
+        embeddings.update(generated)
+
+        dimensions = len(next(iter(embeddings.values()))) if embeddings else self.dimensions or 0
+        embedding_matrix = np.empty((len(input_texts), dimensions), dtype=self.dtype)
+        for row, text in enumerate(input_texts):
+            embedding_matrix[row] = embeddings[text]
+
+        return embedding_matrix
@@ -1,52 +1,235 @@
 """Core OpenAI client for LLM interactions"""
-from typing import Optional
+import asyncio
+import base64
+import threading
+import weakref
+from functools import partial
+from typing import TYPE_CHECKING, Any, Iterator, Optional
 
-import openai
+import numpy as np
+import numpy.typing as npt
 
 from semtest.config import settings
 
+from .cache import EmbeddingCache
+from .core import EmbeddingMatrix, EmbeddingProvider
+from .transport import EmbeddingTransport
 
-class EmbeddingClient():
-    """OpenAI embedded model client"""
+if TYPE_CHECKING:
+    import openai
 
-    def __init__(
+
+class EmbeddingClient(EmbeddingProvider):
+    """
+    OpenAI embedded model client. Bulk methods return a contiguous n x d
+    matrix of `dtype` (float32 by default, optionally float16), decoded
+    directly from base64 API payloads. The openai package is imported, and
+    its client constructed, on first request. Requests go through the
+    `transport` (the process-wide `EmbeddingTransport` by default), which
+    pools connections, retries failures and adapts batch sizes to rate limits.
+    """
+
+    backend = "openai"
+
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         model: str = settings.DEFAULT_EMBEDDING_MODEL,
         api_key: str = settings.OPENAI_API_KEY,
-        base_url: str = settings.BASE_URL
+        base_url: str = settings.BASE_URL,
+        *,
+        dimensions: Optional[int] = None,
+        max_batch_inputs: int = settings.EMBEDDING_MAX_BATCH_INPUTS,
+        max_batch_tokens: int = settings.EMBEDDING_MAX_BATCH_TOKENS,
+        cache: Optional[EmbeddingCache] = None,
+        dtype: npt.DTypeLike = settings.EMBEDDING_DTYPE,
+        transport: Optional[EmbeddingTransport] = None
     ):
         self.model = model
         self.api_key = api_key
         self.base_url = base_url
-        self.client = openai.OpenAI(
-            api_key=api_key,
-            base_url=base_url
-        )
+        self.dimensions = dimensions
+        self.max_batch_inputs = max_batch_inputs
+        self.max_batch_tokens = max_batch_tokens
+        self._cache = cache
+        self.dtype = np.dtype(dtype)
+        self._transport = transport
+        # OpenAI clients, with the transport whose connection pool they use
+        self._client: Optional[tuple[EmbeddingTransport, "openai.OpenAI"]] = None
+        self._client_lock = threading.Lock()
+        # Async HTTP connections are bound to the event loop that opened them
+        self._async_clients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, tuple[EmbeddingTransport, "openai.AsyncOpenAI"]
+        ] = weakref.WeakKeyDictionary()
 
-    def generate_embedding_vector(
-        self, input_text: str, model: Optional[str] = None
-    ) -> list[float]:
-        """Generate embedding vector for a text chunk"""
+    def generate_embedding_vectors(
+        self, input_texts: list[str], model: Optional[str] = None
+    ) -> EmbeddingMatrix:
+        """
+        Generate an embedding matrix for many text chunks, one row per input in
+        input order. Duplicate texts are embedded once, and cached vectors are
+        reused when an embedding cache is configured.
+        """
 
         if not model:
             model = self.model
 
-        response = self.client.embeddings.create(
-            input=input_text,
-            model=model
-        )
+        embeddings, missing_texts = self._lookup_cached(input_texts, model)
+
+        transport = self.transport
+        client = self.client
+        generated: dict[str, npt.NDArray[np.float32]] = {}
+        for batch in self._batch_inputs(missing_texts):
+            options = self._request_options(batch, model)
+            response = transport.request(partial(client.embeddings.create, **options))
+            generated.update(zip(batch, self._parse_response(response, batch, model)))
+
+        return self._merge_generated(input_texts, embeddings, generated, model)
+
+    async def agenerate_embedding_vectors(
+        self, input_texts: list[str], model: Optional[str] = None
+    ) -> EmbeddingMatrix:
+        """Async counterpart of `generate_embedding_vectors`; batches are embedded concurrently"""
+
+        if not model:
+            model = self.model
+
+        embeddings, missing_texts = self._lookup_cached(input_texts, model)
+
+        transport = self.transport
+        client = self.async_client
+        batches = list(self._batch_inputs(missing_texts))
+        responses = await asyncio.gather(*(
+            transport.arequest(
+                partial(client.embeddings.create, **self._request_options(batch, model))
+            )
+            for batch in batches
+        ))
+
+        generated: dict[str, npt.NDArray[np.float32]] = {}
+        for batch, response in zip(batches, responses):
+            generated.update(zip(batch, self._parse_response(response, batch, model)))
 
-        if not response:
+        return self._merge_generated(input_texts, embeddings, generated, model)
+
+    @property
+    def cache_namespace(self) -> str:
+        """Embeddings are cached per API base URL"""
+        return self.base_url
+
+    @property
+    def transport(self) -> EmbeddingTransport:
+        """Client-specific transport, falling back to the process-wide default"""
+        if self._transport is not None:
+            return self._transport
+        return EmbeddingTransport.get_default()
+
+    @property
+    def client(self) -> "openai.OpenAI":
+        """
+        Sync OpenAI client on the transport's connection pool, created on first
+        use. Retries are left to the transport.
+        """
+        transport = self.transport
+        with self._client_lock:
+            if self._client is None or self._client[0] is not transport:
+                import openai  # pylint: disable=import-outside-toplevel,redefined-outer-name
+                self._client = (transport, openai.OpenAI(
+                    api_key=self.api_key,
+                    base_url=self.base_url,
+                    http_client=transport.http_client,
+                    max_retries=0
+                ))
+            return self._client[1]
+
+    @property
+    def async_client(self) -> "openai.AsyncOpenAI":
+        """Async OpenAI client on the transport's connection pool for the running event loop"""
+        transport = self.transport
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None or client[0] is not transport:
+            import openai  # pylint: disable=import-outside-toplevel,redefined-outer-name
+            client = (transport, openai.AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                http_client=transport.async_http_client,
+                max_retries=0
+            ))
+            self._async_clients[loop] = client
+        return client[1]
+
+    def _request_options(self, batch: list[str], model: str) -> dict[str, Any]:
+        """Embeddings request arguments for a batch, omitting `dimensions` unless set"""
+        options: dict[str, Any] = {
+            "input": batch,
+            "model": model,
+            "encoding_format": "base64",
+        }
+        if self.dimensions:
+            options["dimensions"] = self.dimensions
+        return options
+
+    def _parse_response(
+        self, response: Any, batch: list[str], model: str
+    ) -> list[npt.NDArray[np.float32]]:
+        """Validate an embeddings response and return its vectors in input order"""
+
+        if not response or len(response.data) != len(batch):
             exc = (
-                f"Failed to generate embeddings vector. input: {input_text} "
+                f"Failed to generate embeddings vector. input: {batch} "
                 f"metadata: (model={model}, base_url={self.base_url}, )"
             )
             raise ValueError(exc)
 
         try:
-            embedding = response.data[0].embedding
-        except KeyError as e:
+            ordered_data = sorted(response.data, key=lambda item: item.index)
+            embeddings = [self._decode_embedding(item.embedding) for item in ordered_data]
+        except (KeyError, AttributeError) as e:
             exc = f"Failed to parse embedding response: {response}"
             raise ValueError(exc) from e
 
-        return embedding
+        return embeddings
+
+    @staticmethod
+    def _decode_embedding(embedding: str | list[float]) -> npt.NDArray[np.float32]:
+        """Decode a base64 float32 payload, or a float list from providers without base64"""
+        if isinstance(embedding, str):
+            return np.frombuffer(base64.b64decode(embedding), dtype=np.float32)
+        return np.asarray(embedding, dtype=np.float32)
+
+    def _batch_inputs(self, input_texts: list[str]) -> Iterator[list[str]]:
+        """
+        Split inputs into batches within the provider input-count and token
+        limits, scaled down while the transport is being rate limited. Limits
+        are re-read for every batch, so lazily consumed batches shrink as soon
+        as requests are throttled.
+        """
+
+        transport = self.transport
+        max_inputs, max_tokens = transport.batch_limits(
+            self.max_batch_inputs, self.max_batch_tokens
+        )
+        batch: list[str] = []
+        batch_tokens = 0
+        for input_text in input_texts:
+            input_tokens = self._estimate_tokens(input_text)
+            if batch and (
+                len(batch) >= max_inputs
+                or batch_tokens + input_tokens > max_tokens
+            ):
+                yield batch
+                batch, batch_tokens = [], 0
+                max_inputs, max_tokens = transport.batch_limits(
+                    self.max_batch_inputs, self.max_batch_tokens
+                )
+
+            batch.append(input_text)
+            batch_tokens += input_tokens
+
+        if batch:
+            yield batch
+
+    @staticmethod
+    def _estimate_tokens(input_text: str) -> int:
+        """Conservative token estimate (~3 bytes per token) without a tokenizer dependency"""
+        return len(input_text.encode("utf-8")) // 3 + 1
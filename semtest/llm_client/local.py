@@ -0,0 +1,148 @@
+"""In-process embedding backends that run without network access"""
+import hashlib
+import re
+import threading
+from functools import lru_cache
+from typing import Any, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from semtest.config import settings
+
+from .cache import EmbeddingCache
+from .core import EmbeddingMatrix, EmbeddingProvider
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+@lru_cache(maxsize=1 << 16)
+def _hash_feature(feature: str, dimensions: int) -> tuple[int, float]:
+    """Stable (process-independent) column and sign of a hashed feature"""
+    digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest())
+    return digest % dimensions, 1.0 if digest >> 63 else -1.0
+
+
+class HashingEmbeddingClient(EmbeddingProvider):
+    """
+    Deterministic hashing vectorizer. Word unigrams, word bigrams and character
+    trigrams are hashed into `dimensions` signed buckets with sublinear term
+    frequencies, then L2-normalized. It captures lexical rather than semantic
+    similarity, which suits offline smoke runs and CI.
+    """
+
+    backend = "hashing"
+
+    def __init__(
+        self,
+        dimensions: int = settings.LOCAL_EMBEDDING_DIMENSIONS,
+        *,
+        dtype: npt.DTypeLike = settings.EMBEDDING_DTYPE
+    ) -> None:
+        self.model = f"hashing-{dimensions}"
+        self.dimensions = dimensions
+        self._buckets = dimensions
+        self.dtype = np.dtype(dtype)
+
+    def generate_embedding_vectors(
+        self, input_texts: list[str], model: Optional[str] = None
+    ) -> EmbeddingMatrix:
+        """Vectorize texts in-process; `model` is ignored"""
+        embedding_matrix = np.zeros((len(input_texts), self._buckets), dtype=np.float32)
+        for row, input_text in enumerate(input_texts):
+            features = self._features(input_text)
+            if not features:
+                continue
+
+            columns, signs = zip(*(
+                _hash_feature(feature, self._buckets) for feature in features
+            ))
+            np.add.at(embedding_matrix[row], list(columns), signs)
+
+        # Sublinear term frequency, then unit length
+        np.copyto(
+            embedding_matrix,
+            np.sign(embedding_matrix) * np.log1p(np.abs(embedding_matrix))
+        )
+        norms = np.linalg.norm(embedding_matrix, axis=1, keepdims=True)
+        np.divide(embedding_matrix, norms, out=embedding_matrix, where=norms > 0)
+
+        return embedding_matrix.astype(self.dtype, copy=False)
+
+    @staticmethod
+    def _features(input_text: str) -> list[str]:
+        """Word unigram, word bigram and character trigram features of a text"""
+        words = _TOKEN_PATTERN.findall(input_text.lower())
+        features = [f"w:{word}" for word in words]
+        features.extend(f"b:{first} {second}" for first, second in zip(words, words[1:]))
+        for word in words:
+            padded = f"<{word}>"
+            features.extend(f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2))
+        return features
+
+
+class SentenceTransformerEmbeddingClient(EmbeddingProvider):
+    """
+    Locally loaded sentence-embedding model, run in batches on `device` (CPU by
+    default). Requires the optional `sentence-transformers` dependency
+    (`pip install semtest[local]`); the model is loaded on first use.
+    """
+
+    backend = "sentence-transformers"
+
+    def __init__(
+        self,
+        model: str = settings.LOCAL_EMBEDDING_MODEL,
+        *,
+        device: str = settings.LOCAL_EMBEDDING_DEVICE,
+        batch_size: int = settings.LOCAL_EMBEDDING_BATCH_SIZE,
+        cache: Optional[EmbeddingCache] = None,
+        dtype: npt.DTypeLike = settings.EMBEDDING_DTYPE
+    ) -> None:
+        self.model = model
+        self.dimensions = None
+        self.device = device
+        self.batch_size = batch_size
+        self._cache = cache
+        self.dtype = np.dtype(dtype)
+        self._encoders: dict[str, Any] = {}
+        self._lock = threading.Lock()  # Encoders are not safe for concurrent use
+
+    def generate_embedding_vectors(
+        self, input_texts: list[str], model: Optional[str] = None
+    ) -> EmbeddingMatrix:
+        """
+        Encode texts with the local model. Duplicate texts are encoded once, and
+        cached vectors are reused when an embedding cache is configured.
+        """
+        if not model:
+            model = self.model
+
+        embeddings, missing_texts = self._lookup_cached(input_texts, model)
+
+        generated: dict[str, npt.NDArray[np.float32]] = {}
+        if missing_texts:
+            with self._lock:
+                encoded = self._encoder(model).encode(
+                    missing_texts, batch_size=self.batch_size, convert_to_numpy=True
+                )
+            generated = dict(zip(missing_texts, np.asarray(encoded, dtype=np.float32)))
+
+        return self._merge_generated(input_texts, embeddings, generated, model)
+
+    def _encoder(self, model: str) -> Any:
+        """Load (once) the sentence-transformers model"""
+        if model not in self._encoders:
+            try:
+                # pylint: disable-next=import-outside-toplevel
+                from sentence_transformers import SentenceTransformer
+            except ImportError as e:
+                exc = (
+                    "The sentence-transformers embedding backend requires sentence-transformers. "
+                    "Install it with `pip install semtest[local]`"
+                )
+                raise ImportError(exc) from e
+
+            self._encoders[model] = SentenceTransformer(model, device=self.device)
+
+        return self._encoders[model]
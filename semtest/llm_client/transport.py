@@ -0,0 +1,363 @@
+"""Shared, retry-aware HTTP transport for remote embedding requests"""
+# pylint: disable=broad-exception-caught
+import asyncio
+import email.utils
+import logging
+import random
+import threading
+import time
+import weakref
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, ClassVar, Optional, TypeVar
+
+from semtest.config import settings
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger("semtest")
+
+T = TypeVar("T")
+
+# Status codes retried with backoff; 429 and 503 also shrink the request window
+# and pause requests, while timeouts (408, 504) only shrink it
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504})
+THROTTLE_STATUS_CODES = frozenset({429, 503})
+TIMEOUT_STATUS_CODES = frozenset({408, 504})
+MIN_BATCH_SCALE = 1 / 64
+
+
+class AdaptiveWindow:
+    """
+    Additive-increase/multiplicative-decrease window on in-flight requests and
+    batch size, shared between threads and event loops. A throttled response
+    halves both (once per window, however many requests it had in flight) and
+    pauses every caller until the server's retry delay has passed. Timeouts
+    halve them without pausing, and other failures leave them unchanged.
+    """
+
+    def __init__(self, max_in_flight: int) -> None:
+        self.max_in_flight = max_in_flight
+        self.limit = float(max_in_flight)
+        self.batch_scale = 1.0
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self._decreased_at = 0.0
+        self._condition = threading.Condition()
+        self._async_waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future[None]]] = []
+
+    def acquire(self) -> float:
+        """Block the calling thread until a request may be sent, returning its start time"""
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    self._condition.wait(self.paused_until - now)
+                elif self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return now
+                else:
+                    self._condition.wait()
+
+    async def aacquire(self) -> float:
+        """Suspend the calling coroutine until a request may be sent, returning its start time"""
+        loop = asyncio.get_running_loop()
+        while True:
+            waiter: Optional[asyncio.Future[None]] = None
+            with self._condition:
+                now = time.monotonic()
+                pause = self.paused_until - now
+                if pause <= 0:
+                    if self.in_flight < int(self.limit):
+                        self.in_flight += 1
+                        return now
+                    waiter = loop.create_future()
+                    self._async_waiters.append((loop, waiter))
+
+            if waiter is not None:
+                await waiter
+            else:
+                await asyncio.sleep(pause)
+
+    def release(self, started: float, throttle_delay: Optional[float] = None) -> None:
+        """
+        Free a request slot, growing the window after a success or, given the
+        server's `throttle_delay`, shrinking it and pausing all requests
+        """
+        with self._condition:
+            self.in_flight -= 1
+            if throttle_delay is None:
+                self.limit = min(float(self.max_in_flight), self.limit + 1 / self.limit)
+                self.batch_scale = min(1.0, self.batch_scale * 1.1)
+            else:
+                self.paused_until = max(self.paused_until, time.monotonic() + throttle_delay)
+                self._decrease(started, f"throttled, pausing {throttle_delay:.2f}s")
+            waiters = self._notify()
+
+        self._wake_async(waiters)
+
+    def release_failed(self, started: float, congested: bool = False) -> None:
+        """
+        Free the slot of a request that failed without being throttled. The
+        window never grows on a failure, and shrinks if it was `congested`
+        (timed out)
+        """
+        with self._condition:
+            self.in_flight -= 1
+            if congested:
+                self._decrease(started, "timed out")
+            waiters = self._notify()
+
+        self._wake_async(waiters)
+
+    def _decrease(self, started: float, reason: str) -> None:
+        """Halve the window and batch size, once per window; the lock must be held"""
+        # Requests sent before the last decrease report the same overload
+        if started < self._decreased_at:
+            return
+
+        self._decreased_at = time.monotonic()
+        self.limit = max(1.0, self.limit / 2)
+        self.batch_scale = max(MIN_BATCH_SCALE, self.batch_scale / 2)
+        decrease_log = (
+            f"Embedding requests {reason}: window {int(self.limit)} requests, "
+            f"batch scale {self.batch_scale:.3f}\n"
+        )
+        logger.debug(decrease_log)
+
+    def _notify(self) -> list[tuple[asyncio.AbstractEventLoop, asyncio.Future[None]]]:
+        """Wake waiting threads and hand over the async waiters; the lock must be held"""
+        self._condition.notify_all()
+        waiters, self._async_waiters = self._async_waiters, []
+        return waiters
+
+    @staticmethod
+    def _wake_async(waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future[None]]]) -> None:
+        """Resolve async waiters on their own event loops"""
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, waiter)
+            except RuntimeError:  # Event loop already closed
+                continue
+
+
+def _wake(waiter: asyncio.Future[None]) -> None:
+    """Resolve a pending window waiter"""
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class EmbeddingTransport:
+    """
+    Process-wide HTTP transport shared by all remote embedding clients: one
+    keep-alive connection pool (per event loop for async requests), retries of
+    rate-limited, timed out and failed requests with exponential backoff and
+    full jitter, honoring `Retry-After`, and an `AdaptiveWindow` that throttles
+    concurrency and batch size on rate-limit feedback. httpx is imported on
+    first request.
+    """
+
+    _default: ClassVar[Optional["EmbeddingTransport"]] = None
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        max_connections: int = settings.EMBEDDING_MAX_CONNECTIONS,
+        max_keepalive_connections: int = settings.EMBEDDING_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = settings.EMBEDDING_KEEPALIVE_SECONDS,
+        timeout: float = settings.EMBEDDING_TIMEOUT_SECONDS,
+        *,
+        max_retries: int = settings.EMBEDDING_MAX_RETRIES,
+        backoff_base: float = settings.EMBEDDING_BACKOFF_BASE_SECONDS,
+        backoff_max: float = settings.EMBEDDING_BACKOFF_MAX_SECONDS
+    ) -> None:
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.window = AdaptiveWindow(max_connections)
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0
+
+        self._http_client: Optional["httpx.Client"] = None
+        self._http_client_lock = threading.Lock()
+        # Async connections are bound to the event loop that opened them
+        self._async_http_clients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, "httpx.AsyncClient"
+        ] = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def configure_default(cls, max_connections: int) -> "EmbeddingTransport":
+        """Set the process-wide transport used by remote embedding clients"""
+        cls._default = cls(
+            max_connections=max_connections,
+            max_keepalive_connections=min(
+                max_connections, settings.EMBEDDING_MAX_KEEPALIVE_CONNECTIONS
+            )
+        )
+        return cls._default
+
+    @classmethod
+    def get_default(cls) -> "EmbeddingTransport":
+        """Process-wide transport, configured from settings on first access"""
+        if cls._default is None:
+            return cls.configure_default(settings.EMBEDDING_MAX_CONNECTIONS)
+        return cls._default
+
+    @property
+    def http_client(self) -> "httpx.Client":
+        """Pooled sync HTTP client, created on first use"""
+        with self._http_client_lock:
+            if self._http_client is None:
+                import httpx  # pylint: disable=import-outside-toplevel,redefined-outer-name
+                self._http_client = httpx.Client(
+                    limits=self._limits(), timeout=self.timeout
+                )
+            return self._http_client
+
+    @property
+    def async_http_client(self) -> "httpx.AsyncClient":
+        """Pooled async HTTP client for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if loop not in self._async_http_clients:
+            import httpx  # pylint: disable=import-outside-toplevel,redefined-outer-name
+            self._async_http_clients[loop] = httpx.AsyncClient(
+                limits=self._limits(), timeout=self.timeout
+            )
+        return self._async_http_clients[loop]
+
+    def request(self, send: Callable[[], T]) -> T:
+        """Send a request through the window, retrying retryable failures"""
+        attempt = 0
+        while True:
+            started = self.window.acquire()
+            try:
+                response = send()
+            except Exception as e:
+                delay = self._handle_failure(e, attempt, started)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            self.window.release(started)
+            self.requests += 1
+            return response
+
+    async def arequest(self, send: Callable[[], Awaitable[T]]) -> T:
+        """Async counterpart of `request`"""
+        attempt = 0
+        while True:
+            started = await self.window.aacquire()
+            try:
+                response = await send()
+            except Exception as e:
+                delay = self._handle_failure(e, attempt, started)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+
+            self.window.release(started)
+            self.requests += 1
+            return response
+
+    def batch_limits(self, max_inputs: int, max_tokens: int) -> tuple[int, int]:
+        """Batch input and token limits scaled down by the adaptive window"""
+        scale = self.window.batch_scale
+        return max(1, int(max_inputs * scale)), max(1, int(max_tokens * scale))
+
+    def stats(self) -> dict[str, int]:
+        """Request, retry and throttle counters"""
+        return {"requests": self.requests, "retries": self.retries, "throttled": self.throttled}
+
+    def close(self) -> None:
+        """Close the sync connection pool; async pools close with their event loop"""
+        with self._http_client_lock:
+            if self._http_client is not None:
+                self._http_client.close()
+                self._http_client = None
+
+    def _limits(self) -> "httpx.Limits":
+        """Connection pool limits shared by the sync and async clients"""
+        import httpx  # pylint: disable=import-outside-toplevel,redefined-outer-name
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry
+        )
+
+    def _handle_failure(self, error: Exception, attempt: int, started: float) -> Optional[float]:
+        """
+        Release the window slot of a failed request, shrinking the window if it
+        was throttled or timed out, and return the seconds to wait before
+        retrying it, or None when it must not be retried
+        """
+        # Only raised once the openai package is in use
+        import openai  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+        status_code: Optional[int] = None
+        retry_after: Optional[float] = None
+        if isinstance(error, openai.APIStatusError):
+            status_code = error.status_code
+            retry_after = parse_retry_after(error.response.headers)
+            retryable = status_code in RETRYABLE_STATUS_CODES
+        else:
+            retryable = isinstance(error, openai.APIConnectionError)  # Includes timeouts
+
+        backoff = random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+        delay = (
+            retry_after + random.uniform(0, self.backoff_base)
+            if retry_after is not None else backoff
+        )
+        throttled = status_code in THROTTLE_STATUS_CODES
+        if throttled:
+            self.window.release(started, delay)
+        else:
+            self.window.release_failed(
+                started,
+                congested=(
+                    isinstance(error, openai.APITimeoutError)
+                    or status_code in TIMEOUT_STATUS_CODES
+                )
+            )
+        self.throttled += throttled
+
+        if not retryable or attempt >= self.max_retries:
+            return None
+
+        self.retries += 1
+        retry_log = (
+            f"Retrying embedding request in {delay:.2f}s "
+            f"(attempt {attempt + 1}/{self.max_retries}): {type(error).__name__}\n"
+        )
+        logger.debug(retry_log)
+        return delay
+
+
+def parse_retry_after(headers: Any) -> Optional[float]:
+    """Seconds to wait from `retry-after-ms` or `retry-after` (seconds or HTTP date) headers"""
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000)
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = email.utils.parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
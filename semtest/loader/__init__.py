@@ -1,4 +1,6 @@
 """Test loader module"""
+from .durations import DurationStore
 from .loader import Loader
+from .sharding import Shard
 
-__all__ = ["Loader"]
+__all__ = ["DurationStore", "Loader", "Shard"]
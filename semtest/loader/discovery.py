@@ -0,0 +1,217 @@
+"""Import-free discovery and selection of benchmarks by static analysis"""
+import ast
+import hashlib
+import json
+import logging
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, NoReturn, Optional
+
+logger = logging.getLogger("semtest")
+
+# Decorators marking benchmark functions; bump the version when they change
+BENCHMARK_DECORATORS = frozenset({"benchmark", "dataset_benchmark"})
+DISCOVERY_CACHE_VERSION = 3
+
+# Modules exporting the benchmark decorators
+SEMTEST_MODULES = frozenset({"semtest", "semtest.benchmarking"})
+
+
+@dataclass
+class DiscoveredBenchmark:
+    """A `benchmark`-decorated function found in a source file without importing it"""
+    module: str
+    name: str
+    path: Path
+    lineno: int
+
+    @property
+    def benchmark_id(self) -> str:
+        """`module::function` identifier, matching `BenchmarkRunner.benchmark_id`"""
+        return f"{self.module}::{self.name}"
+
+
+def find_benchmark_functions(source: str) -> list[tuple[str, int]]:
+    """
+    Names and line numbers of top-level functions decorated with `benchmark` or
+    `dataset_benchmark`, called either directly (`@benchmark(...)`, including
+    `from semtest import benchmark as alias`) or as an attribute of a semtest
+    module (`@semtest.benchmark(...)`, including `import semtest as alias`)
+    """
+    tree = ast.parse(source)
+
+    decorator_names = set(BENCHMARK_DECORATORS)
+    module_names = set(SEMTEST_MODULES)
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom) and node.module in SEMTEST_MODULES:
+            decorator_names.update(
+                alias.asname for alias in node.names
+                if alias.name in BENCHMARK_DECORATORS and alias.asname
+            )
+            module_names.update(
+                alias.asname or alias.name for alias in node.names
+                if f"{node.module}.{alias.name}" in SEMTEST_MODULES
+            )
+        elif isinstance(node, ast.Import):
+            module_names.update(
+                alias.asname for alias in node.names
+                if alias.name in SEMTEST_MODULES and alias.asname
+            )
+
+    def dotted_name(node: ast.expr) -> Optional[str]:
+        if isinstance(node, ast.Name):
+            return node.id
+        if isinstance(node, ast.Attribute):
+            base = dotted_name(node.value)
+            return None if base is None else f"{base}.{node.attr}"
+        return None
+
+    def is_benchmark_decorator(decorator: ast.expr) -> bool:
+        target = decorator.func if isinstance(decorator, ast.Call) else decorator
+        if isinstance(target, ast.Name):
+            return target.id in decorator_names
+        return (
+            isinstance(target, ast.Attribute)
+            and target.attr in BENCHMARK_DECORATORS
+            and dotted_name(target.value) in module_names
+        )
+
+    return [
+        (node.name, node.lineno)
+        for node in tree.body
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+        and any(is_benchmark_decorator(decorator) for decorator in node.decorator_list)
+    ]
+
+
+class DiscoveryCache:
+    """
+    Statically discovered benchmarks of each source file, keyed by resolved path.
+    Entries are reused while a file's mtime and size are unchanged, or when its
+    content hash still matches after a touch.
+    """
+
+    def __init__(self, path: Optional[Path]) -> None:
+        self.path = path
+        self.entries: dict[str, dict[str, Any]] = {}
+        self._dirty = False
+
+        if self.path is not None and self.path.is_file():
+            try:
+                self.entries = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                logger.warning("Ignoring unreadable discovery cache %s\n", self.path)
+
+    def benchmark_functions(self, file_path: Path) -> list[tuple[str, int]]:
+        """Benchmark function names and line numbers of a file, parsing it only if changed"""
+        key = str(file_path.resolve())
+        stat = file_path.stat()
+        entry = self.entries.get(key)
+        if entry and entry.get("version") != DISCOVERY_CACHE_VERSION:
+            entry = None
+        if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return [tuple(function) for function in entry["functions"]]
+
+        source = file_path.read_bytes()
+        content_hash = hashlib.sha256(source).hexdigest()
+        if entry and entry["sha256"] == content_hash:
+            functions = [tuple(function) for function in entry["functions"]]
+        else:
+            try:
+                functions = find_benchmark_functions(source.decode("utf-8"))
+            except (SyntaxError, UnicodeDecodeError, ValueError):
+                # Leave the error to surface, with a proper traceback, when the module is imported
+                logger.warning("Could not parse %s for benchmarks\n", file_path)
+                return []
+
+        self.entries[key] = {
+            "version": DISCOVERY_CACHE_VERSION,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": content_hash,
+            "functions": functions,
+        }
+        self._dirty = True
+        return functions
+
+    def save(self) -> None:
+        """Persist the cache to disk, if anything changed"""
+        if self.path is None or not self._dirty:
+            return
+        try:
+            self.path.write_text(json.dumps(self.entries), encoding="utf-8")
+            self._dirty = False
+        except OSError:
+            logger.warning("Failed to write discovery cache %s\n", self.path)
+
+
+class KeywordExpression:
+    """
+    Pytest-style `-k` selection expression: terms are matched as case-insensitive
+    substrings of a benchmark id, combined with `and`, `or`, `not` and parentheses
+    """
+
+    _OPERATORS = ("and", "or", "not", "(", ")")
+
+    def __init__(self, expression: str) -> None:
+        self.expression = expression
+        self._tokens = re.findall(r"\(|\)|[^\s()]+", expression)
+        self._position = 0
+        self._tree = self._parse_or()
+        if self._position != len(self._tokens):
+            self._invalid()
+
+    def matches(self, benchmark_id: str) -> bool:
+        """Whether a benchmark id satisfies the expression"""
+        return self._evaluate(self._tree, benchmark_id.lower())
+
+    # Expressions are parsed into nested tuples: ("or"|"and", [operands]), ("not", operand)
+    # or ("term", substring), by recursive descent in order of operator precedence
+
+    def _parse_or(self) -> tuple[str, Any]:
+        operands = [self._parse_and()]
+        while self._accept("or"):
+            operands.append(self._parse_and())
+        return ("or", operands) if len(operands) > 1 else operands[0]
+
+    def _parse_and(self) -> tuple[str, Any]:
+        operands = [self._parse_not()]
+        while self._accept("and"):
+            operands.append(self._parse_not())
+        return ("and", operands) if len(operands) > 1 else operands[0]
+
+    def _parse_not(self) -> tuple[str, Any]:
+        if self._accept("not"):
+            return ("not", self._parse_not())
+        if self._accept("("):
+            node = self._parse_or()
+            if not self._accept(")"):
+                self._invalid()
+            return node
+        if self._position >= len(self._tokens) or self._tokens[self._position] in self._OPERATORS:
+            self._invalid()
+        self._position += 1
+        return ("term", self._tokens[self._position - 1].lower())
+
+    def _accept(self, token: str) -> bool:
+        """Consume the next token if it is `token`"""
+        if self._position < len(self._tokens) and self._tokens[self._position] == token:
+            self._position += 1
+            return True
+        return False
+
+    def _invalid(self) -> NoReturn:
+        exc = f"Invalid keyword expression: {self.expression}"
+        raise ValueError(exc)
+
+    def _evaluate(self, node: tuple[str, Any], benchmark_id: str) -> bool:
+        """Evaluate a parsed expression node"""
+        operator, operand = node
+        if operator == "and":
+            return all(self._evaluate(child, benchmark_id) for child in operand)
+        if operator == "or":
+            return any(self._evaluate(child, benchmark_id) for child in operand)
+        if operator == "not":
+            return not self._evaluate(operand, benchmark_id)
+        return operand in benchmark_id
@@ -0,0 +1,50 @@
+"""Persisted benchmark durations used for scheduling"""
+import json
+import logging
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger("semtest")
+
+
+class DurationStore:
+    """Wall-clock duration of each benchmark from previous runs, keyed by benchmark id"""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.durations: dict[str, float] = {}
+
+        if self.path.is_file():
+            try:
+                self.durations = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                logger.warning("Ignoring unreadable benchmark durations file %s\n", self.path)
+
+    def expected(self, benchmark_id: str) -> Optional[float]:
+        """Last recorded duration of a benchmark, if any"""
+        return self.durations.get(benchmark_id)
+
+    def longest_first(self, benchmark_ids: list[str]) -> list[str]:
+        """
+        Order benchmarks by expected duration, longest first. Benchmarks without
+        history are assumed to take the mean recorded duration.
+        """
+        known = [self.durations[i] for i in benchmark_ids if i in self.durations]
+        default = sum(known) / len(known) if known else 0.0
+
+        return sorted(
+            benchmark_ids,
+            key=lambda benchmark_id: self.durations.get(benchmark_id, default),
+            reverse=True
+        )
+
+    def record(self, benchmark_id: str, seconds: float) -> None:
+        """Record the most recent duration of a benchmark"""
+        self.durations[benchmark_id] = seconds
+
+    def save(self) -> None:
+        """Persist durations to disk"""
+        try:
+            self.path.write_text(json.dumps(self.durations, indent=2), encoding="utf-8")
+        except OSError:
+            logger.warning("Failed to write benchmark durations file %s\n", self.path)
@@ -2,46 +2,132 @@
 import os
 import sys
 
-from typing import Callable
+from contextlib import contextmanager
 from importlib import import_module
 from pathlib import Path
+from typing import TYPE_CHECKING, Iterator
 
-from semtest.benchmarking import BenchmarkMetadata
+from semtest.environment import DISCOVERY_CACHE_PATH, DURATIONS_PATH, project_setting
 from semtest.parser import SemtestContext
 
+from .discovery import DiscoveredBenchmark, DiscoveryCache, KeywordExpression
+from .durations import DurationStore
+from .sharding import Shard
+
+if TYPE_CHECKING:
+    from semtest.benchmarking import BenchmarkFunction
+
 
 class Loader:
-    """Core loader class to ingest benchmarking modules (TLMs)"""
+    """
+    Core loader class to ingest benchmarking modules (TLMs). Benchmarks are
+    discovered statically, so only modules containing selected benchmarks
+    are imported. With `--shard i/N`, only the i-th of N duration-balanced
+    partitions of the selection is loaded.
+    """
 
     def __init__(self, context: SemtestContext) -> None:
         self.tests_directory: Path = context.directory.resolve()
+        self.keyword = KeywordExpression(context.keyword) if context.keyword else None
+        self.paths = context.paths or []
+        self.shard = Shard(*context.shard) if context.shard else None
+        discovery_cache_path = project_setting("DISCOVERY_CACHE_PATH", DISCOVERY_CACHE_PATH)
+        self.discovery_cache = DiscoveryCache(
+            Path(discovery_cache_path) if discovery_cache_path else None
+        )
 
-    def load(self) -> list[Callable[..., BenchmarkMetadata]]:
+    def collect(self) -> list[DiscoveredBenchmark]:
         """
-        Recursively load all benchmark functions from specified directory. Imports
-        all python files as a top-level module, and has some stipulations:
+        Statically discover selected benchmarks under the tests directory without
+        importing anything, in file then source order. Only `benchmark`-decorated
+        top-level functions are discovered. Sharded runs keep only the benchmarks
+        of their shard, partitioned using the recorded benchmark durations.
+        """
+        discovered = []
+        for file in sorted(self.tests_directory.rglob('*.py')):
+            module_name = self._get_module_name(file)
+            for name, lineno in self.discovery_cache.benchmark_functions(file):
+                benchmark = DiscoveredBenchmark(
+                    module=module_name, name=name, path=file, lineno=lineno
+                )
+                if self._is_selected(benchmark):
+                    discovered.append(benchmark)
+
+        self.discovery_cache.save()
+
+        if self.shard is not None:
+            durations = DurationStore(
+                Path(project_setting("DURATIONS_PATH", DURATIONS_PATH))
+            ).durations
+            discovered = self.shard.select(discovered, durations)
+        return discovered
+
+    def load(self) -> list["BenchmarkFunction"]:
+        """
+        Load all selected benchmark functions from specified directory. Imports
+        python files containing selected benchmarks as a top-level module, and has
+        some stipulations:
             1. No relative imports
             2. Files/modules must be uniquely named
         """
-        sys.path.insert(0, str(self.tests_directory))
+        discovered = self.collect()
 
-        modules = []
-
-        for file in self.tests_directory.rglob('*.py'):
-            module = import_module(self._get_module_name(file))
-            modules.append(module)
+        with self._tests_directory_importable():
+            modules = {
+                module_name: import_module(module_name)
+                for module_name in dict.fromkeys(benchmark.module for benchmark in discovered)
+            }
 
         benchmark_functions = []
-        for module in modules:
-            for attr_name in dir(module):
-                attr = getattr(module, attr_name)
-                if callable(attr) and hasattr(attr, '_benchmark'):
-                    benchmark_functions.append(attr)
-
-        sys.path.pop(0)
+        for benchmark in discovered:
+            benchmark_func = getattr(modules[benchmark.module], benchmark.name, None)
+            if callable(benchmark_func) and hasattr(benchmark_func, '_benchmark'):
+                benchmark_functions.append(benchmark_func)
 
         return benchmark_functions
 
+    def load_benchmark(self, benchmark_id: str) -> "BenchmarkFunction":
+        """
+        Load a single benchmark function by its `module::function` id, importing
+        only the module that defines it.
+        """
+        module_name, _, attr_name = benchmark_id.partition("::")
+
+        with self._tests_directory_importable():
+            module = import_module(module_name)
+
+        benchmark_func = getattr(module, attr_name, None)
+        if not callable(benchmark_func) or not hasattr(benchmark_func, '_benchmark'):
+            exc = f"No benchmark {attr_name} found in module {module_name}"
+            raise LookupError(exc)
+
+        return benchmark_func  # type: ignore[no-any-return]
+
+    @contextmanager
+    def _tests_directory_importable(self) -> Iterator[None]:
+        """Temporarily expose the tests directory for top-level module imports"""
+        sys.path.insert(0, str(self.tests_directory))
+        try:
+            yield
+        finally:
+            sys.path.remove(str(self.tests_directory))
+
+    def _is_selected(self, benchmark: DiscoveredBenchmark) -> bool:
+        """Whether a discovered benchmark matches the `-k` expression and `--path` selections"""
+        if self.keyword is not None and not self.keyword.matches(benchmark.benchmark_id):
+            return False
+        if not self.paths:
+            return True
+
+        for selection in self.paths:
+            path, _, name = str(selection).partition("::")
+            selected_path = Path(path).resolve()
+            if (
+                benchmark.path == selected_path or selected_path in benchmark.path.parents
+            ) and name in ("", benchmark.name):
+                return True
+        return False
+
     def _get_module_name(self, filepath: Path) -> str:
         """From a filepath, get module name."""
         relative_path = filepath.relative_to(self.tests_directory)
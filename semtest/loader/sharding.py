@@ -0,0 +1,58 @@
+"""Deterministic partitioning of discovered benchmarks across shards"""
+import heapq
+from dataclasses import dataclass
+from typing import Mapping
+
+from .discovery import DiscoveredBenchmark
+
+
+@dataclass(frozen=True)
+class Shard:
+    """
+    Shard `index` (1-based) of `count`. Every shard computes the same
+    partition from the same benchmark ids and recorded durations, so runners
+    sharing a durations file run disjoint sets of benchmarks that together
+    cover the whole selection.
+    """
+    index: int
+    count: int
+
+    def __post_init__(self) -> None:
+        if not 1 <= self.index <= self.count:
+            exc = f"Invalid shard {self.index}/{self.count}: expected 1 <= index <= count"
+            raise ValueError(exc)
+
+    def select(
+        self, benchmarks: list[DiscoveredBenchmark], durations: Mapping[str, float]
+    ) -> list[DiscoveredBenchmark]:
+        """Benchmarks assigned to this shard, in their original order"""
+        shards = partition(
+            [benchmark.benchmark_id for benchmark in benchmarks], durations, self.count
+        )
+        selected = set(shards[self.index - 1])
+        return [benchmark for benchmark in benchmarks if benchmark.benchmark_id in selected]
+
+
+def partition(
+    benchmark_ids: list[str], durations: Mapping[str, float], count: int
+) -> list[list[str]]:
+    """
+    Split benchmarks into `count` shards of similar expected duration: longest
+    first, each onto the shard with the least expected duration so far (ties
+    broken by benchmark id and shard index). Benchmarks without history are
+    assumed to take the mean recorded duration, or all the same time.
+    """
+    known = [durations[i] for i in benchmark_ids if i in durations]
+    default = sum(known) / len(known) if known else 1.0
+
+    shards: list[list[str]] = [[] for _ in range(count)]
+    loads = [(0.0, index) for index in range(count)]
+    for benchmark_id in sorted(
+        set(benchmark_ids),
+        key=lambda benchmark_id: (-durations.get(benchmark_id, default), benchmark_id)
+    ):
+        load, index = heapq.heappop(loads)
+        shards[index].append(benchmark_id)
+        heapq.heappush(loads, (load + durations.get(benchmark_id, default), index))
+
+    return shards
@@ -1,4 +1,4 @@
 """Core parsing module"""
-from .parser import Parser, SemtestContext
+from .parser import MergeContext, Parser, RescoreContext, SemtestContext
 
-__all__ = ["Parser", "SemtestContext"]
+__all__ = ["MergeContext", "Parser", "RescoreContext", "SemtestContext"]
@@ -26,6 +26,85 @@ class InputType:
 
         return Path(value)
 
+    @staticmethod
+    def file_path(value: str) -> Path:
+        """Validate a file path whose parent directory may not yet exist"""
+        path = Path(value)
+        if path.is_dir():
+            exc = f"{value} is a directory, expected a file path"
+            raise argparse.ArgumentTypeError(exc)
+
+        return path
+
+    @staticmethod
+    def output_directory(value: str) -> Path:
+        """Validate an output directory path, which may not yet exist"""
+        path = Path(value)
+        if path.exists() and not path.is_dir():
+            exc = f"{value} is not a directory"
+            raise argparse.ArgumentTypeError(exc)
+
+        return path
+
+    @staticmethod
+    def positive_int(value: str) -> int:
+        """Validate a strictly positive integer"""
+        try:
+            number = int(value)
+        except ValueError as e:
+            exc = f"{value} is not a valid integer"
+            raise argparse.ArgumentTypeError(exc) from e
+
+        if number < 1:
+            exc = f"{value} must be a positive integer"
+            raise argparse.ArgumentTypeError(exc)
+
+        return number
+
+    @staticmethod
+    def positive_float(value: str) -> float:
+        """Validate a strictly positive number"""
+        try:
+            number = float(value)
+        except ValueError as e:
+            exc = f"{value} is not a valid number"
+            raise argparse.ArgumentTypeError(exc) from e
+
+        if number <= 0:
+            exc = f"{value} must be a positive number"
+            raise argparse.ArgumentTypeError(exc)
+
+        return number
+
+    @staticmethod
+    def shard(value: str) -> tuple[int, int]:
+        """Validate a 1-based `index/count` shard specification"""
+        index, _, count = value.partition("/")
+        try:
+            shard = int(index), int(count)
+        except ValueError as e:
+            exc = f"{value} is not a valid shard, expected INDEX/COUNT, e.g. 2/4"
+            raise argparse.ArgumentTypeError(exc) from e
+
+        if not 1 <= shard[0] <= shard[1]:
+            exc = f"{value} is not a valid shard, expected 1 <= INDEX <= COUNT"
+            raise argparse.ArgumentTypeError(exc)
+
+        return shard
+
+    @staticmethod
+    def comparator(value: str) -> str:
+        """Validate a comparator name or `package.module:ClassName` import path"""
+        # pylint: disable-next=import-outside-toplevel
+        from semtest.semantic_comparator import get_comparator
+
+        try:
+            get_comparator(value)
+        except (ImportError, ValueError) as e:
+            raise argparse.ArgumentTypeError(str(e)) from e
+
+        return value
+
     @staticmethod
     def verbosity(value: str) -> Verbosity:
         """Verbosity validaiton"""
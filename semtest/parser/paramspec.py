@@ -1,17 +1,27 @@
 """Core arguments for semtest"""
+from dataclasses import dataclass
 from typing import Any, Optional, Callable
-from pydantic import BaseModel
 
 from .input_type import InputType, Verbosity
 
 
-class SemtestParamSpec(BaseModel):
-    """Core defined argument options"""
+@dataclass
+class SemtestParamSpec:  # pylint: disable=too-many-instance-attributes
+    """
+    Core defined argument options. `setting` names the settings attribute that
+    supplies the default, which is resolved after parsing so that `--help`
+    does not load the project settings.
+    """
     flag: str
-    type: type | Callable[..., Any]
     help: str
-    default: Optional[str] = None
+    dest: Optional[str] = None
+    type: Optional[type | Callable[..., Any]] = None
+    action: Optional[str] = None
+    nargs: Optional[str] = None
+    choices: Optional[list[str]] = None
+    default: Optional[str | bool | int | list[str]] = None
     required: Optional[bool] = None
+    setting: Optional[str] = None
 
 
 semtest_params = [
@@ -21,10 +31,188 @@ semtest_params = [
         default=".",
         help="Input directory of semtests to execute against."
     ),
+    SemtestParamSpec(
+        flag="-k",
+        dest="keyword",
+        help=(
+            "Only run benchmarks whose `module::function` id matches this expression of "
+            "substrings combined with and/or/not, e.g. 'prompt and not async'."
+        )
+    ),
+    SemtestParamSpec(
+        flag="--path",
+        dest="paths",
+        nargs="+",
+        help="Only run benchmarks in these files or directories, or `file.py::function`."
+    ),
+    SemtestParamSpec(
+        flag="--shard",
+        type=InputType.shard,
+        help=(
+            "Only run shard INDEX/COUNT (1-based) of the selected benchmarks, e.g. 2/4. "
+            "Shards are balanced by recorded durations; give every shard the same durations file."
+        )
+    ),
+    SemtestParamSpec(
+        flag="--collect-only",
+        action="store_true",
+        default=False,
+        help="List the selected benchmarks without importing or running them."
+    ),
+    SemtestParamSpec(
+        flag="--changed-only",
+        action="store_true",
+        default=False,
+        help=(
+            "Replay cached results of benchmarks whose fingerprint is unchanged since "
+            "their last complete run, and only execute the rest."
+        )
+    ),
     SemtestParamSpec(
         flag="--verbosity",
         type=InputType.verbosity,
-        default="warn",
+        default="info",
         help=f"Verbosity level: {Verbosity.__members__.values()}"
+    ),
+    SemtestParamSpec(
+        flag="--embedding-backend",
+        setting="EMBEDDING_BACKEND",
+        help=(
+            "Embedding backend used by benchmarks without an explicit embedding client: "
+            "openai, hashing or sentence-transformers."
+        )
+    ),
+    SemtestParamSpec(
+        flag="--embedding-cache",
+        type=InputType.file_path,
+        setting="EMBEDDING_CACHE_PATH",
+        help="Path to a persistent SQLite embedding cache. Caching is disabled when unset."
+    ),
+    SemtestParamSpec(
+        flag="--clear-embedding-cache",
+        action="store_true",
+        default=False,
+        help="Clear the embedding cache before executing benchmarks."
+    ),
+    SemtestParamSpec(
+        flag="--workers",
+        type=InputType.positive_int,
+        setting="WORKERS",
+        help="Default thread pool size for synchronous benchmark iterations."
+    ),
+    SemtestParamSpec(
+        flag="--requests-per-minute",
+        type=InputType.positive_int,
+        setting="RATE_LIMIT_REQUESTS_PER_MINUTE",
+        help="Shared rate limit for benchmark iterations, in requests per minute."
+    ),
+    SemtestParamSpec(
+        flag="--tokens-per-minute",
+        type=InputType.positive_int,
+        setting="RATE_LIMIT_TOKENS_PER_MINUTE",
+        help="Shared rate limit for benchmark iterations, in tokens per minute."
+    ),
+    SemtestParamSpec(
+        flag="--streaming-stats",
+        action="store_true",
+        default=False,
+        help=(
+            "Summarize distances and timings on the fly and keep only a sample of responses, "
+            "bounding memory for very long benchmarks."
+        )
+    ),
+    SemtestParamSpec(
+        flag="--jobs",
+        type=InputType.positive_int,
+        default=1,
+        help="Number of worker processes to distribute benchmarks across."
+    ),
+    SemtestParamSpec(
+        flag="--timeout",
+        type=InputType.positive_float,
+        help="Per-benchmark timeout in seconds when running with --jobs > 1."
+    ),
+    SemtestParamSpec(
+        flag="--output",
+        type=InputType.file_path,
+        help="Stream benchmark results to a JSONL file, one line per benchmark."
+    ),
+    SemtestParamSpec(
+        flag="--summary-only",
+        action="store_true",
+        default=False,
+        help="Omit responses and per-iteration distances from --output records."
+    ),
+    SemtestParamSpec(
+        flag="--metrics-hook",
+        help=(
+            "`package.module:function` called with each completed benchmark's metadata, "
+            "e.g. to export timings to a metrics system."
+        )
+    ),
+    SemtestParamSpec(
+        flag="--artifact-dir",
+        type=InputType.output_directory,
+        help="Write a run artifact (manifest, Parquet tables, .npy embeddings) to this directory."
+    )
+]
+
+
+merge_params = [
+    SemtestParamSpec(
+        flag="result_files",
+        type=InputType.file_path,
+        nargs="+",
+        help="JSONL result files written with --output (not --summary-only), e.g. one per shard."
+    ),
+    SemtestParamSpec(
+        flag="--output",
+        type=InputType.file_path,
+        help="Write the merged results to a JSONL file, one line per benchmark."
+    ),
+    SemtestParamSpec(
+        flag="--summary-only",
+        action="store_true",
+        default=False,
+        help="Omit responses and per-iteration distances from --output records."
+    ),
+    SemtestParamSpec(
+        flag="--record-durations",
+        action="store_true",
+        default=False,
+        help=(
+            "Record the merged benchmarks' durations in the durations file, so the "
+            "next sharded run is balanced on the whole suite."
+        )
+    )
+]
+
+
+rescore_params = [
+    SemtestParamSpec(
+        flag="run_directory",
+        type=InputType.directory,
+        help="Run artifact directory written with --artifact-dir."
+    ),
+    SemtestParamSpec(
+        flag="--comparator",
+        type=InputType.comparator,
+        nargs="+",
+        default=["cosine_similarity"],
+        help=(
+            "Comparators to re-score with, the first being the primary metric: registered "
+            "names or `package.module:ClassName` import paths."
+        )
+    ),
+    SemtestParamSpec(
+        flag="--output",
+        type=InputType.file_path,
+        help="Stream re-scored results to a JSONL file, one line per benchmark."
+    ),
+    SemtestParamSpec(
+        flag="--summary-only",
+        action="store_true",
+        default=False,
+        help="Omit responses and per-iteration distances from --output records."
     )
 ]
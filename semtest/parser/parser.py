@@ -1,18 +1,58 @@
 """Functionality to parse CLI arguments"""
 
 import argparse
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from pydantic import BaseModel
+from typing import Any, Optional
 
-from .paramspec import semtest_params
+from .paramspec import SemtestParamSpec, merge_params, rescore_params, semtest_params
 from .input_type import Verbosity
 
 
+# CLI contexts and parameter specs are plain dataclasses: importing pydantic alone
+# would cost more than the whole budget of `semtest --help`
 # TODO: Move to custom
-class SemtestContext(BaseModel):
+@dataclass
+class SemtestContext:  # pylint: disable=too-many-instance-attributes
     """Listing of all permissible arguments"""
     directory: Path
     verbosity: Verbosity
+    keyword: Optional[str] = None
+    paths: Optional[list[str]] = None
+    shard: Optional[tuple[int, int]] = None
+    collect_only: bool = False
+    changed_only: bool = False
+    embedding_backend: str = "openai"
+    embedding_cache: Optional[Path] = None
+    clear_embedding_cache: bool = False
+    workers: int = 1
+    requests_per_minute: Optional[int] = None
+    tokens_per_minute: Optional[int] = None
+    streaming_stats: bool = False
+    jobs: int = 1
+    timeout: Optional[float] = None
+    output: Optional[Path] = None
+    summary_only: bool = False
+    artifact_dir: Optional[Path] = None
+    metrics_hook: Optional[str] = None
+
+
+@dataclass
+class RescoreContext:
+    """Arguments of the `semtest rescore` subcommand"""
+    run_directory: Path
+    comparator: list[str] = field(default_factory=lambda: ["cosine_similarity"])
+    output: Optional[Path] = None
+    summary_only: bool = False
+
+
+@dataclass
+class MergeContext:
+    """Arguments of the `semtest merge` subcommand"""
+    result_files: list[Path]
+    output: Optional[Path] = None
+    summary_only: bool = False
+    record_durations: bool = False
 
 
 class Parser:
@@ -23,16 +63,65 @@ class Parser:
             description="semtest: the semantic llm testbench"
         )
 
-    def parse_arguments(self) -> SemtestContext:
+    def parse_arguments(self, args: Optional[list[str]] = None) -> SemtestContext:
         """Parse CLI arguments and return the resulting object"""
 
-        for param in semtest_params:
-            self.parser.add_argument(
-                param.flag,
-                **param.model_dump(exclude_none=True, exclude=["flag"])  # type: ignore[arg-type]
-            )
-
-        args = self.parser.parse_args()
-        arg_dict = vars(args)
+        self._add_arguments(self.parser, semtest_params)
+        arg_dict = vars(self.parser.parse_args(args))
+        # Collection needs no settings defaults, so it does not load the project settings
+        if not arg_dict["collect_only"]:
+            self._apply_setting_defaults(arg_dict, semtest_params)
 
         return SemtestContext(**arg_dict)
+
+    def parse_rescore_arguments(self, args: Optional[list[str]] = None) -> RescoreContext:
+        """Parse arguments of the `semtest rescore` subcommand"""
+
+        # pylint: disable-next=import-outside-toplevel
+        from semtest.semantic_comparator import COMPARATORS
+
+        rescore_parser = argparse.ArgumentParser(
+            prog="semtest rescore",
+            description="Recompute benchmark metrics from a stored run artifact",
+            epilog=f"Registered comparators: {', '.join(COMPARATORS)}"
+        )
+        self._add_arguments(rescore_parser, rescore_params)
+        arg_dict = vars(rescore_parser.parse_args(args))
+
+        return RescoreContext(**arg_dict)
+
+    def parse_merge_arguments(self, args: Optional[list[str]] = None) -> MergeContext:
+        """Parse arguments of the `semtest merge` subcommand"""
+
+        merge_parser = argparse.ArgumentParser(
+            prog="semtest merge",
+            description="Combine JSONL result files, e.g. of a sharded run, into one report"
+        )
+        self._add_arguments(merge_parser, merge_params)
+        arg_dict = vars(merge_parser.parse_args(args))
+
+        return MergeContext(**arg_dict)
+
+    @staticmethod
+    def _add_arguments(
+        parser: argparse.ArgumentParser, params: list[SemtestParamSpec]
+    ) -> None:
+        """Register parameter specs with an argument parser"""
+        for param in params:
+            options = {
+                name: value for name, value in asdict(param).items()
+                if value is not None and name not in ("flag", "setting")
+            }
+            parser.add_argument(param.flag, **options)
+
+    @staticmethod
+    def _apply_setting_defaults(
+        arg_dict: dict[str, Any], params: list[SemtestParamSpec]
+    ) -> None:
+        """Fill arguments left unset on the command line from their settings defaults"""
+        from semtest.config import settings  # pylint: disable=import-outside-toplevel
+
+        for param in params:
+            dest = param.dest or param.flag.lstrip("-").replace("-", "_")
+            if param.setting and arg_dict.get(dest) is None:
+                arg_dict[dest] = getattr(settings, param.setting) or None
@@ -1,4 +1,17 @@
 """Benchmark report module"""
+from .artifact import ArtifactReporter, RunArtifact
+from .base import ReporterBase
 from .benchmark_report import BenchmarkReport
+from .hook_report import HookReporter, MetricsHook
+from .jsonl_report import JsonlReporter, read_jsonl_results
 
-__all__ = ["BenchmarkReport"]
+__all__ = [
+    "ArtifactReporter",
+    "BenchmarkReport",
+    "HookReporter",
+    "JsonlReporter",
+    "MetricsHook",
+    "ReporterBase",
+    "RunArtifact",
+    "read_jsonl_results",
+]
@@ -0,0 +1,261 @@
+"""
+Binary run artifacts: a directory holding a JSON manifest, Parquet tables of
+benchmark metadata, responses and exceptions (one file per benchmark in each
+table's directory), and one memory-mappable `.npy` embedding matrix per
+benchmark. Several reference answers are stored as a JSON list in the
+`expectation_input` column. Parquet support requires the optional `pyarrow`
+dependency (`pip install semtest[artifacts]`).
+"""
+import json
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from semtest.benchmarking.metrics import BenchmarkMetadata
+
+from .base import ReporterBase
+
+ARTIFACT_FORMAT_VERSION = 2
+
+MANIFEST_FILE = "manifest.json"
+BENCHMARKS_TABLE = "benchmarks"
+RESPONSES_TABLE = "responses"
+EXCEPTIONS_TABLE = "exceptions"
+EMBEDDINGS_DIRECTORY = "embeddings"
+
+
+def _import_pyarrow() -> tuple[Any, Any]:
+    """Import pyarrow lazily, so it is only required when artifacts are used"""
+    try:
+        import pyarrow  # pylint: disable=import-outside-toplevel
+        import pyarrow.parquet  # pylint: disable=import-outside-toplevel
+    except ImportError as e:
+        exc = "Run artifacts require pyarrow. Install it with `pip install semtest[artifacts]`"
+        raise ImportError(exc) from e
+
+    return pyarrow, pyarrow.parquet
+
+
+def _table_schemas(pa: Any) -> dict[str, Any]:
+    """Arrow schemas of the artifact tables, keyed by table name"""
+    return {
+        BENCHMARKS_TABLE: pa.schema([
+            ("benchmark_index", pa.int32()),
+            ("func", pa.string()),
+            ("iterations", pa.int64()),
+            ("comparator", pa.string()),
+            ("expectation_input", pa.string()),
+            ("mean_semantic_distance", pa.float64()),
+            ("median_semantic_distance", pa.float64()),
+            ("response_ct", pa.int64()),
+            ("exception_ct", pa.int64()),
+        ]),
+        RESPONSES_TABLE: pa.schema([
+            ("benchmark_index", pa.int32()),
+            ("response_index", pa.int64()),
+            ("response", pa.string()),
+            ("semantic_distance", pa.float64()),
+        ]),
+        EXCEPTIONS_TABLE: pa.schema([
+            ("benchmark_index", pa.int32()),
+            ("exception_type", pa.string()),
+            ("message", pa.string()),
+        ]),
+    }
+
+
+def _table_part(table_name: str, index: int) -> Path:
+    """Relative path of a benchmark's Parquet file within a table's directory"""
+    return Path(table_name) / f"{index}.parquet"
+
+
+class ArtifactReporter(ReporterBase):
+    """
+    Writes a run artifact directory as benchmarks complete. Each benchmark's
+    rows are written to a complete Parquet file per table and its embeddings
+    are saved as `embeddings/<index>.npy`, before the manifest is rewritten
+    to list it. An interrupted run therefore still leaves a readable artifact
+    of every benchmark that completed.
+    """
+
+    def __init__(self, run_directory: Path) -> None:
+        self.run_directory = run_directory
+        self._pa, self._pq = _import_pyarrow()
+        self._schemas = _table_schemas(self._pa)
+        self._manifest: dict[str, Any] = {}
+
+    def open(self) -> None:
+        """Create the run directory and its table directories"""
+        for directory in [EMBEDDINGS_DIRECTORY, *self._schemas]:
+            (self.run_directory / directory).mkdir(parents=True, exist_ok=True)
+        self._manifest = {
+            "format_version": ARTIFACT_FORMAT_VERSION,
+            "created_at": time.time(),
+            "complete": False,
+            "tables": list(self._schemas),
+            "benchmarks": [],
+        }
+        self._write_manifest()
+
+    def add(self, benchmark: BenchmarkMetadata) -> None:
+        """Write a benchmark's table files and embedding matrices"""
+        if not self._manifest:
+            self.open()
+
+        index = len(self._manifest["benchmarks"])
+        metrics = benchmark.benchmarks
+        exceptions = metrics.exceptions
+
+        self._write_rows(BENCHMARKS_TABLE, index, {
+            "benchmark_index": [index],
+            "func": [benchmark.func],
+            "iterations": [benchmark.iterations],
+            "comparator": [benchmark.comparator],
+            "expectation_input": [
+                benchmark.expectation_input if isinstance(benchmark.expectation_input, str)
+                else json.dumps(benchmark.expectation_input)
+            ],
+            "mean_semantic_distance": [float(metrics.mean_semantic_distance)],
+            "median_semantic_distance": [float(metrics.median_semantic_distance)],
+            "response_ct": [len(metrics.responses)],
+            "exception_ct": [len(exceptions)],
+        })
+        self._write_rows(RESPONSES_TABLE, index, {
+            "benchmark_index": [index] * len(metrics.responses),
+            "response_index": list(range(len(metrics.responses))),
+            "response": metrics.responses,
+            "semantic_distance": [float(distance) for distance in metrics.semantic_distances],
+        })
+        self._write_rows(EXCEPTIONS_TABLE, index, {
+            "benchmark_index": [index] * len(exceptions),
+            "exception_type": [type(exc).__name__ for exc in exceptions],
+            "message": [str(exc) for exc in exceptions],
+        })
+
+        self._manifest["benchmarks"].append({
+            "index": index,
+            "func": benchmark.func,
+            "comparator": benchmark.comparator,
+            "embeddings": self._save_matrix(f"{index}.npy", metrics.result_embeddings),
+            "expectation_embedding": (
+                self._save_matrix(f"{index}.expectation.npy", metrics.expectation_embedding)
+                if metrics.expectation_embedding is not None else None
+            ),
+            "reference_scoring": (
+                metrics.references.model_dump(include={"scoring", "temperature"})
+                if metrics.references is not None else None
+            ),
+        })
+        self._write_manifest()
+
+    def close(self) -> None:
+        """Mark the manifest complete"""
+        if not self._manifest:
+            return
+
+        self._manifest["complete"] = True
+        self._write_manifest()
+        self._manifest = {}
+
+    def _write_rows(self, table_name: str, index: int, columns: dict[str, list[Any]]) -> None:
+        """Write a benchmark's rows of a table to their own Parquet file, atomically"""
+        part_path = self.run_directory / _table_part(table_name, index)
+        staging_path = part_path.with_suffix(".parquet.tmp")
+        self._pq.write_table(
+            self._pa.table(columns, schema=self._schemas[table_name]), staging_path
+        )
+        staging_path.replace(part_path)
+
+    def _save_matrix(self, file_name: str, matrix: npt.NDArray[Any]) -> dict[str, Any]:
+        """Save a C-contiguous `.npy` matrix and describe it for the manifest"""
+        relative_path = Path(EMBEDDINGS_DIRECTORY) / file_name
+        np.save(self.run_directory / relative_path, np.ascontiguousarray(matrix))
+        return {
+            "path": relative_path.as_posix(),
+            "dtype": str(matrix.dtype),
+            "shape": list(matrix.shape),
+        }
+
+    def _write_manifest(self) -> None:
+        """Atomically replace the manifest file"""
+        manifest_path = self.run_directory / MANIFEST_FILE
+        staging_path = manifest_path.with_suffix(".json.tmp")
+        staging_path.write_text(json.dumps(self._manifest, indent=2), encoding="utf-8")
+        staging_path.replace(manifest_path)
+
+
+class RunArtifact:
+    """
+    Read-only view of a run artifact directory. Embedding matrices are
+    memory-mapped rather than loaded, and Parquet tables are read through
+    memory maps, so large runs can be opened without copying them into memory.
+    """
+
+    def __init__(self, run_directory: Path) -> None:
+        self.run_directory = Path(run_directory)
+        manifest_path = self.run_directory / MANIFEST_FILE
+        if not manifest_path.is_file():
+            exc = f"{self.run_directory} is not a semtest run artifact (missing {MANIFEST_FILE})"
+            raise FileNotFoundError(exc)
+
+        self.manifest: dict[str, Any] = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if self.manifest.get("format_version") != ARTIFACT_FORMAT_VERSION:
+            exc = (
+                f"Unsupported run artifact format {self.manifest.get('format_version')}, "
+                f"expected {ARTIFACT_FORMAT_VERSION}"
+            )
+            raise ValueError(exc)
+
+    def __len__(self) -> int:
+        return len(self.manifest["benchmarks"])
+
+    def benchmarks(self) -> Any:
+        """Benchmark metadata as a `pyarrow.Table`"""
+        return self._read_table(BENCHMARKS_TABLE)
+
+    def responses(self, index: Optional[int] = None) -> Any:
+        """Responses and their distances as a `pyarrow.Table`, optionally of one benchmark"""
+        return self._read_table(RESPONSES_TABLE, index)
+
+    def exceptions(self, index: Optional[int] = None) -> Any:
+        """Captured exceptions as a `pyarrow.Table`, optionally of one benchmark"""
+        return self._read_table(EXCEPTIONS_TABLE, index)
+
+    def embeddings(self, index: int) -> npt.NDArray[np.floating[Any]]:
+        """Memory-mapped n x d response embedding matrix of a benchmark"""
+        return self._load_matrix(self.manifest["benchmarks"][index]["embeddings"])
+
+    def expectation_embedding(self, index: int) -> Optional[npt.NDArray[np.floating[Any]]]:
+        """Memory-mapped expectation embedding of a benchmark, if one was stored"""
+        matrix_entry = self.manifest["benchmarks"][index]["expectation_embedding"]
+        return self._load_matrix(matrix_entry) if matrix_entry else None
+
+    def reference_scoring(self, index: int) -> Optional[dict[str, Any]]:
+        """`scoring` and `temperature` of a benchmark scored against several references"""
+        scoring: Optional[dict[str, Any]] = (
+            self.manifest["benchmarks"][index].get("reference_scoring")
+        )
+        return scoring
+
+    def _read_table(self, table_name: str, index: Optional[int] = None) -> Any:
+        """
+        Read a table's Parquet files through memory maps, in benchmark order.
+        Selecting a single benchmark only reads its own file.
+        """
+        pa, pq = _import_pyarrow()
+        indices = range(len(self)) if index is None else [index]
+        parts = [
+            pq.read_table(self.run_directory / _table_part(table_name, part_index), memory_map=True)
+            for part_index in indices
+        ]
+        return pa.concat_tables(parts) if parts else _table_schemas(pa)[table_name].empty_table()
+
+    def _load_matrix(self, matrix_entry: dict[str, Any]) -> npt.NDArray[np.floating[Any]]:
+        """Memory-map a `.npy` matrix described by a manifest entry"""
+        matrix: npt.NDArray[np.floating[Any]] = np.load(
+            self.run_directory / matrix_entry["path"], mmap_mode="r"
+        )
+        return matrix
@@ -0,0 +1,23 @@
+"""Reporter interface consumed by the engine"""
+from abc import ABC, abstractmethod
+
+from semtest.benchmarking.metrics import BenchmarkMetadata
+
+
+class ReporterBase(ABC):
+    """
+    Base reporter interface. The engine calls `open` before the first benchmark,
+    `add` as each benchmark completes, and `close` once the run ends (including
+    interrupted runs), so reporters can stream results instead of buffering them.
+    """
+
+    def open(self) -> None:
+        """Prepare the reporter for a run"""
+
+    @abstractmethod
+    def add(self, benchmark: BenchmarkMetadata) -> None:
+        """Consume the results of a single completed benchmark"""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Finalize output once all benchmarks have been added"""
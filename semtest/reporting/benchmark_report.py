@@ -1,30 +1,54 @@
 """Tools required to build a report from benchmark results"""
 import logging
 from typing import Any, Optional
-import pandas as pd
-import tabulate
 
 from semtest.benchmarking.metrics import BenchmarkMetadata
 
+from .base import ReporterBase
+
 logger = logging.getLogger("semtest")
-class BenchmarkReport:
-    """Convert a series of benchmarks into readable output"""
+class BenchmarkReport(ReporterBase):
+    """
+    Convert a series of benchmarks into readable output. Only one summary
+    row is retained per benchmark, not its responses or embeddings.
+    """
     # TODO: Buld out output option configurations
 
     def __init__(
         self,
         benchmarks: Optional[list[BenchmarkMetadata]] = None
     ) -> None:
-        self.benchmarks: list[BenchmarkMetadata] = benchmarks or []
+        self.rows: list[dict[str, Any]] = []
+        self.populate(benchmarks or [])
 
     def populate(self, benchmarks: list[BenchmarkMetadata]) -> None:
         """Populate reporter with data"""
-        self.benchmarks += benchmarks
+        for benchmark in benchmarks:
+            self.add(benchmark)
+
+    def add(self, benchmark: BenchmarkMetadata) -> None:
+        """Summarize a single benchmark into a report row, followed by its slice rows"""
+        self.rows.append(self._build_row_dict(benchmark))
+        self.rows.extend(self._build_slice_row_dicts(benchmark))
+
+    def close(self) -> None:
+        """Print the report table for all benchmarks added so far"""
+        if self.rows:
+            self.report()
 
     def report(self) -> None:
         """Build BenchmarkMetadata objects into a standard report"""
+        # Slow to import, and only needed once a report is printed
+        import pandas as pd  # pylint: disable=import-outside-toplevel
+        import tabulate  # pylint: disable=import-outside-toplevel
 
         report_df = pd.DataFrame(self._build_row_dicts())
+        if report_df["ci_width"].isna().all():
+            report_df = report_df.drop(columns=["ci_width", "converged"])
+        if report_df["reference_matches"].isna().all():
+            report_df = report_df.drop(columns="reference_matches")
+        if not report_df["cached"].any():
+            report_df = report_df.drop(columns="cached")
 
         fmt_token = "="
         report_header = f"{fmt_token*30} Benchmarking Results {fmt_token*30}\n"
@@ -35,16 +59,62 @@ class BenchmarkReport:
 
     def _build_row_dicts(self) -> list[dict[str,Any]]:
         """Generate row dicts from benchmark metadata"""
-        row_dicts = []
+        return self.rows
+
+    @staticmethod
+    def _build_row_dict(benchmark: BenchmarkMetadata) -> dict[str, Any]:
+        """
+        Generate a single report row from benchmark metadata. Additional
+        comparators are reported as their own mean/median columns, followed
+        by iteration latency percentiles and throughput. Adaptively sampled
+        benchmarks report their final confidence interval width, and benchmarks with
+        several reference answers how many responses matched each reference best.
+        Benchmarks replayed from the result cache are flagged in a `cached` column.
+        """
+        metrics = benchmark.benchmarks
+        row = {  # TODO: define pydantic schema and adapter
+            "benchmark": benchmark.func,
+            "iterations": benchmark.iterations,
+            "comparator": benchmark.comparator,
+            "mean_semantic_distance": metrics.mean_semantic_distance,
+            "median_semantic_distance": metrics.median_semantic_distance,
+        }
+        for comparator, mean_distance in metrics.mean_comparator_distances.items():
+            row[f"mean_{comparator}"] = mean_distance
+            row[f"median_{comparator}"] = metrics.median_comparator_distances[comparator]
+
+        row["exceptions"] = list({type(exc).__name__ for exc in metrics.exceptions})
+        row["exception_ct"] = len(metrics.exceptions)
+
+        timings = benchmark.timings
+        for percentile, seconds in (
+            ("p50", timings.p50_iteration_seconds),
+            ("p90", timings.p90_iteration_seconds),
+            ("p99", timings.p99_iteration_seconds),
+        ):
+            row[f"{percentile}_ms"] = seconds * 1000 if seconds is not None else None
+        row["iterations_per_s"] = timings.throughput_per_second
+
+        convergence = metrics.convergence
+        row["ci_width"] = convergence.ci_width if convergence is not None else None
+        row["converged"] = convergence.converged if convergence is not None else None
+        references = metrics.references
+        row["reference_matches"] = references.match_counts if references is not None else None
+        row["cached"] = benchmark.cached
+        return row
 
-        for benchmark in self.benchmarks:
-            row_dicts.append({  # TODO: define pydantic schema and adapter
-                "benchmark": benchmark.func,
-                "iterations": benchmark.iterations,
+    @staticmethod
+    def _build_slice_row_dicts(benchmark: BenchmarkMetadata) -> list[dict[str, Any]]:
+        """Rows of a dataset benchmark's slices, named `benchmark[field=value]`"""
+        return [
+            {
+                "benchmark": f"{benchmark.func}[{slice_metrics.field}={slice_metrics.value}]",
+                "iterations": slice_metrics.cases,
                 "comparator": benchmark.comparator,
-                "mean_semantic_distance": benchmark.benchmarks.mean_semantic_distance,
-                "median_semantic_distance": benchmark.benchmarks.median_semantic_distance,
-                "exceptions": list({type(exc).__name__ for exc in benchmark.benchmarks.exceptions}),
-                "exception_ct": len(benchmark.benchmarks.exceptions)
-            })
-        return row_dicts
+                "mean_semantic_distance": slice_metrics.mean_semantic_distance,
+                "median_semantic_distance": slice_metrics.median_semantic_distance,
+                "exception_ct": slice_metrics.exception_ct,
+                "cached": benchmark.cached,
+            }
+            for slice_metrics in benchmark.benchmarks.slices
+        ]
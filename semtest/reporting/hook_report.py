@@ -0,0 +1,34 @@
+"""Reporter forwarding each benchmark to a user-supplied callable"""
+import importlib
+from typing import Callable
+
+from semtest.benchmarking.metrics import BenchmarkMetadata
+
+from .base import ReporterBase
+
+MetricsHook = Callable[[BenchmarkMetadata], None]
+
+
+class HookReporter(ReporterBase):
+    """
+    Calls `hook(benchmark)` as each benchmark completes, e.g. to export
+    `benchmark.timings` and distances to an external metrics system.
+    """
+
+    def __init__(self, hook: MetricsHook) -> None:
+        self.hook = hook
+
+    @classmethod
+    def from_import_path(cls, import_path: str) -> "HookReporter":
+        """Build a reporter from a `package.module:function` import path"""
+        module_name, _, attr_name = import_path.partition(":")
+        hook = getattr(importlib.import_module(module_name), attr_name, None) if attr_name else None
+        if not callable(hook):
+            exc = f"{import_path} is not a callable `package.module:function` import path"
+            raise ValueError(exc)
+
+        return cls(hook)
+
+    def add(self, benchmark: BenchmarkMetadata) -> None:
+        """Forward a completed benchmark to the hook"""
+        self.hook(benchmark)
@@ -0,0 +1,131 @@
+"""Streaming JSONL (NDJSON) benchmark result sink"""
+import json
+from pathlib import Path
+from typing import IO, Iterator, Optional
+
+import numpy as np
+
+from semtest.benchmarking.metrics import (
+    BenchmarkMetadata,
+    ConvergenceMetrics,
+    DistributionSummary,
+    ReferenceMetrics,
+    SemanticMetrics,
+    SliceMetrics,
+    TimingMetrics,
+    restore_exception
+)
+
+from .base import ReporterBase
+
+SUMMARY_EXCLUDE = {
+    "benchmarks": {"responses", "semantic_distances", "comparator_distances"},
+    "timings": {"iteration_seconds"},
+}
+
+
+class JsonlReporter(ReporterBase):
+    """
+    Writes one JSON line per benchmark as soon as it completes and flushes it to
+    disk, so partial results survive an interrupted run. With `summary_only`,
+    responses and per-iteration distances and timings are omitted.
+    """
+
+    def __init__(self, path: Path, summary_only: bool = False) -> None:
+        self.path = path
+        self.summary_only = summary_only
+        self._file: Optional[IO[str]] = None
+
+    def open(self) -> None:
+        """Create (or truncate) the output file"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("w", encoding="utf-8")
+
+    def add(self, benchmark: BenchmarkMetadata) -> None:
+        """Append and flush a single benchmark record"""
+        if self._file is None:
+            self.open()
+        assert self._file is not None
+
+        record = benchmark.model_dump_json(
+            exclude=SUMMARY_EXCLUDE if self.summary_only else None  # type: ignore[arg-type]
+        )
+        self._file.write(record + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        """Close the output file"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def read_jsonl_results(path: Path) -> Iterator[BenchmarkMetadata]:
+    """
+    Rebuild the benchmarks of a JSONL result file, one per line. Records keep
+    exception types but not messages, and no embeddings, so files written with
+    `summary_only` cannot be read back.
+    """
+    with path.open(encoding="utf-8") as result_file:
+        for line_number, line in enumerate(result_file, start=1):
+            if not line.strip():
+                continue
+
+            try:
+                record = json.loads(line)
+                metrics = record["benchmarks"]
+                yield BenchmarkMetadata(
+                    func=record["func"],
+                    benchmark_id=record.get("benchmark_id"),
+                    iterations=record["iterations"],
+                    comparator=record["comparator"],
+                    expectation_input=record["expectation_input"],
+                    benchmarks=SemanticMetrics(
+                        responses=metrics["responses"],
+                        exceptions=[
+                            restore_exception(exception_type, "")
+                            for exception_type in metrics["exceptions"]
+                        ],
+                        result_embeddings=np.empty((0, 0), dtype=np.float32),
+                        semantic_distances=[
+                            np.float64(distance) for distance in metrics["semantic_distances"]
+                        ],
+                        comparator_distances={
+                            comparator: [np.float64(distance) for distance in distances]
+                            for comparator, distances in metrics["comparator_distances"].items()
+                        },
+                        convergence=(
+                            ConvergenceMetrics.model_validate(metrics["convergence"])
+                            if metrics.get("convergence") else None
+                        ),
+                        slices=[
+                            SliceMetrics.model_validate(slice_metrics)
+                            for slice_metrics in metrics.get("slices", [])
+                        ],
+                        references=(
+                            ReferenceMetrics.model_validate(metrics["references"])
+                            if metrics.get("references") else None
+                        ),
+                        distance_summary=(
+                            DistributionSummary.model_validate(metrics["distance_summary"])
+                            if metrics.get("distance_summary") else None
+                        ),
+                        comparator_summaries={
+                            comparator: DistributionSummary.model_validate(summary)
+                            for comparator, summary in metrics.get(
+                                "comparator_summaries", {}
+                            ).items()
+                        }
+                    ),
+                    timings=TimingMetrics.model_validate(record["timings"]),
+                    cached=record.get("cached", False)
+                )
+            except KeyError as e:
+                exc = (
+                    f"{path}:{line_number} is missing {e}; result files must be written "
+                    "with --output and without --summary-only"
+                )
+                raise ValueError(exc) from e
+            except (TypeError, ValueError) as e:
+                exc = f"{path}:{line_number} is not a valid benchmark result: {e}"
+                raise ValueError(exc) from e
@@ -1,5 +1,31 @@
 """Functionality for comparison of embedding vectors"""
 
-from .comparators import ComparatorBase, CosineSimilarity
+from .comparators import (
+    COMPARATORS,
+    REFERENCE_SCORINGS,
+    AngularDistance,
+    ComparatorBase,
+    CosineSimilarity,
+    DotProduct,
+    EuclideanDistance,
+    ManhattanDistance,
+    calculate_multi_distances,
+    calculate_paired_distances,
+    calculate_reference_distances,
+    get_comparator,
+)
 
-__all__ = ["ComparatorBase","CosineSimilarity"]
+__all__ = [
+    "COMPARATORS",
+    "REFERENCE_SCORINGS",
+    "AngularDistance",
+    "ComparatorBase",
+    "CosineSimilarity",
+    "DotProduct",
+    "EuclideanDistance",
+    "ManhattanDistance",
+    "calculate_multi_distances",
+    "calculate_paired_distances",
+    "calculate_reference_distances",
+    "get_comparator",
+]
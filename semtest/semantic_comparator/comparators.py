@@ -1,13 +1,35 @@
 """Embedding vector comparison algorithms"""
+import importlib
 from abc import ABC, abstractmethod
+from typing import ClassVar, Optional, Sequence
 
 import numpy as np
+import numpy.typing as npt
 
-from sklearn.metrics.pairwise import cosine_similarity
+# Aggregations of a response's distances to several references, see `calculate_reference_distances`
+REFERENCE_SCORINGS = ("max", "mean", "softmin")
+
+
+def normalize_rows(embeddings: npt.ArrayLike) -> npt.NDArray[np.float32]:
+    """L2-normalize embedding vectors (rows) as float32, leaving zero vectors as zeros"""
+    matrix = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    normalized: npt.NDArray[np.float32] = np.divide(
+        matrix, norms, out=np.zeros_like(matrix), where=norms > 0
+    )
+    return normalized
 
 
 class ComparatorBase(ABC):
-    """Base comparator interface"""
+    """
+    Base comparator interface. Comparators that set `normalized_inputs` are
+    evaluated on L2-normalized float32 rows, which `calculate_multi_distances`
+    computes once and shares between every comparator that needs them.
+    Comparators that set `higher_is_closer` are similarities rather than distances.
+    """
+
+    normalized_inputs: ClassVar[bool] = False
+    higher_is_closer: ClassVar[bool] = False
 
     @abstractmethod
     def calculate_distance(
@@ -16,19 +38,75 @@ class ComparatorBase(ABC):
         """Abstract method for embedding vector distance calculation"""
         raise NotImplementedError
 
+    def calculate_distances(
+        self, embedding_expectation: npt.ArrayLike, embeddings: npt.ArrayLike
+    ) -> npt.NDArray[np.float64]:
+        """
+        Distances between an n x d matrix of embeddings and one expectation vector
+        (returns shape (n,)) or a k x d matrix of expectations (returns shape (n, k)).
+        """
+        return calculate_multi_distances([self], embedding_expectation, embeddings)[str(self)]
+
+    def matrix_distances(
+        self, expectations: npt.NDArray[np.float32], embeddings: npt.NDArray[np.float32]
+    ) -> npt.NDArray[np.float64]:
+        """
+        n x k distance matrix between n x d embeddings and k x d expectations, both
+        already normalized when `normalized_inputs` is set. Comparators should override
+        this with a vectorized implementation; the default falls back to pairwise
+        `calculate_distance` calls.
+        """
+        return np.array([
+            [
+                self.calculate_distance(expectation.tolist(), embedding.tolist())
+                for expectation in expectations
+            ]
+            for embedding in embeddings
+        ], dtype=np.float64)
+
+    def paired_distances(
+        self, expectations: npt.NDArray[np.float32], embeddings: npt.NDArray[np.float32]
+    ) -> npt.NDArray[np.float64]:
+        """
+        Distance between each of n x d embeddings and its own row of n x d
+        expectations, shape (n,). The default scores each pair through
+        `matrix_distances`; comparators should override it with a row-wise version.
+        """
+        return np.array([
+            self.matrix_distances(expectation[np.newaxis], embedding[np.newaxis])[0, 0]
+            for expectation, embedding in zip(expectations, embeddings)
+        ], dtype=np.float64)
+
     @abstractmethod
     def __str__(self) -> str:
         """Return string representation of transform type"""
         raise NotImplementedError
 
 
+class _VectorizedComparator(ComparatorBase):  # pylint: disable=abstract-method
+    """Comparator whose single-pair distance is a special case of `matrix_distances`"""
+
+    def calculate_distance(
+        self, embedding_a: list[float], embedding_b: list[float]
+    ) -> np.float64:
+        """Calculate distance between two embedding vectors"""
+        return np.float64(self.calculate_distances(embedding_a, [embedding_b])[0])
+
+
 class CosineSimilarity(ComparatorBase):
     """Calculates cosine similarity between two vectors"""
 
+    normalized_inputs = True
+    higher_is_closer = True
+
     def calculate_distance(
         self, embedding_a: list[float], embedding_b: list[float]
     ) -> np.float64:
         """Calculate distance between two embedding vectors with cosine similarity"""
+        # scikit-learn takes seconds to import, so it is only loaded for single-pair use
+        from sklearn.metrics.pairwise import (  # pylint: disable=import-outside-toplevel
+            cosine_similarity,
+        )
 
         embedding_a_matrix = np.array(embedding_a).reshape(1, -1)
         embedding_b_matrix = np.array(embedding_b).reshape(1, -1)
@@ -41,6 +119,268 @@ class CosineSimilarity(ComparatorBase):
 
         return similarity_metric
 
+    def matrix_distances(
+        self, expectations: npt.NDArray[np.float32], embeddings: npt.NDArray[np.float32]
+    ) -> npt.NDArray[np.float64]:
+        """Cosine similarities of all embeddings in one matrix product of normalized rows"""
+        return (embeddings @ expectations.T).astype(np.float64)
+
+    def paired_distances(
+        self, expectations: npt.NDArray[np.float32], embeddings: npt.NDArray[np.float32]
+    ) -> npt.NDArray[np.float64]:
+        """Row-wise dot products of normalized rows"""
+        similarities: npt.NDArray[np.float64] = np.einsum(
+            "ij,ij->i", embeddings, expectations
+        ).astype(np.float64)
+        return similarities
+
     def __str__(self) -> str:
         """Return cosine similarity type"""
         return "cosine_similarity"
+
+
+class AngularDistance(_VectorizedComparator):
+    """Angle between two vectors, scaled to [0, 1] (0 for identical directions)"""
+
+    normalized_inputs = True
+
+    def matrix_distances(
+        self, expectations: npt.NDArray[np.float32], embeddings: npt.NDArray[np.float32]
+    ) -> npt.NDArray[np.float64]:
+        """Angular distances from the clipped cosine similarities of normalized rows"""
+        similarities = (embeddings @ expectations.T).astype(np.float64)
+        angles: npt.NDArray[np.float64] = np.arccos(np.clip(similarities, -1.0, 1.0)) / np.pi
+        return angles
+
+    def paired_distances(
+        self, expectations: npt.NDArray[np.float32], embeddings: npt.NDArray[np.float32]
+    ) -> npt.NDArray[np.float64]:
+        """Angular distances from the row-wise cosine similarities of normalized rows"""
+        similarities = np.einsum("ij,ij->i", embeddings, expectations).astype(np.float64)
+        angles: npt.NDArray[np.float64] = np.arccos(np.clip(similarities, -1.0, 1.0)) / np.pi
+        return angles
+
+    def __str__(self) -> str:
+        """Return angular distance type"""
+        return "angular_distance"
+
+
+class DotProduct(_VectorizedComparator):
+    """Dot product of two unnormalized vectors"""
+
+    higher_is_closer = True
+
+    def matrix_distances(
+        self, expectations: npt.NDArray[np.float32], embeddings: npt.NDArray[np.float32]
+    ) -> npt.NDArray[np.float64]:
+        """Dot products of all embeddings in one matrix product"""
+        return (embeddings @ expectations.T).astype(np.float64)
+
+    def paired_distances(
+        self, expectations: npt.NDArray[np.float32], embeddings: npt.NDArray[np.float32]
+    ) -> npt.NDArray[np.float64]:
+        """Row-wise dot products"""
+        products: npt.NDArray[np.float64] = np.einsum(
+            "ij,ij->i", embeddings, expectations
+        ).astype(np.float64)
+        return products
+
+    def __str__(self) -> str:
+        """Return dot product type"""
+        return "dot_product"
+
+
+class EuclideanDistance(_VectorizedComparator):
+    """Euclidean (L2) distance between two vectors"""
+
+    def matrix_distances(
+        self, expectations: npt.NDArray[np.float32], embeddings: npt.NDArray[np.float32]
+    ) -> npt.NDArray[np.float64]:
+        """L2 norms of the differences to each expectation, vectorized over embeddings"""
+        return np.stack([
+            np.linalg.norm(embeddings - expectation, axis=1) for expectation in expectations
+        ], axis=1).astype(np.float64)
+
+    def paired_distances(
+        self, expectations: npt.NDArray[np.float32], embeddings: npt.NDArray[np.float32]
+    ) -> npt.NDArray[np.float64]:
+        """Row-wise L2 norms of the differences"""
+        norms: npt.NDArray[np.float64] = np.linalg.norm(
+            embeddings - expectations, axis=1
+        ).astype(np.float64)
+        return norms
+
+    def __str__(self) -> str:
+        """Return euclidean distance type"""
+        return "euclidean_distance"
+
+
+class ManhattanDistance(_VectorizedComparator):
+    """Manhattan (L1) distance between two vectors"""
+
+    def matrix_distances(
+        self, expectations: npt.NDArray[np.float32], embeddings: npt.NDArray[np.float32]
+    ) -> npt.NDArray[np.float64]:
+        """L1 norms of the differences to each expectation, vectorized over embeddings"""
+        return np.stack([
+            np.abs(embeddings - expectation).sum(axis=1) for expectation in expectations
+        ], axis=1).astype(np.float64)
+
+    def paired_distances(
+        self, expectations: npt.NDArray[np.float32], embeddings: npt.NDArray[np.float32]
+    ) -> npt.NDArray[np.float64]:
+        """Row-wise L1 norms of the differences"""
+        norms: npt.NDArray[np.float64] = np.abs(embeddings - expectations).sum(axis=1).astype(
+            np.float64
+        )
+        return norms
+
+    def __str__(self) -> str:
+        """Return manhattan distance type"""
+        return "manhattan_distance"
+
+
+def calculate_multi_distances(
+    comparators: Sequence[ComparatorBase],
+    embedding_expectation: npt.ArrayLike,
+    embeddings: npt.ArrayLike
+) -> dict[str, npt.NDArray[np.float64]]:
+    """
+    Distances of every comparator in one pass, keyed by comparator name. The
+    embedding matrix is converted to float32 once, and normalized at most once
+    for all comparators with `normalized_inputs`. Result shapes follow
+    `ComparatorBase.calculate_distances`.
+    """
+    expectations = np.asarray(embedding_expectation)
+    embedding_matrix = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+    if embedding_matrix.size == 0:
+        empty = np.empty((0,) + expectations.shape[:-1], dtype=np.float64)
+        return {str(comparator): empty for comparator in comparators}
+
+    raw_inputs = (np.atleast_2d(expectations.astype(np.float32)), embedding_matrix)
+    normalized_inputs: Optional[tuple[npt.NDArray[np.float32], npt.NDArray[np.float32]]] = None
+
+    distances: dict[str, npt.NDArray[np.float64]] = {}
+    for comparator in comparators:
+        if comparator.normalized_inputs and normalized_inputs is None:
+            normalized_inputs = (normalize_rows(raw_inputs[0]), normalize_rows(raw_inputs[1]))
+        comparator_distances = comparator.matrix_distances(
+            *(normalized_inputs if comparator.normalized_inputs else raw_inputs)  # type: ignore[misc]
+        )
+        distances[str(comparator)] = (
+            comparator_distances if expectations.ndim > 1 else comparator_distances[:, 0]
+        )
+
+    return distances
+
+
+def calculate_paired_distances(
+    comparators: Sequence[ComparatorBase],
+    expectations: npt.ArrayLike,
+    embeddings: npt.ArrayLike
+) -> dict[str, npt.NDArray[np.float64]]:
+    """
+    Distance between each embedding and its own expectation (row i against row
+    i) for every comparator, keyed by comparator name, with inputs converted
+    and normalized once as in `calculate_multi_distances`
+    """
+    embedding_matrix = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+    expectation_matrix = np.atleast_2d(np.asarray(expectations, dtype=np.float32))
+    if embedding_matrix.shape[0] != expectation_matrix.shape[0]:
+        exc = (
+            f"Expected one expectation per embedding, got {expectation_matrix.shape[0]} "
+            f"expectations for {embedding_matrix.shape[0]} embeddings"
+        )
+        raise ValueError(exc)
+    if embedding_matrix.size == 0:
+        return {str(comparator): np.empty(0, dtype=np.float64) for comparator in comparators}
+
+    raw_inputs = (expectation_matrix, embedding_matrix)
+    normalized_inputs: Optional[tuple[npt.NDArray[np.float32], npt.NDArray[np.float32]]] = None
+
+    distances: dict[str, npt.NDArray[np.float64]] = {}
+    for comparator in comparators:
+        if comparator.normalized_inputs and normalized_inputs is None:
+            normalized_inputs = (normalize_rows(raw_inputs[0]), normalize_rows(raw_inputs[1]))
+        distances[str(comparator)] = comparator.paired_distances(
+            *(normalized_inputs if comparator.normalized_inputs else raw_inputs)  # type: ignore[misc]
+        )
+
+    return distances
+
+
+def calculate_reference_distances(
+    comparators: Sequence[ComparatorBase],
+    references: npt.ArrayLike,
+    embeddings: npt.ArrayLike,
+    scoring: str,
+    temperature: float
+) -> tuple[dict[str, npt.NDArray[np.float64]], npt.NDArray[np.intp]]:
+    """
+    Distances of n embeddings to a k x d matrix of references, aggregated over
+    the references for every comparator, keyed by comparator name. Each
+    comparator scores the n x k matrix from `calculate_multi_distances` with:
+    `max`, the closest reference (the highest similarity or lowest distance);
+    `mean`, the mean over references; or `softmin`, a log-mean-exp soft minimum
+    of the distance (soft maximum of a similarity) at `temperature`, ranging
+    from `max` (temperature near 0) to `mean` (large temperatures). Also returns
+    the index of each embedding's closest reference under the first comparator.
+    """
+    if scoring not in REFERENCE_SCORINGS:
+        exc = f"Unknown reference scoring {scoring}, expected one of {list(REFERENCE_SCORINGS)}"
+        raise ValueError(exc)
+
+    matrices = calculate_multi_distances(comparators, np.atleast_2d(references), embeddings)
+
+    distances: dict[str, npt.NDArray[np.float64]] = {}
+    closest: npt.NDArray[np.intp] = np.empty(0, dtype=np.intp)
+    for position, comparator in enumerate(comparators):
+        matrix = matrices[str(comparator)]
+        # Oriented so that larger is closer, whatever the comparator
+        closeness = matrix if comparator.higher_is_closer else -matrix
+        best = np.max(closeness, axis=1, keepdims=True)
+        if position == 0:
+            closest = np.argmax(closeness, axis=1)
+
+        if scoring == "max":
+            scores = best[:, 0]
+        elif scoring == "mean":
+            scores = np.mean(closeness, axis=1)
+        else:
+            scores = best[:, 0] + temperature * np.log(
+                np.mean(np.exp((closeness - best) / temperature), axis=1)
+            )
+        distances[str(comparator)] = (
+            scores if comparator.higher_is_closer else -scores
+        ).astype(np.float64)
+
+    return distances, closest
+
+
+COMPARATORS: dict[str, type[ComparatorBase]] = {
+    str(comparator_class()): comparator_class
+    for comparator_class in (
+        CosineSimilarity, AngularDistance, DotProduct, EuclideanDistance, ManhattanDistance
+    )
+}
+
+
+def get_comparator(name: str) -> ComparatorBase:
+    """
+    Instantiate a comparator by its registered name (e.g. `cosine_similarity`),
+    or by the import path of any `ComparatorBase` subclass (`package.module:ClassName`)
+    """
+    if name in COMPARATORS:
+        return COMPARATORS[name]()
+
+    module_name, _, class_name = name.partition(":")
+    if not class_name:
+        exc = f"Unknown comparator {name}. Registered comparators: {list(COMPARATORS)}"
+        raise ValueError(exc)
+
+    comparator_class = getattr(importlib.import_module(module_name), class_name, None)
+    if not (isinstance(comparator_class, type) and issubclass(comparator_class, ComparatorBase)):
+        exc = f"{name} is not a ComparatorBase subclass"
+        raise ValueError(exc)
+
+    return comparator_class()
@@ -1,22 +1,131 @@
 """Entrypoint for the semtest testing framework"""
-from .config import configure_cli_logging
-from .reporting import BenchmarkReport
-from .engine import Engine
-from .loader import Loader
-from .parser import Parser
+# Only the argument parser is imported up front, so `--help` and `--collect-only`
+# return before numpy, the embedding backends and the reporters are loaded
+# pylint: disable=import-outside-toplevel
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from .parser import Parser, SemtestContext
+
+if TYPE_CHECKING:
+    from .reporting import ReporterBase
 
 def semantic_test_runner() -> None:
     """Traverse directories and execute relevant semantic tests"""
 
-    configure_cli_logging()
+    args = sys.argv[1:]
+    if args[:1] == ["rescore"]:
+        rescore_runner(args[1:])
+        return
+    if args[:1] == ["merge"]:
+        merge_runner(args[1:])
+        return
 
     parser = Parser()
-    context = parser.parse_arguments()
-    loader = Loader(context)
-    reporter = BenchmarkReport()
+    context = parser.parse_arguments(args)
+
+    from .cli_logging import configure_cli_logging
+    from .loader import Loader
+
+    configure_cli_logging(context.verbosity)
+
+    try:
+        loader = Loader(context)
+    except ValueError as e:
+        parser.parser.error(str(e))
+
+    if context.collect_only:
+        for discovered in loader.collect():
+            print(f"{discovered.benchmark_id}  ({discovered.path}:{discovered.lineno})")
+        return
+
+    from .engine import Engine, configure_runtime
+    from .llm_client import EmbeddingCache
+
+    try:
+        configure_runtime(context)
+    except ValueError as e:
+        parser.parser.error(str(e))
+
+    embedding_cache = EmbeddingCache.get_default()
+    if embedding_cache is not None and context.clear_embedding_cache:
+        embedding_cache.clear()
+
     engine = Engine(
         context=context,
         loader=loader,
-        reporter=reporter
+        reporters=_build_reporters(context)
     )
     engine.execute()
+
+
+def _build_reporters(context: SemtestContext) -> list["ReporterBase"]:
+    """Reporters selected by the CLI options"""
+    from .reporting import ArtifactReporter, BenchmarkReport, HookReporter, JsonlReporter
+
+    reporters: list[ReporterBase] = [BenchmarkReport()]
+    if context.output:
+        reporters.append(JsonlReporter(context.output, summary_only=context.summary_only))
+    if context.artifact_dir:
+        reporters.append(ArtifactReporter(context.artifact_dir))
+    if context.metrics_hook:
+        reporters.append(HookReporter.from_import_path(context.metrics_hook))
+    return reporters
+
+
+def rescore_runner(args: Optional[list[str]] = None) -> None:
+    """Recompute metrics of a stored run artifact without any network traffic"""
+
+    parser = Parser()
+    context = parser.parse_rescore_arguments(args)
+
+    from .cli_logging import configure_cli_logging
+    from .engine import Rescorer
+    from .reporting import BenchmarkReport, JsonlReporter, ReporterBase, RunArtifact
+    from .semantic_comparator import get_comparator
+
+    configure_cli_logging()
+
+    reporters: list[ReporterBase] = [BenchmarkReport()]
+    if context.output:
+        reporters.append(JsonlReporter(context.output, summary_only=context.summary_only))
+
+    rescorer = Rescorer(
+        run_artifact=RunArtifact(context.run_directory),
+        comparators=[get_comparator(comparator) for comparator in context.comparator],
+        reporters=reporters
+    )
+    rescorer.execute()
+
+
+def merge_runner(args: Optional[list[str]] = None) -> None:
+    """Combine JSONL result files, e.g. of the shards of a sharded run, into one report"""
+
+    parser = Parser()
+    context = parser.parse_merge_arguments(args)
+
+    from .cli_logging import configure_cli_logging
+    from .config import settings
+    from .engine import ResultMerger
+    from .loader import DurationStore
+    from .reporting import BenchmarkReport, JsonlReporter, ReporterBase
+
+    configure_cli_logging()
+
+    reporters: list[ReporterBase] = [BenchmarkReport()]
+    if context.output:
+        reporters.append(JsonlReporter(context.output, summary_only=context.summary_only))
+
+    merger = ResultMerger(
+        result_files=context.result_files,
+        reporters=reporters,
+        durations=(
+            DurationStore(Path(settings.DURATIONS_PATH)) if context.record_durations else None
+        )
+    )
+    try:
+        merger.execute()
+    except (OSError, ValueError) as e:
+        print(f"semtest merge: error: {e}", file=sys.stderr)
+        sys.exit(2)
@@ -35,5 +35,9 @@ setup(
         "pandas==2.2.2",
         "termcolor==2.4.0"
     ],
+    extras_require={
+        "artifacts": ["pyarrow>=15.0"],
+        "local": ["sentence-transformers>=2.7"],
+    },
     package_data={'semtest': ['py.typed']},
 )